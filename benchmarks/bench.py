@@ -0,0 +1,127 @@
+"""Runs the benchmark cases, keeps a history of the results and compares them against a stored baseline.
+
+    python -m benchmarks.bench run [--filter deck] [--repeat 3]
+    python -m benchmarks.bench compare [--tolerance 0.25]
+    python -m benchmarks.bench baseline
+"""
+import argparse
+import datetime
+import json
+import logging
+import os
+import platform
+import sys
+import time
+
+from benchmarks.cases import CASES
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+HISTORY_PATH = os.path.join(BENCH_DIR, "history.json")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+
+def get_key(name: str, params: dict) -> str:
+    return name + "[" + ",".join(f"{k}={v}" for k, v in params.items()) + "]"
+
+def run_benchmarks(name_filter: str = "", repeat: int = 3) -> dict:
+    """Time every case matching the filter, keeping the fastest of the repeats
+
+    Args:
+        name_filter (str): only run the cases whose name contains this
+        repeat (int): the number of times to time each case
+
+    Returns:
+        dict: the run, with the results keyed by case and parameters
+    """
+    results = {}
+    for name, (setup, params_list) in CASES.items():
+        if name_filter not in name:
+            continue
+        for params in params_list:
+            seconds = []
+            for _ in range(repeat):
+                fn, n_ops = setup(**params) # a fresh setup for every repeat, so that state does not carry over
+                start = time.perf_counter()
+                fn()
+                seconds.append(time.perf_counter() - start)
+            key = get_key(name, params)
+            results[key] = {"seconds": min(seconds), "n_ops": n_ops, "ops_per_sec": n_ops / min(seconds)}
+            print(f"{key:<70} {min(seconds):>10.4f}s {n_ops / min(seconds):>14.1f} ops/s")
+    return {
+        "time": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+def read_json(path: str, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, "r") as f:
+        return json.load(f)
+
+def write_json(path: str, data):
+    with open(path, "w") as f:
+        json.dump(data, f, indent=1)
+
+def compare(run: dict, baseline: dict, tolerance: float) -> list:
+    """Compare a run against the baseline
+
+    Args:
+        run (dict): the run
+        baseline (dict): the baseline run
+        tolerance (float): the allowed relative slowdown, e.g. 0.25 for 25%
+
+    Returns:
+        list: the keys of the cases slower than the baseline by more than the tolerance
+    """
+    regressions = []
+    for key, result in run["results"].items():
+        if key not in baseline["results"]:
+            print(f"{key:<70} {'(no baseline)':>12}")
+            continue
+        ratio = result["seconds"] / baseline["results"][key]["seconds"]
+        flag = "REGRESSION" if ratio > 1 + tolerance else ""
+        print(f"{key:<70} {ratio:>8.2f}x {flag}")
+        if flag:
+            regressions.append(key)
+    return regressions
+
+def main(argv: list) -> int:
+    parser = argparse.ArgumentParser(description="Casino benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    add_run = subparsers.add_parser("run", help="run the benchmarks and append the results to the history")
+    add_run.add_argument("--filter", type=str, default="", help="only run the cases whose name contains this")
+    add_run.add_argument("--repeat", type=int, default=3, help="time each case this many times, keeping the fastest")
+    add_run.add_argument("--history", type=str, default=HISTORY_PATH, help="the history file")
+    add_compare = subparsers.add_parser("compare", help="compare the latest run of the history against the baseline")
+    add_compare.add_argument("--tolerance", type=float, default=0.25, help="the allowed relative slowdown before flagging a regression")
+    add_compare.add_argument("--history", type=str, default=HISTORY_PATH, help="the history file")
+    add_compare.add_argument("--baseline", type=str, default=BASELINE_PATH, help="the baseline file")
+    add_baseline = subparsers.add_parser("baseline", help="store the latest run of the history as the baseline")
+    add_baseline.add_argument("--history", type=str, default=HISTORY_PATH, help="the history file")
+    add_baseline.add_argument("--baseline", type=str, default=BASELINE_PATH, help="the baseline file")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.ERROR)
+
+    history = read_json(args.history, [])
+    if args.command == "run":
+        history.append(run_benchmarks(args.filter, args.repeat))
+        write_json(args.history, history)
+        return 0
+    if len(history) == 0:
+        print(f"No runs in the history @ {args.history}. Run the benchmarks first.")
+        return 1
+    if args.command == "baseline":
+        write_json(args.baseline, history[-1])
+        print(f"Stored the run of {history[-1]['time']} as the baseline @ {args.baseline}")
+        return 0
+    baseline = read_json(args.baseline, None)
+    if baseline is None:
+        print(f"No baseline @ {args.baseline}.")
+        return 1
+    regressions = compare(history[-1], baseline, args.tolerance)
+    print(f"[{len(regressions)}] regressions past a tolerance of [{args.tolerance:.0%}].")
+    return 1 if len(regressions) > 0 else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,152 @@
+"""The benchmark cases. Each case is a setup function registered with the parameters it runs at, which returns
+the function to time and the number of operations it performs, so that the cost of the setup is not measured.
+"""
+import argparse
+import os
+import tempfile
+import numpy as np
+
+from casino.agents.dyna import DynaQAgent
+from casino.agents.linear import LinearAgent
+from casino.agents.monte import MonteCarlo
+from casino.agents.qlearn import QLearningAgent, SarsaAgent, compute_mse
+from casino.agents.tdlambda import QLambdaAgent, SarsaLambdaAgent
+from casino.environments.easy21.easy21 import Easy21
+from casino.environments.env import Games
+from casino.io import disk, qarray
+from casino.models.cards.infinitedeck import InfiniteDeck
+from casino.workers.actorlearner import ActorLearner
+
+CASES = {}
+SEED = 0
+TMP_DIR = tempfile.TemporaryDirectory() # removed at exit
+
+def tmp_path(fname: str) -> str:
+    return os.path.join(TMP_DIR.name, fname)
+
+def case(name: str, params: list):
+    """Register a benchmark case
+
+    Args:
+        name (str): the name of the case
+        params (list): the keyword arguments to run the case with, one dict per run
+    """
+    def register(setup):
+        CASES[name] = (setup, params)
+        return setup
+    return register
+
+def make_q_func(n_states: int, n_actions: int = 2) -> dict:
+    """A random q function keyed by tuple states, with the 210 easy21 states first
+    """
+    rng = np.random.default_rng(SEED)
+    states = [(dealer, player) for dealer in range(1, 11) for player in range(1, 22)]
+    states += [(dealer, player) for dealer in range(11, 11 + n_states // 21 + 1) for player in range(1, 22)]
+    return {state: rng.uniform(-1, 1, n_actions) for state in states[:n_states]}
+
+@case("deck.draw", [{"n_draws": 10000}, {"n_draws": 1000000}])
+def bench_deck_draw(n_draws: int):
+    deck = InfiniteDeck(1, 10, 0.33, SEED)
+    def run():
+        for _ in range(n_draws):
+            deck.draw()
+    return run, n_draws
+
+@case("easy21.reset_step", [{"n_games": 1000}, {"n_games": 100000}])
+def bench_easy21_reset_step(n_games: int):
+    env = Easy21(seed=SEED)
+    actions = np.random.default_rng(SEED).integers(2, size=n_games * 32).tolist()
+    def run():
+        i = 0
+        for _ in range(n_games):
+            env.reset()
+            terminal = False
+            while not terminal:
+                _, _, terminal = env.step(actions[i])
+                i += 1
+    return run, n_games
+
+@case("easy21.play_dealer", [{"n_games": 1000, "fast_dealer": False}, {"n_games": 100000, "fast_dealer": False},
+                             {"n_games": 100000, "fast_dealer": True}])
+def bench_easy21_play_dealer(n_games: int, fast_dealer: bool):
+    env = Easy21(fast_dealer, TMP_DIR.name, SEED)
+    play_dealer = env.play_dealer_fast if fast_dealer else env.play_dealer
+    def run():
+        for _ in range(n_games):
+            env.reset()
+            play_dealer()
+    return run, n_games
+
+def make_agent(agent: str, q_backend: str, opt_q_path: str):
+    env = Easy21(seed=SEED)
+    args = argparse.Namespace(policy=0, eps_const=100, gamma=1.0, visit_mode="every", opt_q_path=opt_q_path, mse_every=1, mse_sample_size=0,
+                              lam=0.9, trace_type="replacing", alpha=0.01, n_planning=10, model_capacity=100000)
+    state_space = env.get_state_space() if q_backend == "dense" else None
+    if agent == "linear":
+        agent = LinearAgent(env.n_actions, args, env.get_state_space(), env.get_feature_intervals())
+        agent.set_seed(SEED)
+        return agent, env
+    agent_class = {"monte": MonteCarlo, "sarsa": SarsaAgent, "qlearn": QLearningAgent,
+                   "sarsa_lambda": SarsaLambdaAgent, "q_lambda": QLambdaAgent, "dyna_q": DynaQAgent}[agent]
+    agent = agent_class(env.n_actions, args, state_space)
+    agent.set_seed(SEED)
+    return agent, env
+
+@case("agent.train_episode", [{"agent": agent, "q_backend": q_backend, "n_episodes": n_episodes}
+                              for agent in ["monte", "sarsa", "qlearn", "sarsa_lambda", "q_lambda"] for q_backend in ["dict", "dense"] for n_episodes in [1000, 20000]]
+                             + [{"agent": agent, "q_backend": "dense", "n_episodes": n_episodes} for agent in ["linear", "dyna_q"] for n_episodes in [1000, 20000]])
+def bench_agent_train_episode(agent: str, q_backend: str, n_episodes: int):
+    opt_q_path = tmp_path("opt_qfunc.json")
+    disk.write_dict_as_json(opt_q_path, make_q_func(210), str, list)
+    agent, env = make_agent(agent, q_backend, opt_q_path)
+    def run():
+        for i in range(n_episodes):
+            agent.train_episode(env, i)
+    return run, n_episodes
+
+@case("actorlearner.train", [{"agent": agent, "n_actors": n_actors, "n_episodes": 20000} for agent in ["monte", "sarsa_lambda"] for n_actors in [1, 2, 4]])
+def bench_actorlearner_train(agent: str, n_actors: int, n_episodes: int):
+    """Learning from the trajectories of n_actors actor processes, against the serial loop of agent.train_episode with 1 actor,
+    as with --n_actors 1. The actors only beat the serial loop with a core to spare for each of them and the learner.
+    """
+    agent, env = make_agent(agent, "dense", None)
+    def run():
+        if n_actors == 1:
+            for i in range(n_episodes):
+                agent.train_episode(env, i)
+        else:
+            ActorLearner(agent, Games.EASY21.value, env.n_actions, n_actors, sync_every=100, seed=SEED).train(n_episodes)
+    return run, n_episodes
+
+@case("compute_mse", [{"n_states": 210}, {"n_states": 10000}, {"n_states": 100000}])
+def bench_compute_mse(n_states: int):
+    opt_q = make_q_func(n_states)
+    q = {state: q_value + 0.1 for state, q_value in opt_q.items()}
+    def run():
+        compute_mse(opt_q, q)
+    return run, n_states
+
+@case("qtable.json_save", [{"n_states": 210}, {"n_states": 10000}, {"n_states": 100000}])
+def bench_qtable_json_save(n_states: int):
+    q_func = make_q_func(n_states)
+    path = tmp_path(f"qfunc_{n_states}.json")
+    def run():
+        disk.write_dict_as_json(path, q_func, str, list)
+    return run, n_states
+
+@case("qtable.json_load", [{"n_states": 210}, {"n_states": 10000}, {"n_states": 100000}])
+def bench_qtable_json_load(n_states: int):
+    path = tmp_path(f"qfunc_{n_states}.json")
+    disk.write_dict_as_json(path, make_q_func(n_states), str, list)
+    def run():
+        disk.read_q_as_dict(path)
+    return run, n_states
+
+@case("qtable.npy_load", [{"n_states": 210}, {"n_states": 10000}, {"n_states": 100000}])
+def bench_qtable_npy_load(n_states: int):
+    session_dir = tmp_path(f"session_{n_states}")
+    os.makedirs(session_dir, exist_ok=True)
+    qarray.write_q_as_arrays(session_dir, make_q_func(n_states))
+    def run():
+        qarray.read_q_as_arrays(session_dir)
+    return run, n_states
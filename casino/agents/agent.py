@@ -5,16 +5,21 @@ import logging
 import os
 import numpy as np
 
-from casino.io import disk
+from casino.io import disk, qarray
+from casino.io.metrics import MetricSink
 from casino.util.env import varia
 
 from casino.environments.env import Env
-from casino.plotting import plotlib
+from casino.environments.statespace import StateSpace
+from casino.agents.qtable import DenseQTable
+from casino.agents.sampler import EpsilonGreedySampler
 """Module file for anything related to the abstract concept of an agent
 """
 logger = logging.getLogger(__name__)
 class AbstractAgent(ABC):
-    def __init__(self, n_actions: int, name: str, policy_code: int, eps_constant: int) -> None:
+    metric_names = ["cumulative_episodic_rewards"] # the per episode metrics, each streamed to a MetricSink
+
+    def __init__(self, n_actions: int, name: str, policy_code: int, eps_constant: int, state_space: StateSpace = None) -> None:
         """Constructor
 
         Args:
@@ -22,29 +27,143 @@ class AbstractAgent(ABC):
             n_actions (int): the size of the action space for the game
             name (str): the name of the agent implementation
             policy_code (int): a code represneting the type of policy function
+            state_space (StateSpace, optional): the bounded state space of the game. When given, the Q function 
+                and the visit counters are stored in dense arrays indexed by the state space instead of dicts.
         """
         super().__init__()
         self.n_actions = n_actions
         self.name = name
-        self.n_state_visits = {} # counter for tracking the number of visits to a state
-        self.n_state_action_visits = {} # counter for tracking the number of times an action has been selected for a state
+        self.state_space = state_space
         self.eps_constant = eps_constant
         self.policy_type = Policies(policy_code)
+        self.sampler = EpsilonGreedySampler(n_actions)
         self.policy_func = {}
 
-        self.q_func = defaultdict(lambda: np.zeros(self.n_actions)) # Q function
+        if state_space is None:
+            self.n_state_visits = defaultdict(int) # counter for tracking the number of visits to a state
+            self.n_state_action_visits = defaultdict(int) # counter for tracking the number of times an action has been selected for a state
+            self.q_func = defaultdict(lambda: np.zeros(self.n_actions)) # Q function
+        else:
+            self.n_state_visits = np.zeros(len(state_space), dtype=np.int32)
+            self.n_state_action_visits = np.zeros((len(state_space), n_actions), dtype=np.int32)
+            self.q_func = DenseQTable(state_space, n_actions, self.n_state_action_visits) # the updated states are its keys
+            self.state_key = state_space.index_of.__getitem__ # the index of a state, without the error handling of StateSpace.index
+        self.bind_q_rows()
         self.policy_func = {} # optimal policy func
+        self.n_policy_flips = 0 # number of times a greedy action changed during the current episode
+
+        self.cumulative_episodic_rewards = MetricSink()
+
+    def open_metrics(self, output_dir: str):
+        """Stream the metrics to binary files in the output dir from now on, instead of temporary files.
+        Existing files are appended to, see MetricSink.
+
+        Args:
+            output_dir (str): the output directory
+        """
+        for name in self.metric_names:
+            getattr(self, name).close()
+            setattr(self, name, MetricSink(os.path.join(output_dir, f"{name}{varia.METRIC_EXT}")))
+
+    def close_metrics(self):
+        for name in self.metric_names:
+            getattr(self, name).close()
 
-        self.cumulative_episodic_rewards = []
+    def set_seed(self, seed: int = None):
+        """Seed the random number generator used for selecting actions
+
+        Args:
+            seed (int, optional): the seed
+        """
+        self.sampler = EpsilonGreedySampler(self.n_actions, seed)
+
+    def get_checkpoint_state(self) -> dict:
+        """Get the picklable state needed to resume training, excluding the metrics, see metric_names
+        """
+        return {
+            "q_func": dict(self.q_func) if self.state_space is None else self.q_func,
+            "policy_func": self.policy_func,
+            "n_state_visits": self.n_state_visits,
+            "n_state_action_visits": self.n_state_action_visits,
+            "sampler": self.sampler,
+        }
+
+    def set_checkpoint_state(self, state: dict):
+        """Restore the state returned by get_checkpoint_state
+        """
+        self.policy_func = state["policy_func"]
+        self.sampler = state["sampler"]
+        if self.state_space is None:
+            self.q_func = defaultdict(lambda: np.zeros(self.n_actions))
+            self.q_func.update(state["q_func"])
+            self.n_state_visits = defaultdict(int, state["n_state_visits"])
+            self.n_state_action_visits = defaultdict(int, state["n_state_action_visits"])
+        else:
+            self.q_func = state["q_func"]
+            self.n_state_visits = state["n_state_visits"]
+            self.n_state_action_visits = state["n_state_action_visits"]
+        self.bind_q_rows()
 
     def load(self, policy_func, q_func):
         self.policy_func = policy_func
-        self.q_func = q_func
+        if self.state_space is None:
+            self.q_func = q_func
+        else:
+            self.q_func.update(q_func)
+        self.bind_q_rows()
+
+    def bind_q_rows(self):
+        """Point the q rows at the storage of the q function: the q function itself with the dict backend,
+        the rows of the dense backend. Call whenever the q function is replaced.
+        """
+        self.q_rows = self.q_func if self.state_space is None else self.q_func.rows
+
+    def state_key(self, state):
+        """Get the key of a state into the q rows and the visit counters: the state itself with the dict backend,
+        and its index in the state space with the dense backend, where this method is replaced by the index lookup.
+        The hot loops of the agents get the key of a state once per step, and use the *_at methods with it.
+
+        Args:
+            state (any): the state
+        """
+        return state
 
-    @abstractmethod
     def update_policy(self):
-        """Override this method with logic for performing a training update using the states, actions and rewards
+        """Rebuild the greedy policy over every state of the q function. 
+        Override this method with logic for performing a training update using the states, actions and rewards
+        """
+        self.policy_func = dict((state, np.argmax(q_value)) for state, q_value in self.q_func.items())
+
+    def set_q_value(self, state, action, value):
+        """Write a q value, and recompute the greedy action of the state so that the policy stays up to date.
+
+        Args:
+            state (any): the state
+            action (int): the action
+            value (float): the new q value
+        """
+        self.set_q_value_at(state, self.state_key(state), action, value)
+
+    def set_q_value_at(self, state, key, action, value):
+        """set_q_value, for a state whose key is known, see state_key
         """
+        q_value = self.q_rows[key]
+        q_value[action] = value
+        self.update_greedy_action(state, q_value)
+
+    def update_greedy_action(self, state, q_value: np.ndarray):
+        """Recompute the greedy action of a state after its q values were written, counting a flip if it changed
+
+        Args:
+            state (any): the state
+            q_value (np.ndarray): the q values of the state
+        """
+        greedy_action = q_value.argmax()
+        prev_action = self.policy_func.get(state)
+        if prev_action != greedy_action:
+            if prev_action is not None:
+                self.n_policy_flips += 1
+            self.policy_func[state] = greedy_action
 
     @abstractmethod
     def train_episode(self, env: Env, episode: int):
@@ -63,8 +182,30 @@ class AbstractAgent(ABC):
             bool: true if the save was succussful
         """
 
+    def learn_trajectory(self, states: list, actions: list, rewards: list, final_state, episode: int, keys: list = None):
+        """Override this method with logic for performing the training update of an episode played elsewhere, i.e. by an actor process
+
+        Args:
+            states (list): the states an action was taken in, in order
+            actions (list): the actions taken
+            rewards (list): the rewards observed after each action
+            final_state (any): the state the episode ended in
+            episode (int): the episode number
+            keys (list, optional): the keys of the states followed by the key of the final state, see state_key. Looked up when not given.
+        """
+        raise NotImplementedError(f"Agent [{self.name}] cannot learn from trajectories!")
+
+    def get_visit_counts(self) -> dict:
+        """Get the state visit counters as a dict keyed by state, whatever the q function backend
+        """
+        if self.state_space is None:
+            return dict(self.n_state_visits)
+        return {self.state_space.state(idx): int(self.n_state_visits[idx]) for idx in np.flatnonzero(self.n_state_visits)}
+
     def get_optimal_action(self, state: list) -> int:
-        return np.amax(self.q_func[state])
+        """Get the greedy action of a state, without exploring or counting a visit
+        """
+        return int(np.argmax(self.q_func[state]))
 
     def get_policy(self, state: int):
         """Get the policy for the agent, and update the visit counters
@@ -72,6 +213,7 @@ class AbstractAgent(ABC):
         Args:
             state (int): the state for which the policy will use to select the action
         """
+        self.visit_state(state)
         action = self.policy(state)
         return action
 
@@ -87,18 +229,27 @@ class AbstractAgent(ABC):
         
         return action
 
-    def get_epsilon_greedy_policy(self, state):
-        probabilities = np.zeros(self.n_actions)
-        optimal_action_idx = np.argmax(self.q_func[state])
-        alt_action = np.random.choice(np.setdiff1d(np.arange(self.n_actions), optimal_action_idx)) 
-        epsilon = self.get_epsilon(state)
-        probabilities[optimal_action_idx] = 1 - epsilon + (epsilon/self.n_actions)
-        probabilities[alt_action] = epsilon / self.n_actions
-
-        action = np.random.choice(np.arange(self.n_actions), p = probabilities)
+    def policy_at(self, state, key) -> int:
+        """policy, for a state whose key is known, see state_key
+        """
+        action = None
+        if self.policy_type == Policies.EPSILON_GREEDY:
+            optimal_action_idx = self.policy_func.get(state)
+            if optimal_action_idx is None:
+                optimal_action_idx = self.q_rows[key].argmax()
+            action = self.sampler.sample(optimal_action_idx, self.eps_constant / (self.eps_constant + self.n_state_visits[key]))
         return action
 
+    def get_epsilon_greedy_policy(self, state):
+        optimal_action_idx = self.policy_func.get(state)
+        if optimal_action_idx is None:
+            optimal_action_idx = np.argmax(self.q_func[state])
+        return self.sampler.sample(optimal_action_idx, self.get_epsilon(state))
+
     def get_epsilon(self, state):
+        """Return the exploration rate for the state, which decays with the number of visits to the state.
+        Does not count a visit, see visit_state.
+        """
         return self.eps_constant / (self.eps_constant + self.get_state_visit_count(state))
     
     def get_alpha(self, state, action):
@@ -112,30 +263,52 @@ class AbstractAgent(ABC):
         Returns:
             float: the alpha value
         """
-        return 1/self.get_state_action_visit_count(state, action)
+        return self.get_alpha_at(self.state_key(state), action)
+
+    def get_alpha_at(self, key, action):
+        """get_alpha, for a state whose key is known, see state_key
+        """
+        n_visits = self.n_state_action_visits[key, action] + 1
+        self.n_state_action_visits[key, action] = n_visits
+        return 1/n_visits
+
+    def visit_state(self, state):
+        """Count a visit to a state. Call before selecting the action to take in the state during training.
+
+        Args:
+            state (any): the state
+        """
+        self.n_state_visits[self.state_key(state)] += 1
+
+    def visit_at(self, key):
+        """visit_state, for a state whose key is known, see state_key
+        """
+        self.n_state_visits[key] += 1
 
     def get_state_visit_count(self, state):
-        if state not in self.n_state_visits:
-            self.n_state_visits[state] = 1
-        else:
-            self.n_state_visits[state] += 1
-        
-        return self.n_state_visits[state]
+        if self.state_space is not None:
+            return self.n_state_visits[self.state_space.index(state)]
+        return self.n_state_visits.get(state, 0)
     
     def get_state_action_visit_count(self, state, action):
-        if (state, action) not in self.n_state_action_visits:
-            self.n_state_action_visits[(state, action)] = 1
-        else:
-            self.n_state_action_visits[(state, action)] += 1
-        
-        return self.n_state_action_visits[(state, action)]
+        key = self.state_key(state)
+        self.n_state_action_visits[key, action] += 1
+        return self.n_state_action_visits[key, action]
 
-    def save_training_data(self, output_dir, cumulative_rewards):
+    def save_training_data(self, output_dir, cumulative_rewards: MetricSink, export_csv: bool = True):
         logger.info("Saving training data.")
+        # states that were only read from the q function have not been given a greedy action yet
+        for state, q_value in self.q_func.items():
+            if state not in self.policy_func:
+                self.policy_func[state] = np.argmax(q_value)
         self.save(output_dir)
         disk.write_dict_as_json(os.path.join(output_dir, varia.Q_FNAME), dict(self.q_func), str, list)
         disk.write_dict_as_json(os.path.join(output_dir, varia.POLICY_FNAME), self.policy_func, str, int)
-        disk.write_numpy_as_csv(os.path.join(output_dir, varia.CUMULATIVE_EP_REWARD_FNAME), cumulative_rewards, ['Cumulative episodic reward'])
+        qarray.write_q_as_arrays(output_dir, self.q_func, self.policy_func)
+        cumulative_rewards.flush()
+        if export_csv:
+            cumulative_rewards.export_csv(os.path.join(output_dir, varia.CUMULATIVE_EP_REWARD_FNAME), 'Cumulative episodic reward')
+        logger.info(f"Mean episodic reward = [{cumulative_rewards.mean}] over [{len(cumulative_rewards)}] episodes.")
 
 class Agent(enum.Enum):
     """Enum the game mode.. defines the type of agent to use for the game.
@@ -144,11 +317,18 @@ class Agent(enum.Enum):
         HUMAN = a human playable environment
         monte = play using monte carlo trained model
         TD    = play using td learning trained model
+        SARSA_LAMBDA, Q_LAMBDA = td learning with eligibility traces
+        LINEAR = td learning with a linear function approximation of the q function
+        DYNA_Q = q learning with planning updates from a model of the observed transitions
     """
     HUMAN = 0,
     MONTE = 1,
     SARSA = 2,
     QLEARN =3
+    SARSA_LAMBDA = 4
+    Q_LAMBDA = 5
+    LINEAR = 6
+    DYNA_Q = 7
 
 class Policies(enum.Enum):
     EPSILON_GREEDY = 0
\ No newline at end of file
@@ -0,0 +1,146 @@
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+def discounted_returns(rewards: list, gamma: float) -> list:
+    """Compute the discounted return from every step of a trajectory in one reverse pass
+
+    Args:
+        rewards (list): the rewards observed after each step
+        gamma (float): the discount coefficient
+
+    Returns:
+        list: the returns
+    """
+    returns = [0.0]*len(rewards)
+    ret = 0.0
+    for i in range(len(rewards) - 1, -1, -1):
+        ret = rewards[i] + gamma * ret
+        returns[i] = ret
+    return returns
+
+class EpisodeBuffer:
+    """Reusable buffer for the trajectory of an episode.
+    States, actions and rewards are stored in preallocated numpy arrays which grow geometrically when full,
+    and are kept between episodes so that no allocation happens once the buffer has reached the episode length.
+    """
+    def __init__(self, capacity: int = 64):
+        """Constructor
+
+        Args:
+            capacity (int): the initial number of steps the buffer can hold
+        """
+        self.capacity = capacity
+        self.states = None # allocated on the first add, once the size of a state is known
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float64)
+        self.returns = np.zeros(capacity, dtype=np.float64)
+        self.length = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def clear(self):
+        self.length = 0
+
+    def add(self, state: tuple, action: int, reward: float):
+        """Append a step to the trajectory
+
+        Args:
+            state (tuple): the state the action was taken in
+            action (int): the action
+            reward (float): the reward observed after taking the action
+        """
+        if self.states is None:
+            self.states = np.zeros((self.capacity, len(state)), dtype=np.int64)
+        if self.length == self.capacity:
+            self.grow()
+        self.states[self.length] = state
+        self.actions[self.length] = action
+        self.rewards[self.length] = reward
+        self.length += 1
+
+    def grow(self):
+        """Double the capacity of the buffer, keeping its contents
+        """
+        self.capacity *= 2
+        logger.debug(f"Growing episode buffer to capacity [{self.capacity}].")
+        self.states = np.concatenate([self.states, np.zeros_like(self.states)])
+        self.actions = np.concatenate([self.actions, np.zeros_like(self.actions)])
+        self.rewards = np.concatenate([self.rewards, np.zeros_like(self.rewards)])
+        self.returns = np.zeros(self.capacity, dtype=np.float64)
+
+    def get_states(self) -> list:
+        """Get the states of the trajectory as tuples, as they are used for keys of the q function
+        """
+        return [tuple(state) for state in self.states[:self.length].tolist()]
+
+    def get_actions(self) -> list:
+        return self.actions[:self.length].tolist()
+
+    def get_rewards(self) -> np.ndarray:
+        return self.rewards[:self.length]
+
+    def compute_returns(self, gamma: float) -> np.ndarray:
+        """Compute the discounted return from every step of the trajectory in one reverse pass
+
+        Args:
+            gamma (float): the discount coefficient
+
+        Returns:
+            np.ndarray: the returns, a view into the buffer valid until the next episode
+        """
+        self.returns[:self.length] = discounted_returns(self.rewards[:self.length].tolist(), gamma)
+        return self.returns[:self.length]
+
+class TransitionBuffer:
+    """Fixed capacity ring buffer of observed transitions, with states stored as indices of a state space.
+    Once full, each new transition overwrites the oldest one. Transitions are sampled uniformly in batches.
+    """
+    def __init__(self, capacity: int = 100000, seed: int = None):
+        """Constructor
+
+        Args:
+            capacity (int): the number of transitions the buffer can hold
+            seed (int, optional): the seed for the random number generator used for sampling
+        """
+        self.capacity = capacity
+        self.rng = np.random.default_rng(seed)
+        self.states = np.zeros(capacity, dtype=np.int64)
+        self.actions = np.zeros(capacity, dtype=np.int64)
+        self.rewards = np.zeros(capacity, dtype=np.float64)
+        self.next_states = np.zeros(capacity, dtype=np.int64)
+        self.length = 0
+        self.cursor = 0 # the slot of the next transition
+
+    def __len__(self) -> int:
+        return self.length
+
+    def add(self, state_idx: int, action: int, reward: float, next_state_idx: int):
+        """Record a transition
+
+        Args:
+            state_idx (int): the index of the state the action was taken in
+            action (int): the action
+            reward (float): the reward observed after taking the action
+            next_state_idx (int): the index of the state the action led to
+        """
+        self.states[self.cursor] = state_idx
+        self.actions[self.cursor] = action
+        self.rewards[self.cursor] = reward
+        self.next_states[self.cursor] = next_state_idx
+        self.cursor = (self.cursor + 1) % self.capacity
+        self.length = min(self.length + 1, self.capacity)
+
+    def sample(self, n: int) -> tuple:
+        """Sample transitions uniformly, with replacement
+
+        Args:
+            n (int): the number of transitions
+
+        Returns:
+            tuple: the arrays of state indices, actions, rewards and next state indices of the transitions
+        """
+        idx = self.rng.integers(self.length, size=n)
+        return self.states[idx], self.actions[idx], self.rewards[idx], self.next_states[idx]
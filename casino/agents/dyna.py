@@ -0,0 +1,81 @@
+import argparse
+import logging
+import numpy as np
+
+from casino.agents.buffer import TransitionBuffer
+from casino.agents.qlearn import QLearningAgent
+from casino.environments.statespace import StateSpace
+
+logger = logging.getLogger(__name__)
+
+class DynaQAgent(QLearningAgent):
+    """Dyna-Q agent: q learning, where every real transition is also recorded into a model of the game,
+    from which a batch of simulated q learning updates is made after every real step.
+    The model is a ring buffer of the observed transitions, so sampling it samples the observed dynamics of the game.
+    See Sutton and Barto pg. 164 (2018) Reinforcement Learning for pseudocode
+    """
+    agent_name = "DynaQ"
+    plot_title = "Dyna-Q"
+
+    def __init__(self, n_actions: int, args: argparse.ArgumentParser, state_space: StateSpace):
+        """Default constructor
+
+        Args:
+            state_space (StateSpace): the state space of the game. The q function is always dense, so that planning is vectorized.
+
+        Raises:
+            ValueError: raised if the game does not declare a state space
+        """
+        if state_space is None:
+            raise ValueError("The Dyna-Q agent needs a game declaring its state space!")
+        super().__init__(n_actions, args, state_space)
+        self.n_planning = args.n_planning
+        self.model = TransitionBuffer(args.model_capacity)
+        self.n_planned = np.zeros_like(self.n_state_action_visits) # the number of planning updates of each state action pair
+
+    def set_seed(self, seed: int = None):
+        super().set_seed(seed)
+        self.model.rng = np.random.default_rng(None if seed is None else [seed, 1]) # a stream apart from the sampler's
+
+    def td_update(self, state, key, action, reward, next_state, next_key):
+        super().td_update(state, key, action, reward, next_state, next_key)
+        self.model.add(key, action, reward, next_key) # the keys are the state space indices, as the q function is dense
+        if self.n_planning > 0:
+            self.plan()
+
+    def plan(self):
+        """Make a batch of q learning updates on transitions sampled from the model, all computed from the same q values.
+        A state action pair sampled more than once is moved by the mean of its updates.
+        The step size of a pair is one over its number of real and planning updates, so that it averages
+        over both, without shrinking the step size of the real updates.
+        Terminal states are never updated, so bootstrapping from them adds nothing, as in the real updates.
+        """
+        states, actions, rewards, next_states = self.model.sample(self.n_planning)
+        q_values = self.q_func.values
+        td_targets = rewards + self.gamma * q_values[next_states].max(axis=1)
+        pairs = states * self.n_actions + actions
+        counts = np.bincount(pairs, minlength=q_values.size)
+        sampled = np.flatnonzero(counts)
+        self.n_planned.reshape(-1)[sampled] += counts[sampled].astype(self.n_planned.dtype)
+        n_updates = self.n_state_action_visits[states, actions] + self.n_planned[states, actions]
+        steps = (td_targets - q_values[states, actions]) / n_updates
+        sums = np.bincount(pairs, weights=steps, minlength=q_values.size)
+        q_values.reshape(-1)[sampled] += sums[sampled] / counts[sampled]
+
+        planned_states = []
+        for idx in np.unique(states).tolist():
+            state = self.state_space.state(idx)
+            self.update_greedy_action(state, q_values[idx])
+            planned_states.append(state)
+        self.mse_tracker.touch(planned_states)
+
+    def get_checkpoint_state(self) -> dict:
+        state = super().get_checkpoint_state()
+        state["model"] = self.model
+        state["n_planned"] = self.n_planned
+        return state
+
+    def set_checkpoint_state(self, state: dict):
+        super().set_checkpoint_state(state)
+        self.model = state["model"]
+        self.n_planned = state["n_planned"]
@@ -0,0 +1,35 @@
+import numpy as np
+import logging
+
+from casino.environments.statespace import StateSpace
+
+logger = logging.getLogger(__name__)
+
+def coarse_code(state_space: StateSpace, n_actions: int, intervals: list) -> np.ndarray:
+    """Precompute the binary coarse coded features of every state action pair of a state space.
+    Each combination of one interval per state component and one action is a feature,
+    which is on when every component of the state lies in its interval (bounds inclusive) and the action matches.
+    Overlapping intervals make several features of a state action pair active at once.
+
+    Args:
+        state_space (StateSpace): the state space
+        n_actions (int): the size of the action space
+        intervals (list): for each component of the state, a list of (low, high) intervals
+
+    Returns:
+        np.ndarray: (n_states, n_actions, n_features) float array of features, indexed like the state space.
+            States outside of every interval, i.e. a terminal state, have no active features.
+    """
+    states = np.array(state_space.states)
+    active = np.ones((len(states), 1), dtype=bool)
+    for component, component_intervals in enumerate(intervals):
+        lows, highs = np.array(component_intervals).T
+        in_interval = (states[:, component, None] >= lows) & (states[:, component, None] <= highs)
+        active = (active[:, :, None] & in_interval[:, None, :]).reshape(len(states), -1)
+
+    n_state_features = active.shape[1]
+    features = np.zeros((len(states), n_actions, n_actions * n_state_features), dtype=np.float64)
+    for action in range(n_actions):
+        features[:, action, action * n_state_features:(action + 1) * n_state_features] = active
+    logger.debug(f"Precomputed [{features.shape[-1]}] coarse coded features for [{len(states)}] states.")
+    return features
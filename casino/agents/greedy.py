@@ -0,0 +1,38 @@
+import logging
+import os
+import numpy as np
+
+from casino.environments.statespace import StateSpace
+from casino.io import disk, qarray
+from casino.util.env import varia
+
+logger = logging.getLogger(__name__)
+
+def load_greedy_policy(session_dir: str, state_space: StateSpace) -> np.ndarray:
+    """Load the greedy policy of a saved session as an array of actions indexed by the state space.
+    The policy arrays are preferred, then policy.json, then the argmax of qfunc.json.
+    States the session never visited get action 0, as they would from the argmax of an all zero q value.
+
+    Args:
+        session_dir (str): the data dir of the session
+        state_space (StateSpace): the state space of the game
+
+    Returns:
+        np.ndarray: the greedy action of every state of the state space
+    """
+    if qarray.has_q_arrays(session_dir):
+        policy_func = qarray.read_q_as_arrays(session_dir).get_policy()
+    elif os.path.exists(os.path.join(session_dir, varia.POLICY_FNAME)):
+        policy_func = disk.read_policy_as_dict(os.path.join(session_dir, varia.POLICY_FNAME))
+    else:
+        q_func = disk.read_q_as_dict(os.path.join(session_dir, varia.Q_FNAME))
+        policy_func = {state: int(np.argmax(q_value)) for state, q_value in q_func.items()}
+
+    policy = np.zeros(len(state_space), dtype=np.int64)
+    n_loaded = 0
+    for state, action in policy_func.items():
+        if state in state_space:
+            policy[state_space.index(state)] = action
+            n_loaded += 1
+    logger.info(f"Loaded the greedy action of [{n_loaded}] of the [{len(state_space)}] states @ dir {session_dir}.")
+    return policy
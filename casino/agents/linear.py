@@ -0,0 +1,114 @@
+import argparse
+import logging
+import numpy as np
+import os
+
+from casino.agents.agent import AbstractAgent
+from casino.agents.features import coarse_code
+from casino.agents.qlearn import load_opt_q, save_mse_plot
+from casino.agents.qtable import LinearQTable
+from casino.environments.statespace import StateSpace
+from casino.io.metrics import MetricSink
+from casino.util.env import varia
+
+logger = logging.getLogger(__name__)
+
+class LinearAgent(AbstractAgent):
+    """SARSA(lambda) agent with a q function linear in coarse coded binary features, see coarse_code.
+    The features of every state action pair are precomputed once, so an update is a row lookup, a dot product and an axpy on the weights.
+    The greedy action of a state is read from the q function, as every update changes the values of every state,
+    so the policy func stays empty until the training data is saved.
+    See Sutton and Barto pg. 305 (2018) Reinforcement Learning for pseudocode
+    """
+    metric_names = AbstractAgent.metric_names + ["mse", "mse_episodes"]
+
+    def __init__(self, n_actions: int, args: argparse.ArgumentParser, state_space: StateSpace, feature_intervals: list):
+        """Default constructor
+
+        Args:
+            state_space (StateSpace): the state space of the game, indexing the precomputed features
+            feature_intervals (list): for each component of the state, the (low, high) intervals to coarse code it with
+
+        Raises:
+            ValueError: raised if the game does not declare a state space or feature intervals
+        """
+        if state_space is None or feature_intervals is None:
+            raise ValueError("The linear agent needs a game declaring its state space and feature intervals!")
+        super().__init__(n_actions, "Linear", args.policy, args.eps_const, state_space)
+        self.gamma = args.gamma
+        self.alpha = args.alpha
+        self.lam = args.lam
+        self.features = coarse_code(state_space, n_actions, feature_intervals)
+        self.q_func = LinearQTable(state_space, self.features, self.n_state_visits)
+        self.bind_q_rows()
+        self.trace = np.zeros(self.features.shape[-1], dtype=np.float64) # eligibility trace of the weights
+
+        self.opt_q = load_opt_q(args.opt_q_path) if args.opt_q_path else {} # no mse without a reference q function
+        self.mse_every = args.mse_every
+        # the reference q values aligned with the state space, and which of its states they are defined for
+        self.opt_values = np.zeros((len(state_space), n_actions), dtype=np.float64)
+        self.has_opt_value = np.zeros(len(state_space), dtype=bool)
+        for state in self.opt_q:
+            if state in state_space:
+                self.opt_values[state_space.index(state)] = self.opt_q[state]
+                self.has_opt_value[state_space.index(state)] = True
+        self.mse = MetricSink()
+        self.mse_episodes = MetricSink() # the episodes at which the mse was evaluated
+
+    def train_episode(self, env, episode: int):
+        self.trace[:] = 0
+        state = env.reset()
+        key = self.state_key(state)
+        self.visit_at(key)
+        action = self.policy_at(state, key)
+        features = self.features[key, action]
+
+        rewards = []
+        terminal = False
+        while not terminal:
+            next_state, reward, terminal = env.step(action)
+            next_features = None
+            if not terminal:
+                key = self.state_key(next_state)
+                self.visit_at(key)
+                action = self.policy_at(next_state, key)
+                next_features = self.features[key, action]
+            self.td_update(features, reward, next_features)
+
+            features = next_features
+            rewards.append(reward)
+
+        self.cumulative_episodic_rewards.append(sum(rewards))
+        if len(self.opt_q) > 0 and episode % self.mse_every == 0:
+            self.mse.append(self.compute_mse())
+            self.mse_episodes.append(episode)
+        if (episode % 1000 == 0 and len(self.mse) > 0):
+            logger.info(f"MSE = [{self.mse.last}] at episode [{episode}]!")
+
+    def td_update(self, features: np.ndarray, reward: float, next_features: np.ndarray = None):
+        """Semi gradient SARSA(lambda) update of the weights, along the accumulating eligibility trace
+
+        Args:
+            features (np.ndarray): the features of the state action pair
+            reward (float): the reward observed after the action
+            next_features (np.ndarray, optional): the features of the next state action pair. None if the next state is terminal.
+        """
+        weights = self.q_func.weights
+        td_target = reward if next_features is None else reward + self.gamma * (next_features @ weights)
+        td_error = td_target - features @ weights
+        self.trace *= self.gamma * self.lam
+        self.trace += features
+        weights += (self.alpha * td_error) * self.trace
+
+    def compute_mse(self) -> float:
+        """Compute the mse of the q function over the states it has been read at,
+        with the same sign convention and states as compute_mse of the tabular agents
+        """
+        mask = self.q_func.get_key_mask() & self.has_opt_value
+        return -float(np.sum((self.q_func.values[mask] - self.opt_values[mask])**2))
+
+    def save(self, output_dir) -> bool:
+        logger.info("Saving.")
+        save_mse_plot(self.mse_episodes, self.mse, "Linear SARSA(lambda)", output_dir)
+        np.save(os.path.join(output_dir, varia.LINEAR_WEIGHTS_FNAME), self.q_func.weights)
+        return super().save(output_dir)
@@ -1,5 +1,7 @@
 import argparse
 from casino.agents.agent import AbstractAgent
+from casino.agents.buffer import EpisodeBuffer, discounted_returns
+from casino.environments.statespace import StateSpace
 
 import numpy as np
 import logging
@@ -9,51 +11,72 @@ class MonteCarlo(AbstractAgent):
     """Monte carlo agent. 
     See Sutton and Barto pg. 101 (2018) Reinforcement Learning for pseudocode
     """
-    def __init__(self, n_actions: int, args: argparse.ArgumentParser):
+    def __init__(self, n_actions: int, args: argparse.ArgumentParser, state_space: StateSpace = None):
         """Default constructor
         """
-        super().__init__(n_actions, "MonteCarlo", args.policy, args.eps_const)
+        super().__init__(n_actions, "MonteCarlo", args.policy, args.eps_const, state_space)
         self.gamma = args.gamma
-        self.states = []
-        self.actions = []
-        self.rewards = []
+        self.first_visit = args.visit_mode == "first"
+        self.buffer = EpisodeBuffer()
 
     def update_policy(self):
-        rewards = np.array(self.rewards)
-        for i in range(len(self.states)):
-            state = self.states[i]
-            action = self.actions[i]
+        self.update_q(self.buffer.get_states(), self.buffer.get_actions(), self.buffer.compute_returns(self.gamma).tolist())
 
-            discounts = np.array([self.gamma ** n for n in range(len(rewards[i:]))])
-            returns = sum(rewards[i:] * discounts)
-            self.q_func[state][action] += self.get_alpha(state, action) * (returns - self.q_func[state][action])
-            self.policy_func = dict((state, np.argmax(q_value)) for state, q_value in self.q_func.items())
+    def update_q(self, states: list, actions: list, returns: list, keys: list = None):
+        """Move the q values of the state action pairs of an episode towards their returns
+
+        Args:
+            states (list): the states an action was taken in, in order
+            actions (list): the actions taken
+            returns (list): the discounted return from each step
+            keys (list, optional): the keys of the states, see state_key. Looked up when not given.
+        """
+        visited = set()
+        for i in range(len(states)):
+            state = states[i]
+            action = actions[i]
+            if self.first_visit:
+                if (state, action) in visited:
+                    continue
+                visited.add((state, action))
+
+            key = self.state_key(state) if keys is None else keys[i]
+            q_value = self.q_rows[key][action]
+            self.set_q_value_at(state, key, action, q_value + self.get_alpha_at(key, action) * (returns[i] - q_value))
 
     def save(self, output_dir) -> bool:
         logger.info("Saving.")
         return super().save(output_dir)
 
     def train_episode(self, env, episode: int):
-        self.states, self.actions, self.rewards = self.generate_episode(env)
-        self.cumulative_episodic_rewards.append(sum(self.rewards))
+        self.n_policy_flips = 0
+        self.generate_episode(env)
+        self.cumulative_episodic_rewards.append(self.buffer.get_rewards().sum())
         self.update_policy()
 
-    def generate_episode(self, env) -> tuple:
+    def learn_trajectory(self, states: list, actions: list, rewards: list, final_state, episode: int, keys: list = None):
+        self.n_policy_flips = 0
+        if keys is None:
+            keys = [self.state_key(state) for state in states]
+        for key in keys[:len(states)]: # the final state is not acted in
+            self.visit_at(key)
+        self.cumulative_episodic_rewards.append(sum(rewards))
+        self.update_q(states, actions, discounted_returns(rewards, self.gamma), keys)
+
+    def generate_episode(self, env) -> EpisodeBuffer:
         """Episode generation method
 
         Returns:
-            list: the trajectory for the episode containg tuples of (state, action, reward)
+            EpisodeBuffer: the buffer holding the trajectory for the episode, as (state, action, reward) steps
         """
         state = env.reset()
-        states = []
-        actions = []
-        rewards = []
+        self.buffer.clear()
         terminal = False
         while not terminal:
-            action = self.policy(state)
+            key = self.state_key(state)
+            self.visit_at(key)
+            action = self.policy_at(state, key)
             next_state, reward, terminal = env.step(action)
+            self.buffer.add(state, action, reward)
             state = next_state
-            states.append(state)
-            actions.append(action)
-            rewards.append(reward)        
-        return states, actions, rewards
\ No newline at end of file
+        return self.buffer
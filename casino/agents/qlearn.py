@@ -1,124 +1,317 @@
 import argparse
 import logging
+import math
 import numpy as np
 import os
 
 from casino.agents.agent import AbstractAgent
-from casino.io import disk
-from casino.plotting import plotlib
+from casino.environments.statespace import StateSpace
+from casino.io import qarray
+from casino.io.metrics import MetricSink
 from casino.util.env import varia
 
 logger = logging.getLogger(__name__)
-class SarsaAgent(AbstractAgent):
-    """Q learning agent using SARSA.
-    See Sutton and Barto pg. 130 (2018) Reinforcement Learning for pseudocode
-
 
+class TDAgent(AbstractAgent):
+    """Base of the one step TD control agents: tracks the mse of the q function against a reference q function,
+    and learns the trajectories played by actors one TD update per step.
+    Subclasses implement train_episode and td_update.
     """
-    def __init__(self, n_actions: int, args: argparse.ArgumentParser):
+    metric_names = AbstractAgent.metric_names + ["mse", "mse_episodes"]
+    agent_name = None
+    plot_title = None
+
+    def __init__(self, n_actions: int, args: argparse.ArgumentParser, state_space: StateSpace = None):
         """Default constructor
         """
-        super().__init__(n_actions, "Sarsa", args.policy, args.eps_const)
+        super().__init__(n_actions, self.agent_name, args.policy, args.eps_const, state_space)
         self.gamma = args.gamma
-        self.opt_q = load_opt_q(args.opt_q_path)
-        self.mse = []
+        self.opt_q = load_opt_q(args.opt_q_path) if args.opt_q_path else {} # no mse without a reference q function
+        self.mse_tracker = MseTracker(self.opt_q, args.mse_every, args.mse_sample_size)
+        self.mse = MetricSink()
+        self.mse_episodes = MetricSink() # the episodes at which the mse was evaluated
+
+    def td_update(self, state, key, action, reward, next_state, next_key):
+        """Override this method with the TD update of the q value of a step
+
+        Args:
+            state (any): the state the action was taken in
+            key (any): the key of the state, see AbstractAgent.state_key
+            action (int): the action
+            reward (float): the reward observed after the action
+            next_state (any): the state the action led to
+            next_key (any): the key of the next state
+        """
+        raise NotImplementedError
+
+    def learn_trajectory(self, states: list, actions: list, rewards: list, final_state, episode: int, keys: list = None):
+        self.n_policy_flips = 0
+        touched_states = []
+        next_states = states[1:] + [final_state]
+        if keys is None:
+            keys = [self.state_key(state) for state in states] + [self.state_key(final_state)]
+        for state, key, action, reward, next_state, next_key in zip(states, keys, actions, rewards, next_states, keys[1:]):
+            self.visit_at(key)
+            self.td_update(state, key, action, reward, next_state, next_key)
+            touched_states.append(state)
+            touched_states.append(next_state)
+
+        self.end_episode(rewards, touched_states, episode)
+
+    def end_episode(self, rewards: list, touched_states: list, episode: int):
+        self.cumulative_episodic_rewards.append(sum(rewards))
+        self.mse_tracker.touch(touched_states)
+        if self.mse_tracker.is_due(episode):
+            self.mse.append(self.mse_tracker.compute(self.q_func))
+            self.mse_episodes.append(episode)
+
+        if (episode % 1000 == 0 and len(self.mse) > 0):
+            logger.info(f"MSE = [{self.mse.last}], greedy action flips = [{self.n_policy_flips}] at episode [{episode}]!")
+
+    def get_checkpoint_state(self) -> dict:
+        state = super().get_checkpoint_state()
+        state["mse_rng"] = self.mse_tracker.rng
+        return state
+
+    def set_checkpoint_state(self, state: dict):
+        super().set_checkpoint_state(state)
+        self.mse_tracker.rng = state["mse_rng"]
+        self.mse_tracker.reset(self.q_func.keys())
+
+    def save(self, output_dir) -> bool:
+        logger.info("Saving.")
+        save_mse_plot(self.mse_episodes, self.mse, self.plot_title, output_dir)
+        return super().save(output_dir)
+
+class SarsaAgent(TDAgent):
+    """Q learning agent using SARSA.
+    See Sutton and Barto pg. 130 (2018) Reinforcement Learning for pseudocode
+    """
+    agent_name = "Sarsa"
+    plot_title = "SARSA"
 
     def train_episode(self, env, episode: int):
+        self.n_policy_flips = 0
         state = env.reset()
-        action = self.policy(state)
+        key = self.state_key(state)
+        self.visit_at(key)
+        action = self.policy_at(state, key)
 
         rewards = []
+        touched_states = []
         terminal = False
         while not terminal:
             next_state, reward, terminal = env.step(action)
-            next_action = np.argmax(self.q_func[next_state])
-            td_target = reward + self.gamma * self.q_func[next_state][action]
-            td_error  = td_target - self.q_func[state][action]
+            next_key = self.state_key(next_state)
+            if not terminal:
+                self.visit_at(next_key) # every state acted in is visited, as in learn_trajectory
+            next_action = self.q_rows[next_key].argmax()
+            self.td_update(state, key, action, reward, next_state, next_key)
 
-            self.q_func[state][action] = self.q_func[state][action] + super().get_alpha(state, action) * td_error
-
-            state = next_state
+            touched_states.append(state)
+            touched_states.append(next_state)
+            state, key = next_state, next_key
             action = next_action
             rewards.append(reward)
-          
-
-        self.cumulative_episodic_rewards.append(sum(rewards))
-        episodic_mse = compute_mse(self.opt_q, self.q_func)
-        self.mse.append(episodic_mse)
-        self.update_policy()
 
-        if (episode % 1000 == 0):
-            logger.info(f"MSE = [{episodic_mse}] at episode [{episode}]!")
+        self.end_episode(rewards, touched_states, episode)
 
-    def update_policy(self):
-        self.policy_func = dict((state, np.argmax(q_value)) for state, q_value in self.q_func.items())
+    def td_update(self, state, key, action, reward, next_state, next_key):
+        q_value = self.q_rows[key][action]
+        td_target = reward + self.gamma * self.q_rows[next_key][action]
+        td_error  = td_target - q_value
 
+        self.set_q_value_at(state, key, action, q_value + self.get_alpha_at(key, action) * td_error)
 
-    def save(self, output_dir) -> bool:
-        logger.info("Saving.")
-        plotlib.line_plot(np.arange(1,len(self.mse)+1), self.mse, 
-            "SARSA", "Training episode", "Mean square error", os.path.join(output_dir, varia.MSE_PLOT_NAME))
-        return super().save(output_dir)
-
-class QLearningAgent(AbstractAgent):
+class QLearningAgent(TDAgent):
     """Q learning agent
     See Sutton and Barto pg. 131 (2018) Reinforcement Learning for pseudocode
     """
-    def __init__(self, n_actions: int, args: argparse.ArgumentParser):
-        """Default constructor
-        """
-        super().__init__(n_actions, "Qlearn", args.policy, args.eps_const)
-        self.gamma = args.gamma
-        self.opt_q = load_opt_q(args.opt_q_path)
-        self.mse = []
+    agent_name = "Qlearn"
+    plot_title = "Q Learning"
 
     def train_episode(self, env, episode: int):
+        self.n_policy_flips = 0
         state = env.reset()
+        key = self.state_key(state)
 
         rewards = []
+        touched_states = []
         terminal = False
         while not terminal:
-            action = self.policy(state)
+            self.visit_at(key)
+            action = self.policy_at(state, key)
             next_state, reward, terminal = env.step(action)
-            next_action = np.argmax(self.q_func[next_state])
-            td_target = reward + self.gamma * self.q_func[next_state][next_action]
-            td_error  = td_target - self.q_func[state][action]
+            next_key = self.state_key(next_state)
+            self.td_update(state, key, action, reward, next_state, next_key)
 
-            self.q_func[state][action] = self.q_func[state][action] + super().get_alpha(state, action) * td_error
-
-            state = next_state
+            touched_states.append(state)
+            touched_states.append(next_state)
+            state, key = next_state, next_key
             rewards.append(reward)
-          
 
-        self.cumulative_episodic_rewards.append(sum(rewards))
-        episodic_mse = compute_mse(self.opt_q, self.q_func)
-        self.mse.append(episodic_mse)
-        self.update_policy()
+        self.end_episode(rewards, touched_states, episode)
 
-        if (episode % 1000 == 0):
-            logger.info(f"MSE = [{episodic_mse}] at episode [{episode}]!")
+    def td_update(self, state, key, action, reward, next_state, next_key):
+        q_value = self.q_rows[key][action]
+        td_target = reward + self.gamma * self.q_rows[next_key].max()
+        td_error  = td_target - q_value
 
-    def update_policy(self):
-        self.policy_func = dict((state, np.argmax(q_value)) for state, q_value in self.q_func.items())
+        self.set_q_value_at(state, key, action, q_value + self.get_alpha_at(key, action) * td_error)
 
-    def save(self, output_dir) -> bool:
-        logger.info("Saving.")
-        plotlib.line_plot(np.arange(1,len(self.mse)+1), self.mse, 
-            "Q Learning", "Training episode", "Mean square error", os.path.join(output_dir, varia.MSE_PLOT_NAME))
-        return super().save(output_dir)
+def save_mse_plot(mse_episodes: MetricSink, mse: MetricSink, title: str, output_dir: str):
+    """Plot the mse of a training session against the episodes it was evaluated at, into the output dir
+
+    Args:
+        mse_episodes (MetricSink): the episodes at which the mse was evaluated
+        mse (MetricSink): the mse
+        title (str): the title of the plot
+        output_dir (str): the output directory
+    """
+    from casino.plotting import plotlib # imported lazily, matplotlib is slow to import
+    episodes, mse = plotlib.downsample_lttb(mse_episodes.values(mmap=True), mse.values(mmap=True), plotlib.MAX_LINE_POINTS)
+    plotlib.line_plot(episodes + 1, mse,
+        title, "Training episode", "Mean square error", os.path.join(output_dir, varia.MSE_PLOT_NAME))
+
+_opt_q_cache = {} # the reference q functions loaded by this process, keyed by path and modification time
 
 def load_opt_q(fpath):
-    return disk.read_q_as_dict(fpath)
+    """Load the reference q function, see qarray.read_q.
+    It is loaded once per process and shared read only by the agents using it, including those of forked worker processes.
+
+    Args:
+        fpath (str): a session dir, one of its .npy arrays or a qfunc.json file
+    """
+    key = (os.path.abspath(fpath), os.path.getmtime(fpath))
+    if key not in _opt_q_cache:
+        _opt_q_cache[key] = qarray.read_q(fpath)
+    return _opt_q_cache[key]
 
 def compute_mse(opt_q: dict, q: dict):
     """Given two q functions, compute the MSE across the s,a pairs.
+    The errors of the states are summed exactly, so the result does not depend on the order of the states.
 
     Args:
         opt_q (dict): optimal q function
         q (dict): approximated q function
     """
-    mse = 0
-    for state in q.keys():
-        for action in range(len(q[state])):
-            mse -= (np.max(q[state][action]) - opt_q[state][action])**2
-    return mse
+    return -math.fsum(get_state_error(q[state], opt_q[state]) for state in q.keys() if state in opt_q)
+
+def get_state_error(q_value: np.ndarray, opt_q_value: np.ndarray) -> float:
+    """Get the squared error of the action values of a state, summed over the actions
+    """
+    return float(np.sum((np.asarray(q_value) - opt_q_value)**2))
+
+class MseTracker:
+    """Tracks the MSE of compute_mse during training, without walking the whole q function.
+    The error of each state is cached, and only the states touched since the last evaluation are recomputed.
+    The total error is a running sum over the cached errors, updated by the change of each recomputed state,
+    so an evaluation costs time in the number of touched states rather than in the size of the q function.
+    The running sum is compensated (Neumaier summation), and resynced to the exact sum of compute_mse every resync_every evaluations,
+    so that it does not drift from compute_mse.
+    States missing from the reference q function are skipped.
+    """
+    def __init__(self, opt_q: dict, every: int = 1, sample_size: int = 0, resync_every: int = 1000):
+        """Constructor
+
+        Args:
+            opt_q (dict): optimal q function
+            every (int): evaluate the mse every this many episodes
+            sample_size (int): if > 0, estimate the mse from this many randomly sampled states
+                of the q function instead of tracking it exactly
+            resync_every (int): recompute the total error exactly from the cached errors every this many evaluations
+        """
+        self.opt_q = opt_q
+        self.every = every
+        self.sample_size = sample_size
+        self.resync_every = resync_every
+        self.rng = np.random.default_rng()
+        self.state_errors = {} # the current squared error of each state
+        self.total_error = 0.0
+        self.compensation = 0.0 # the low order bits lost by the running total
+        self.n_evaluations = 0
+        self.dirty_states = {} # the states touched since the last evaluation, in order
+        self.missing_states = set()
+        self.candidates = [] # the states to sample from, i.e. the touched states of the reference q function, in order
+        self.candidate_set = set()
+
+    def touch(self, states: list):
+        """Mark states whose q values may have been written or created since the last evaluation
+
+        Args:
+            states (list): the states
+        """
+        if len(self.opt_q) == 0:
+            return
+        if self.sample_size <= 0:
+            self.dirty_states.update(dict.fromkeys(states))
+            return
+        for state in states:
+            if state not in self.candidate_set and state in self.opt_q:
+                self.candidate_set.add(state)
+                self.candidates.append(state)
+
+    def is_due(self, episode: int) -> bool:
+        return len(self.opt_q) > 0 and episode % self.every == 0
+
+    def reset(self, states):
+        """Forget the cached errors, and mark the given states to be recomputed at the next evaluation
+
+        Args:
+            states (iterable): the states of the q function
+        """
+        self.state_errors = {}
+        self.total_error = 0.0
+        self.compensation = 0.0
+        self.dirty_states = {}
+        self.candidates = []
+        self.candidate_set = set()
+        self.touch(list(states))
+
+    def compute(self, q: dict) -> float:
+        """Compute the mse of the q function
+
+        Args:
+            q (dict): approximated q function
+
+        Returns:
+            float: the mse, with the same sign convention as compute_mse
+        """
+        if self.sample_size > 0:
+            return self.estimate(q)
+
+        for state in self.dirty_states:
+            if state not in self.opt_q:
+                if state not in self.missing_states:
+                    logger.warning(f"State {state} is missing from the reference q function. Skipping it in the MSE.")
+                    self.missing_states.add(state)
+                continue
+            error = get_state_error(q[state], self.opt_q[state])
+            self.add_error(error - self.state_errors.get(state, 0.0))
+            self.state_errors[state] = error
+        self.dirty_states.clear()
+
+        self.n_evaluations += 1
+        if self.n_evaluations % self.resync_every == 0:
+            self.total_error, self.compensation = math.fsum(self.state_errors.values()), 0.0
+        return -(self.total_error + self.compensation)
+
+    def add_error(self, delta: float):
+        """Add to the running total error, keeping the rounding error of the addition in the compensation
+        """
+        total = self.total_error + delta
+        if abs(self.total_error) >= abs(delta):
+            self.compensation += (self.total_error - total) + delta
+        else:
+            self.compensation += (delta - total) + self.total_error
+        self.total_error = total
+
+    def estimate(self, q: dict) -> float:
+        """Estimate the mse from a uniform sample of the touched states, scaled to their number
+        """
+        states = self.candidates
+        if len(states) == 0:
+            return 0.0
+        sample = self.rng.choice(len(states), size=min(self.sample_size, len(states)), replace=False)
+        error = math.fsum(get_state_error(q[states[idx]], self.opt_q[states[idx]]) for idx in sample.tolist())
+        return -error * len(states) / len(sample)
@@ -0,0 +1,137 @@
+import numpy as np
+import logging
+
+from casino.environments.statespace import StateSpace
+
+logger = logging.getLogger(__name__)
+
+class DenseQTable:
+    """Array backed Q function over a bounded state space.
+    Behaves like the defaultdict q function of the AbstractAgent: indexing by a state tuple returns
+    the (writable) row of action values for the state. The keys of the table are the states that have been set,
+    or counted by the visit counters it is given. Reading a row does not make its state a key,
+    so that the hot loops of the agents can index the values array directly, see AbstractAgent.state_key.
+    """
+    def __init__(self, state_space: StateSpace, n_actions: int, visits: np.ndarray = None):
+        """Constructor
+
+        Args:
+            state_space (StateSpace): the state space the table is defined over
+            n_actions (int): the size of the action space
+            visits (np.ndarray, optional): the visit counters of the states, or of their state action pairs, shared with the agent.
+                States with a visit are keys of the table.
+        """
+        self.state_space = state_space
+        self.n_actions = n_actions
+        self.values = np.zeros((len(state_space), n_actions), dtype=np.float64)
+        self.visits = visits
+        self.seen = np.zeros(len(state_space), dtype=bool) # states that have been set
+
+    def __getitem__(self, state) -> np.ndarray:
+        return self.values[self.state_space.index(state)]
+
+    def __setitem__(self, state, value):
+        idx = self.state_space.index(state)
+        self.seen[idx] = True
+        self.values[idx] = value
+
+    @property
+    def rows(self) -> np.ndarray:
+        """The action values of the states, indexed by the state space index of a state
+        """
+        return self.values
+
+    def get_key_mask(self) -> np.ndarray:
+        """Get which states are keys of the table, as a boolean array over the state space
+        """
+        if self.visits is None:
+            return self.seen
+        visited = self.visits > 0
+        return self.seen | (visited if visited.ndim == 1 else visited.any(axis=1))
+
+    def __contains__(self, state) -> bool:
+        return state in self.state_space and self.get_key_mask()[self.state_space.index(state)]
+
+    def __len__(self) -> int:
+        return int(np.count_nonzero(self.get_key_mask()))
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self) -> list:
+        return [self.state_space.state(idx) for idx in np.flatnonzero(self.get_key_mask())]
+
+    def items(self) -> list:
+        return [(self.state_space.state(idx), self.values[idx]) for idx in np.flatnonzero(self.get_key_mask())]
+
+    def update(self, q_func: dict):
+        """Copy the values of a dict q function into the table
+
+        Args:
+            q_func (dict): the q function, with state tuple keys and action value rows
+        """
+        for state, q_value in q_func.items():
+            self[state] = q_value
+
+class LinearQTable(DenseQTable):
+    """Q function approximated as a linear function of precomputed features, over a bounded state space.
+    Behaves like a read only DenseQTable: indexing by a state tuple returns the action values of the state,
+    computed from the features of the state and the weights. It is learned by updating the weights.
+    """
+    def __init__(self, state_space: StateSpace, features: np.ndarray, visits: np.ndarray = None):
+        """Constructor
+
+        Args:
+            state_space (StateSpace): the state space the table is defined over
+            features (np.ndarray): (n_states, n_actions, n_features) array of the features of every state action pair
+            visits (np.ndarray, optional): the visit counters of the states, see DenseQTable
+        """
+        self.state_space = state_space
+        self.n_actions = features.shape[1]
+        self.features = features
+        self.weights = np.zeros(features.shape[-1], dtype=np.float64)
+        self.visits = visits
+        self.seen = np.zeros(len(state_space), dtype=bool)
+
+    @property
+    def values(self) -> np.ndarray:
+        """The (n_states, n_actions) action values of every state
+        """
+        return self.features @ self.weights
+
+    @property
+    def rows(self):
+        """The action values of the states, indexed by the state space index of a state.
+        Computed on indexing from the current weights, rather than for every state as values is.
+        """
+        return LinearRows(self)
+
+    def __getitem__(self, state) -> np.ndarray:
+        return self.features[self.state_space.index(state)] @ self.weights
+
+    def __setitem__(self, state, value):
+        raise TypeError("The values of a linear q function cannot be set, update its weights instead!")
+
+    def items(self) -> list:
+        values = self.values
+        return [(self.state_space.state(idx), values[idx]) for idx in np.flatnonzero(self.get_key_mask())]
+
+    def update(self, q_func: dict):
+        """Fit the weights to the values of a dict q function by least squares
+
+        Args:
+            q_func (dict): the q function, with state tuple keys and action value rows
+        """
+        idx = np.array([self.state_space.index(state) for state in q_func.keys()], dtype=np.int64)
+        values = np.array([q_func[state] for state in q_func.keys()], dtype=np.float64)
+        self.weights = np.linalg.lstsq(self.features[idx].reshape(-1, self.features.shape[-1]), values.reshape(-1), rcond=None)[0]
+        self.seen[idx] = True
+
+class LinearRows:
+    """Index based view of the action values of a LinearQTable, see LinearQTable.rows
+    """
+    def __init__(self, q_table: LinearQTable):
+        self.q_table = q_table
+
+    def __getitem__(self, idx) -> np.ndarray:
+        return self.q_table.features[idx] @ self.q_table.weights
@@ -0,0 +1,51 @@
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+class EpsilonGreedySampler:
+    """Samples epsilon greedy actions using uniform variates drawn in bulk from a numpy Generator.
+    A single uniform variate u decides each action: if u < epsilon, u / epsilon is itself uniform
+    and selects the random action, otherwise the greedy action is taken.
+    """
+    def __init__(self, n_actions: int, seed: int = None, buffer_size: int = 4096):
+        """Constructor
+
+        Args:
+            n_actions (int): the size of the action space
+            seed (int, optional): the seed for the random number generator
+            buffer_size (int): the number of uniform variates drawn at a time
+        """
+        self.n_actions = n_actions
+        self.rng = np.random.default_rng(seed)
+        self.buffer_size = buffer_size
+        self.refill()
+
+    def refill(self):
+        self.uniforms = self.rng.random(self.buffer_size).tolist()
+        self.cursor = 0
+
+    def uniform(self) -> float:
+        """Get the next uniform variate in [0, 1) from the buffer
+        """
+        if self.cursor == self.buffer_size:
+            self.refill()
+        u = self.uniforms[self.cursor]
+        self.cursor += 1
+        return u
+
+    def sample(self, greedy_action: int, epsilon: float) -> int:
+        """Sample an action. With probability epsilon a uniformly random action is taken,
+        so the greedy action has probability 1 - epsilon + epsilon/n_actions.
+
+        Args:
+            greedy_action (int): the greedy action
+            epsilon (float): the exploration rate
+
+        Returns:
+            int: the action
+        """
+        u = self.uniform()
+        if u < epsilon:
+            return min(int(u / epsilon * self.n_actions), self.n_actions - 1)
+        return greedy_action
@@ -0,0 +1,131 @@
+import argparse
+import logging
+
+from casino.agents.qlearn import QLearningAgent, SarsaAgent
+from casino.agents.traces import EligibilityTraces
+from casino.environments.statespace import StateSpace
+
+logger = logging.getLogger(__name__)
+
+class TraceMixin:
+    """The training loop of the TD(lambda) agents, shared by SARSA(lambda) and Q(lambda).
+    Eligibility traces are kept only for the state action pairs visited in the current episode, see EligibilityTraces,
+    so a step costs time in the number of pairs visited so far in the episode rather than in the size of the q table.
+    """
+    def init_traces(self, args: argparse.ArgumentParser):
+        self.lam = args.lam
+        self.traces = EligibilityTraces(args.trace_type == "replacing")
+
+    def train_episode(self, env, episode: int):
+        self.n_policy_flips = 0
+        self.traces.clear()
+        state = env.reset()
+        key = self.state_key(state)
+        self.visit_at(key)
+        action = self.policy_at(state, key)
+
+        rewards = []
+        touched_states = []
+        terminal = False
+        while not terminal:
+            next_state, reward, terminal = env.step(action)
+            next_key = self.state_key(next_state)
+            next_action = None
+            if not terminal:
+                self.visit_at(next_key)
+                next_action = self.policy_at(next_state, next_key)
+            self.td_update(state, key, action, reward, next_state, next_key, next_action)
+
+            touched_states.append(state)
+            touched_states.append(next_state)
+            state, key = next_state, next_key
+            action = next_action
+            rewards.append(reward)
+
+        self.end_episode(rewards, touched_states, episode)
+
+    def td_update(self, state, key, action, reward, next_state, next_key, next_action=None):
+        """Update the q values of every pair with a trace by the TD error of a step, then decay the traces
+
+        Args:
+            state (any): the state the action was taken in
+            key (any): the key of the state, see AbstractAgent.state_key
+            action (int): the action
+            reward (float): the reward observed after the action
+            next_state (any): the state the action led to
+            next_key (any): the key of the next state
+            next_action (int, optional): the action taken in the next state. None if the next state is terminal.
+        """
+        if next_action is None:
+            td_target, decay = reward, 0.0
+        else:
+            td_target, decay = self.get_td_target(reward, next_key, next_action)
+        td_error = td_target - self.q_rows[key][action]
+
+        self.traces.visit(state, action, self.get_alpha_at(key, action), key)
+        for traced_state, traced_key, traced_action, step in self.traces.keyed_steps():
+            self.set_q_value_at(traced_state, traced_key, traced_action, self.q_rows[traced_key][traced_action] + step * td_error)
+        if decay > 0:
+            self.traces.decay(decay)
+        else:
+            self.traces.clear()
+
+    def get_td_target(self, reward: float, next_key, next_action: int) -> tuple:
+        """Override this method with the TD target of a non terminal step, given the key of the next state
+
+        Returns:
+            tuple: the target, and the factor to decay the traces by after the update
+        """
+        raise NotImplementedError
+
+    def learn_trajectory(self, states: list, actions: list, rewards: list, final_state, episode: int, keys: list = None):
+        self.n_policy_flips = 0
+        self.traces.clear()
+        touched_states = []
+        next_states = states[1:] + [final_state]
+        next_actions = actions[1:] + [None]
+        if keys is None:
+            keys = [self.state_key(state) for state in states] + [self.state_key(final_state)]
+        for state, key, action, reward, next_state, next_key, next_action in zip(states, keys, actions, rewards, next_states, keys[1:], next_actions):
+            self.visit_at(key)
+            self.td_update(state, key, action, reward, next_state, next_key, next_action)
+            touched_states.append(state)
+            touched_states.append(next_state)
+
+        self.end_episode(rewards, touched_states, episode)
+
+class SarsaLambdaAgent(TraceMixin, SarsaAgent):
+    """SARSA(lambda) agent. Unlike SarsaAgent, the TD target uses the action actually taken next, i.e. the update is on-policy.
+    See Sutton and Barto pg. 305 (2018) Reinforcement Learning for pseudocode
+    """
+    agent_name = "SarsaLambda"
+    plot_title = "SARSA(lambda)"
+
+    def __init__(self, n_actions: int, args: argparse.ArgumentParser, state_space: StateSpace = None):
+        """Default constructor
+        """
+        super().__init__(n_actions, args, state_space)
+        self.init_traces(args)
+
+    def get_td_target(self, reward: float, next_key, next_action: int) -> tuple:
+        return reward + self.gamma * self.q_rows[next_key][next_action], self.gamma * self.lam
+
+class QLambdaAgent(TraceMixin, QLearningAgent):
+    """Watkins's Q(lambda) agent. The traces are cut whenever an exploratory action is taken,
+    as the greedy target policy would not have taken it.
+    See Sutton and Barto pg. 312 (2018) Reinforcement Learning
+    """
+    agent_name = "QLambda"
+    plot_title = "Q(lambda)"
+
+    def __init__(self, n_actions: int, args: argparse.ArgumentParser, state_space: StateSpace = None):
+        """Default constructor
+        """
+        super().__init__(n_actions, args, state_space)
+        self.init_traces(args)
+
+    def get_td_target(self, reward: float, next_key, next_action: int) -> tuple:
+        next_q_value = self.q_rows[next_key]
+        max_q_value = next_q_value.max()
+        is_greedy = next_q_value[next_action] == max_q_value
+        return reward + self.gamma * max_q_value, self.gamma * self.lam if is_greedy else 0.0
@@ -0,0 +1,85 @@
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+class EligibilityTraces:
+    """Sparse eligibility traces over the state action pairs visited in the current episode.
+    The traces and the step sizes of the pairs are kept in preallocated numpy arrays, which grow geometrically when full,
+    so decaying the traces is a single vectorized operation over the visited pairs rather than a sweep of the whole q table.
+    """
+    def __init__(self, replacing: bool = True, capacity: int = 64):
+        """Constructor
+
+        Args:
+            replacing (bool): reset the trace of a visited pair to 1, instead of adding 1 to it (accumulating traces)
+            capacity (int): the initial number of pairs the traces can hold
+        """
+        self.replacing = replacing
+        self.capacity = capacity
+        self.slots = {} # the slot of each visited (state, action) pair
+        self.keys = [] # the visited (state, action) pairs, in the order of their slots
+        self.state_keys = [] # the q table key of the state of each pair, in the order of their slots
+        self.traces = np.zeros(capacity, dtype=np.float64)
+        self.alphas = np.zeros(capacity, dtype=np.float64) # the step size of each pair, as of its last visit
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def clear(self):
+        self.slots.clear()
+        self.keys.clear()
+        self.state_keys.clear()
+
+    def visit(self, state, action: int, alpha: float, state_key=None):
+        """Bump the trace of a state action pair
+
+        Args:
+            state (any): the state
+            action (int): the action taken in the state
+            alpha (float): the step size of the pair
+            state_key (any, optional): the q table key of the state, see AbstractAgent.state_key. Defaults to the state.
+        """
+        key = (state, action)
+        slot = self.slots.get(key)
+        if slot is None:
+            slot = len(self.keys)
+            if slot == self.capacity:
+                self.grow()
+            self.slots[key] = slot
+            self.keys.append(key)
+            self.state_keys.append(state if state_key is None else state_key)
+            self.traces[slot] = 0.0
+        self.traces[slot] = 1.0 if self.replacing else self.traces[slot] + 1.0
+        self.alphas[slot] = alpha
+
+    def decay(self, factor: float):
+        """Multiply every trace by a factor, i.e. gamma * lambda
+        """
+        self.traces[:len(self.keys)] *= factor
+
+    def steps(self) -> list:
+        """Get the visited pairs with the step of their update per unit of TD error, alpha times the trace
+
+        Returns:
+            list: (state, action, step) tuples
+        """
+        steps = (self.alphas[:len(self.keys)] * self.traces[:len(self.keys)]).tolist()
+        return [(state, action, step) for (state, action), step in zip(self.keys, steps)]
+
+    def keyed_steps(self) -> list:
+        """Get the visited pairs with the q table key of their state and their step, see steps
+
+        Returns:
+            list: (state, state key, action, step) tuples
+        """
+        steps = (self.alphas[:len(self.keys)] * self.traces[:len(self.keys)]).tolist()
+        return [(state, state_key, action, step) for (state, action), state_key, step in zip(self.keys, self.state_keys, steps)]
+
+    def grow(self):
+        """Double the capacity of the traces, keeping their contents
+        """
+        self.capacity *= 2
+        logger.debug(f"Growing eligibility traces to capacity [{self.capacity}].")
+        self.traces = np.concatenate([self.traces, np.zeros_like(self.traces)])
+        self.alphas = np.concatenate([self.alphas, np.zeros_like(self.alphas)])
@@ -23,17 +23,97 @@ def get_cmdl_args(args: list, description: str) -> argparse.ArgumentParser:
     add_tr.add_argument("--gamma", type=float, default=1.0, help="The discount coefficient")
     add_tr.add_argument("--policy", type=int, choices=[0], default=0, help="valid polices are: [0=epsilon greedy .. no others yet]")
     add_tr.add_argument("--eps_const", type=int, default=100, help="a constant for the epsilon exploration strategy")
+    add_tr.add_argument("--seed", type=int, default=None, help="seed for the game and the agent, for reproducible runs")
+    add_tr.add_argument("--fast_dealer", action="store_true", help="resolve the dealer's turn with one sample from a precomputed distribution of their final score")
+    add_tr.add_argument("--trace", action="store_true", help="record every step of the training games into a binary trace file in the session's data dir. Single process training only.")
+    add_tr.add_argument("--skip_metrics_csv", action="store_true", help="only keep the binary per episode metric files, without exporting the rewards to csv")
+    add_tr.add_argument("--checkpoint_every", type=int, default=0, help="checkpoint the session into its data dir every this many episodes. Set to 0 to disable. Single process training only.")
+    add_tr.add_argument("--resume", type=str, default=None, help="the data dir of a checkpointed session to resume training in. Pass the same arguments as the original session.")
+    add_tr.add_argument("--profile", action="store_true", help="time the phases of training (game steps, policy, updates, mse, saving) and write a report to the session's data dir")
+    add_tr.add_argument("--cprofile", action="store_true", help="also profile every function call of training with cProfile. Slows training down considerably.")
+    add_tr.add_argument("--tracemalloc", action="store_true", help="also trace the memory allocations of training with tracemalloc. Slows training down considerably.")
+    add_tr.add_argument("--n_actors", type=int, default=1, help="the number of actor processes playing episodes for the learner. Set to 1 to train in a single process.")
+    add_tr.add_argument("--actor_sync_every", type=int, default=100, help="send the actors the latest policy every this many learned episodes")
+    add_tr.add_argument("--actor_chunk_size", type=int, default=32, help="the number of episodes an actor sends the learner at once")
+    add_tr.add_argument("--q_backend", type=str, default="dict", choices=["dict", "dense"], help="storage for the q function and visit counters: [dict (tuple keyed dicts), dense (arrays over the game's state space)]")
     # add the agents for the trainer with their specific hyperparams
     tr_subparser = add_tr.add_subparsers(dest="agent", help="which agent to train with.")
 
     # monte carlo control
     add_monte = tr_subparser.add_parser("monte", help="use monte carlo control as the agent")
+    add_monte.add_argument("--visit_mode", type=str, default="every", choices=["every", "first"], help="update q on every visit of a state action pair in an episode, or only on the first visit")
 
     add_sarsa = tr_subparser.add_parser("sarsa", help="use sarsa as the agent")
     add_sarsa.add_argument("--opt_q_path", type=str, default="", help="pass a trained q value to compare performance to using MSE.")
+    add_sarsa.add_argument("--mse_every", type=int, default=1, help="evaluate the MSE every this many episodes")
+    add_sarsa.add_argument("--mse_sample_size", type=int, default=0, help="estimate the MSE from this many sampled states. Set to 0 to track the exact MSE.")
 
     add_qlearn = tr_subparser.add_parser("qlearn", help="use q_learning as the agent")
     add_qlearn.add_argument("--opt_q_path", type=str, default="", help="pass a trained q value to compare performance to using MSE.")
+    add_qlearn.add_argument("--mse_every", type=int, default=1, help="evaluate the MSE every this many episodes")
+    add_qlearn.add_argument("--mse_sample_size", type=int, default=0, help="estimate the MSE from this many sampled states. Set to 0 to track the exact MSE.")
+
+    # td(lambda) control with sparse eligibility traces
+    for agent_name, agent_help in [("sarsa_lambda", "use sarsa(lambda) as the agent"), ("q_lambda", "use watkins's q(lambda) as the agent")]:
+        add_lambda = tr_subparser.add_parser(agent_name, help=agent_help)
+        add_lambda.add_argument("--lam", type=float, default=0.9, help="the trace decay parameter lambda. Set to 0 for one step td updates.")
+        add_lambda.add_argument("--trace_type", type=str, default="replacing", choices=["replacing", "accumulating"], help="reset the trace of a revisited state action pair to 1, or add 1 to it")
+        add_lambda.add_argument("--opt_q_path", type=str, default="", help="pass a trained q value to compare performance to using MSE.")
+        add_lambda.add_argument("--mse_every", type=int, default=1, help="evaluate the MSE every this many episodes")
+        add_lambda.add_argument("--mse_sample_size", type=int, default=0, help="estimate the MSE from this many sampled states. Set to 0 to track the exact MSE.")
+
+    # linear function approximation
+    add_linear = tr_subparser.add_parser("linear", help="use sarsa(lambda) with a linear q function of coarse coded features as the agent. Single process training only.")
+    add_linear.add_argument("--alpha", type=float, default=0.01, help="the constant step size of the weight updates")
+    add_linear.add_argument("--lam", type=float, default=0.0, help="the trace decay parameter lambda. Set to 0 for one step td updates.")
+    add_linear.add_argument("--opt_q_path", type=str, default="", help="pass a trained q value to compare performance to using MSE.")
+    add_linear.add_argument("--mse_every", type=int, default=1, help="evaluate the MSE every this many episodes")
+
+    # dyna-q planning
+    add_dyna = tr_subparser.add_parser("dyna_q", help="use dyna-q as the agent: q learning with planning updates from a model of the observed transitions. Always uses a dense q table.")
+    add_dyna.add_argument("--n_planning", type=int, default=10, help="the number of planning updates after every real step. Set to 0 for plain q learning.")
+    add_dyna.add_argument("--model_capacity", type=int, default=100000, help="the number of most recent transitions the model keeps")
+    add_dyna.add_argument("--opt_q_path", type=str, default="", help="pass a trained q value to compare performance to using MSE.")
+    add_dyna.add_argument("--mse_every", type=int, default=1, help="evaluate the MSE every this many episodes")
+    add_dyna.add_argument("--mse_sample_size", type=int, default=0, help="estimate the MSE from this many sampled states. Set to 0 to track the exact MSE.")
+
+    # the exact solver arguments
+    add_solve = subparsers.add_parser("solve", help="run in solver mode, writing the exact q function of the game found by dynamic programming.")
+    add_solve.add_argument("--game_id", type=int, default=0, choices=[0], help="you can solve these games: [0=easy21, ... no others yet]")
+    add_solve.add_argument("--debug_mode", type=int, choices=[0,1], default=0, help="dictates the logging level. Set to 0 to include all debugging level msgs.")
+    add_solve.add_argument("--gamma", type=float, default=1.0, help="The discount coefficient")
+    add_solve.add_argument("--tol", type=float, default=1e-12, help="the convergence tolerance for value iteration")
+
+    # the evaluation arguments
+    add_eval = subparsers.add_parser("eval", help="run in evaluation mode, playing games with the greedy policy of a saved session and writing the results to the session dir.")
+    add_eval.add_argument("--session_dir", type=str, required=True, help="the data dir of the session to evaluate")
+    add_eval.add_argument("--game_id", type=int, default=0, choices=[0], help="you can evaluate these games: [0=easy21, ... no others yet]")
+    add_eval.add_argument("--debug_mode", type=int, choices=[0,1], default=0, help="dictates the logging level. Set to 0 to include all debugging level msgs.")
+    add_eval.add_argument("--n_games", type=int, default=1000000, help="the number of games to play")
+    add_eval.add_argument("--n_workers", type=int, default=1, help="the number of worker processes playing the games")
+    add_eval.add_argument("--batch_size", type=int, default=65536, help="the number of games a worker simulates together")
+    add_eval.add_argument("--seed", type=int, default=None, help="seed for the games, for reproducible evaluations")
+
+    # the policy server arguments
+    add_serve = subparsers.add_parser("serve", help="run in serving mode, answering greedy action queries for the policy of a saved session over a local socket.")
+    add_serve.add_argument("--session_dir", type=str, required=True, help="the data dir of the session to serve")
+    add_serve.add_argument("--game_id", type=int, default=0, choices=[0], help="you can serve these games: [0=easy21, ... no others yet]")
+    add_serve.add_argument("--debug_mode", type=int, choices=[0,1], default=0, help="dictates the logging level. Set to 0 to include all debugging level msgs.")
+    add_serve.add_argument("--host", type=str, default="127.0.0.1", help="the host to listen on")
+    add_serve.add_argument("--port", type=int, default=8021, help="the port to listen on")
+    add_serve.add_argument("--max_batch", type=int, default=1024, help="the maximum number of states looked up together")
+    add_serve.add_argument("--max_delay_ms", type=float, default=0.5, help="the maximum time a query waits for others to be batched with, in milliseconds")
+
+    # the sweep arguments
+    add_sweep = subparsers.add_parser("sweep", help="run in sweep mode, training every config of a grid or random search spec across worker processes.")
+    add_sweep.add_argument("--spec", type=str, required=True, help="the json spec of the sweep, see casino.workers.sweep.load_spec")
+    add_sweep.add_argument("--n_workers", type=int, default=1, help="the number of worker processes training configs")
+    add_sweep.add_argument("--debug_mode", type=int, choices=[0,1], default=0, help="dictates the logging level. Set to 0 to include all debugging level msgs.")
+
+    # the artifact converter arguments
+    add_convert = subparsers.add_parser("convert", help="run in converter mode, writing the .npy q function and policy arrays for sessions saved only as json.")
+    add_convert.add_argument("--session_dirs", type=str, nargs="*", default=None, help="the session dirs to convert. Defaults to every session in the data dir without arrays.")
+    add_convert.add_argument("--debug_mode", type=int, choices=[0,1], default=0, help="dictates the logging level. Set to 0 to include all debugging level msgs.")
     args = parser.parse_args(args)
 
     return args
\ No newline at end of file
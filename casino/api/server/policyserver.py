@@ -0,0 +1,209 @@
+from casino.agents import greedy
+from casino.environments.easy21.easy21 import Easy21
+from casino.environments.env import Games
+from casino.environments.statespace import StateSpace
+
+import asyncio
+import contextlib
+import json
+import logging
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class ServerStoppedError(Exception):
+    """Raised into the queries that were still waiting when the policy server stopped
+    """
+
+class PolicyServer:
+    """Serves the greedy actions of a policy over a local socket, speaking newline delimited json.
+
+    Requests and their responses, matched by the optional request id:
+        {"id": 1, "state": [3, 14]}                -> {"id": 1, "action": 0}
+        {"id": 2, "states": [[3, 14], [10, 20]]}   -> {"id": 2, "actions": [0, 1]}
+        {"id": 3, "cmd": "stats"}                  -> {"id": 3, "stats": {...}}
+        invalid requests                           -> {"id": ..., "error": "..."}
+
+    Each connection may send requests without waiting for the responses. Queries arriving together, from any connection,
+    are answered in micro batches with a single lookup into the policy array.
+    """
+    def __init__(self, policy: np.ndarray, state_space: StateSpace, max_batch: int = 1024, max_delay: float = 0.0005, n_latencies: int = 65536):
+        """Constructor
+
+        Args:
+            policy (np.ndarray): the action of every state of the state space
+            state_space (StateSpace): the state space of the game
+            max_batch (int): the maximum number of states looked up in one batch
+            max_delay (float): the maximum number of seconds a query waits for others to batch with
+            n_latencies (int): the number of most recent request latencies kept for the latency percentiles
+        """
+        self.policy = policy
+        self.state_space = state_space
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.latencies = np.zeros(n_latencies)
+        self.n_requests = 0
+        self.n_batches = 0
+        self.n_batched_queries = 0
+        self.server = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0):
+        """Start serving
+
+        Args:
+            host (str): the host to listen on
+            port (int): the port to listen on. Set to 0 to pick a free port, see port.
+        """
+        self.queue = asyncio.Queue()
+        self.batcher = asyncio.create_task(self.run_batcher())
+        self.server = await asyncio.start_server(self.handle_client, host, port)
+        logger.info(f"Serving the policy @ {host}:{self.port}")
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        """Stop serving. The queries still waiting for a batch are failed rather than left pending.
+        """
+        self.server.close()
+        self.batcher.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self.batcher
+        while not self.queue.empty():
+            _, future = self.queue.get_nowait()
+            self.fail_query(future)
+        logger.info(f"Stopped serving. Stats: {self.get_stats()}")
+        await self.server.wait_closed()
+
+    def fail_query(self, future: asyncio.Future):
+        if not future.done():
+            future.set_exception(ServerStoppedError("The policy server stopped before answering the query!"))
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        tasks = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.create_task(self.respond(line, writer, time.perf_counter()))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks)
+        except ConnectionError:
+            logger.debug("Client disconnected.")
+        finally:
+            writer.close()
+
+    async def respond(self, line: bytes, writer: asyncio.StreamWriter, start: float):
+        response = await self.handle_request(line)
+        writer.write((json.dumps(response) + "\n").encode())
+        self.latencies[self.n_requests % len(self.latencies)] = time.perf_counter() - start
+        self.n_requests += 1
+        await writer.drain()
+
+    async def handle_request(self, line: bytes) -> dict:
+        request_id = None
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            if request.get("cmd") == "stats":
+                return {"id": request_id, "stats": self.get_stats()}
+            if "state" in request:
+                actions = await self.query(np.array(request["state"], dtype=np.int64).reshape(1, len(self.state_space.lows)))
+                return {"id": request_id, "action": int(actions[0])}
+            if "states" in request:
+                actions = await self.query(np.array(request["states"], dtype=np.int64).reshape(-1, len(self.state_space.lows)))
+                return {"id": request_id, "actions": actions.tolist()}
+            return {"id": request_id, "error": "Expecting one of the keys [state, states, cmd]!"}
+        except (ValueError, TypeError, AttributeError) as e:
+            return {"id": request_id, "error": f"Invalid request: {e}"}
+        except KeyError as e:
+            return {"id": request_id, "error": str(e.args[0])}
+        except ServerStoppedError as e:
+            return {"id": request_id, "error": str(e)}
+
+    async def query(self, states: np.ndarray) -> np.ndarray:
+        """Get the actions of states, batched with the other queries waiting
+
+        Args:
+            states (np.ndarray): (n, d) array of states
+
+        Raises:
+            KeyError: raised if any state is not part of the state space
+
+        Returns:
+            np.ndarray: the (n,) actions
+        """
+        idx = self.state_space.indices(states)
+        future = asyncio.get_running_loop().create_future()
+        self.queue.put_nowait((idx, future))
+        return await future
+
+    async def run_batcher(self):
+        """Answer the queries in batches: wait for a query, gather the queries arriving within max_delay up to max_batch states,
+        and look their actions up together
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            n_states = len(batch[0][0])
+            deadline = loop.time() + self.max_delay
+            try:
+                while n_states < self.max_batch:
+                    if self.queue.empty():
+                        await asyncio.sleep(max(0.0, deadline - loop.time())) # let the other queries arrive
+                        if self.queue.empty():
+                            break
+                    item = self.queue.get_nowait()
+                    batch.append(item)
+                    n_states += len(item[0])
+            except asyncio.CancelledError:
+                for _, future in batch:
+                    self.fail_query(future)
+                raise
+
+            actions = self.policy[np.concatenate([idx for idx, _ in batch])]
+            offsets = np.cumsum([len(idx) for idx, _ in batch])[:-1]
+            for (_, future), batch_actions in zip(batch, np.split(actions, offsets)):
+                if not future.done():
+                    future.set_result(batch_actions)
+            self.n_batches += 1
+            self.n_batched_queries += len(batch)
+
+    def get_stats(self) -> dict:
+        """Get the number of requests, the mean number of queries per batch and the latency percentiles of the recent requests, in microseconds
+        """
+        latencies = 1e6 * self.latencies[:min(self.n_requests, len(self.latencies))]
+        stats = {"n_requests": self.n_requests, "n_batches": self.n_batches,
+                 "mean_batch_size": self.n_batched_queries / self.n_batches if self.n_batches > 0 else 0.0}
+        if len(latencies) > 0:
+            p50, p90, p99 = np.percentile(latencies, [50, 90, 99])
+            stats["latency_us"] = {"p50": p50, "p90": p90, "p99": p99, "max": latencies.max()}
+        return stats
+
+def load_policy_server(session_dir: str, game_id: int = 0, max_batch: int = 1024, max_delay: float = 0.0005) -> PolicyServer:
+    """Load the greedy policy of a saved session into a policy server
+
+    Args:
+        session_dir (str): the data dir of the session
+        game_id (int): the id of the game the session was trained on
+        max_batch (int): see PolicyServer
+        max_delay (float): see PolicyServer
+    """
+    if Games(game_id) != Games.EASY21:
+        raise NotImplementedError(f"Game id [{game_id}] has not been implemented!")
+    state_space = Easy21().get_state_space()
+    return PolicyServer(greedy.load_greedy_policy(session_dir, state_space), state_space, max_batch, max_delay)
+
+async def serve(server: PolicyServer, host: str, port: int):
+    """Serve until cancelled, i.e. by a keyboard interrupt
+    """
+    await server.start(host, port)
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.stop()
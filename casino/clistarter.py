@@ -42,9 +42,36 @@ def run(base_dir, args: argparse.ArgumentParser, session_start: str):
         game = GamePlayer(base_dir, session_start, args)
         game.setup()
         game.play()
+    if args.mode == "solve":
+        from casino.solvers import easy21dp # the modules of the other modes are imported lazily, for a fast startup
+        output_dir = os.path.join(base_dir, varia.DATA_DIR, session_start)
+        easy21dp.solve_to_disk(output_dir, args.gamma, args.tol)
+        logger.info(f"Saved the exact q function to {output_dir}")
+    if args.mode == "sweep":
+        from casino.workers import sweep
+        sweep.run_sweep(base_dir, args.spec, args.n_workers)
+    if args.mode == "serve":
+        import asyncio
+        from casino.api.server import policyserver
+        server = policyserver.load_policy_server(args.session_dir, args.game_id, args.max_batch, args.max_delay_ms / 1000)
+        try:
+            asyncio.run(policyserver.serve(server, args.host, args.port))
+        except KeyboardInterrupt:
+            logger.info("Server interrupted.")
+    if args.mode == "convert":
+        from casino.io import qarray
+        session_dirs = args.session_dirs
+        if session_dirs is None:
+            data_dir = os.path.join(base_dir, varia.DATA_DIR)
+            session_dirs = [os.path.join(data_dir, name) for name in sorted(os.listdir(data_dir))]
+            session_dirs = [session_dir for session_dir in session_dirs 
+                            if os.path.exists(os.path.join(session_dir, varia.Q_FNAME)) and not qarray.has_q_arrays(session_dir)]
+        for session_dir in session_dirs:
+            qarray.convert_session(session_dir)
+        logger.info(f"Converted [{len(session_dirs)}] sessions.")
     if args.mode == "eval":
         game = GamePlayer(base_dir, session_start, args)
-        game.evaluate()
+        game.evaluate(args.session_dir)
 
 if __name__=="__main__":
     logger.info("Launching CLI!")
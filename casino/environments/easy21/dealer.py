@@ -0,0 +1,92 @@
+import hashlib
+import logging
+import os
+import numpy as np
+
+from casino.environments.easy21.veceasy21 import DEALER_STICK_SCORE, MIN_SCORE, MAX_SCORE
+from casino.models.cards.infinitedeck import InfiniteDeck
+
+"""Module file for the distribution of the dealer's play in Easy21.
+The dealer's final score only depends on their first card, so it can be precomputed once
+and sampled in a single draw instead of playing the dealer card by card.
+"""
+logger = logging.getLogger(__name__)
+
+BUST = MAX_SCORE + 1 # index of the bust outcome in the dealer outcome distribution
+
+def get_card_scores(deck: InfiniteDeck) -> tuple:
+    """Get the distribution of the score of a card drawn from the deck
+
+    Args:
+        deck (InfiniteDeck): the deck
+
+    Returns:
+        tuple: the card scores (+ if black, - if red) and their probabilities
+    """
+    numbers, number_probs, red_prob = deck.get_card_distribution()
+    scores = np.concatenate([numbers, -numbers])
+    probs = np.concatenate([number_probs * (1 - red_prob), number_probs * red_prob])
+    return scores, probs
+
+def get_dealer_outcomes(deck: InfiniteDeck) -> np.ndarray:
+    """Compute the distribution of the dealer's final score from every starting score.
+    The dealer hits until their score is >= 17 or they bust, which forms an absorbing markov chain
+    over the scores 1 to 16 that is solved exactly.
+
+    Args:
+        deck (InfiniteDeck): the deck the dealer draws from
+
+    Returns:
+        np.ndarray: (MAX_SCORE+1, MAX_SCORE+2) array where row s holds the probability of each final score,
+            with the last column (BUST) holding the probability of going bust
+    """
+    scores, probs = get_card_scores(deck)
+    n_outcomes = MAX_SCORE + 2
+    # transition matrix between all scores, with the bust outcome absorbing every score outside of [1, 21]
+    transitions = np.zeros((n_outcomes, n_outcomes))
+    for score in range(MIN_SCORE, DEALER_STICK_SCORE):
+        next_scores = score + scores
+        next_scores = np.where((next_scores < MIN_SCORE) | (next_scores > MAX_SCORE), BUST, next_scores)
+        np.add.at(transitions[score], next_scores, probs)
+
+    playing = np.arange(MIN_SCORE, DEALER_STICK_SCORE)
+    final = np.concatenate([np.arange(DEALER_STICK_SCORE, MAX_SCORE + 1), [BUST]])
+    absorbing = np.linalg.solve(np.eye(len(playing)) - transitions[np.ix_(playing, playing)],
+                                transitions[np.ix_(playing, final)])
+
+    outcomes = np.zeros((MAX_SCORE + 1, n_outcomes))
+    outcomes[np.ix_(playing, final)] = absorbing
+    outcomes[final[:-1], final[:-1]] = 1
+    return outcomes
+
+_dealer_outcomes = {} # per process cache of the dealer outcomes, keyed by card distribution
+
+def load_dealer_outcomes(deck: InfiniteDeck, cache_dir: str = None) -> np.ndarray:
+    """Get the dealer outcome distribution for a deck, computing it at most once per process.
+    When a cache directory is given the distribution is also stored on disk and read back by later processes.
+
+    Args:
+        deck (InfiniteDeck): the deck the dealer draws from
+        cache_dir (str, optional): the directory for the on disk cache
+
+    Returns:
+        np.ndarray: the dealer outcomes, see get_dealer_outcomes
+    """
+    numbers, number_probs, red_prob = deck.get_card_distribution()
+    key = hashlib.sha1(np.concatenate([numbers, number_probs, [red_prob]]).astype(np.float64).tobytes()).hexdigest()[:16]
+    if key in _dealer_outcomes:
+        return _dealer_outcomes[key]
+
+    fpath = None if cache_dir is None else os.path.join(cache_dir, f"dealer_outcomes_{key}.npy")
+    if fpath is not None and os.path.exists(fpath):
+        logger.info(f"Reading dealer outcomes from cache @ {fpath}")
+        outcomes = np.load(fpath)
+    else:
+        outcomes = get_dealer_outcomes(deck)
+        if fpath is not None:
+            if not os.path.exists(cache_dir):
+                os.makedirs(cache_dir)
+            np.save(fpath, outcomes)
+            logger.info(f"Saved dealer outcomes to cache @ {fpath}")
+    _dealer_outcomes[key] = outcomes
+    return outcomes
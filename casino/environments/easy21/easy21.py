@@ -1,15 +1,19 @@
 from casino.environments.env import Env
+from casino.environments.statespace import StateSpace
 from casino.environments.easy21.player import Player, Action
+from casino.environments.easy21.dealer import BUST, load_dealer_outcomes
 
 from casino.models.cards.card import Card
 from casino.models.cards.color import Color
 from casino.models.cards.infinitedeck import InfiniteDeck
+from casino.io.trace import TraceRecorder
 
 
 from enum import Enum
 from typing import List
 
 import logging
+import numpy as np
 
 from casino.environments.easy21.player import Player
 
@@ -18,17 +22,45 @@ logger = logging.getLogger(__name__)
 class Easy21(Env):
     """Environment class for Easy21.
     """
-    def __init__(self):
+    def __init__(self, fast_dealer: bool = False, cache_dir: str = None, seed: int = None):
         """Initializes the game, with a black card sampled from the deck for both the player and dealer
+
+        Args:
+            fast_dealer (bool): resolve the dealer's turn with a single sample from the precomputed
+                distribution of their final score, instead of drawing their cards one by one
+            cache_dir (str, optional): directory to cache the dealer's final score distribution in
+            seed (int, optional): the seed for the deck, which is reused across games
         """
         super().__init__("Easy21", 2)
         logger.info("Initializing Easy21!")
         self.player = Player("player")
         self.dealer = Player("dealer")
+        self.deck = InfiniteDeck(1, 10, 0.33, seed)
+        self.trace = None # optional TraceRecorder for the steps of the games
+        self.episode = -1
+        self.fast_dealer = fast_dealer
+        if fast_dealer:
+            outcomes = load_dealer_outcomes(self.deck, cache_dir)
+            self.dealer_outcome_cdf = np.cumsum(outcomes, axis=1)
+
+    def set_trace(self, trace: TraceRecorder):
+        """Record every step of the following games into a trace
+
+        Args:
+            trace (TraceRecorder): the trace recorder, or None to stop recording
+        """
+        self.trace = trace
+
+    def get_checkpoint_state(self) -> dict:
+        return {"deck": self.deck, "episode": self.episode}
+
+    def set_checkpoint_state(self, state: dict):
+        self.deck = state["deck"]
+        self.episode = state["episode"]
 
     def reset(self) -> list:
         logger.debug("Resetting game environment!")
-        self.deck = InfiniteDeck(1, 10, 0.33)
+        self.episode += 1
         self.player.reset(self.deck.draw(Color.BLACK))
         self.dealer.reset(self.deck.draw(Color.BLACK))
         self.turn_count = 0
@@ -45,20 +77,30 @@ class Easy21(Env):
         Returns:
             tuple: the state, reward, terminal observation
         """
+        if self.trace is not None:
+            prev_state = self.get_state()
+        self.turn_count += 1
         action = Action(action)
         if action == Action.HIT:
             self.player.hit(self.deck.draw())
 
         elif action == Action.STICK:
             self.player.stick()
-            self.play_dealer() # dealer begins
+            if self.fast_dealer:
+                self.play_dealer_fast()
+            else:
+                self.play_dealer() # dealer begins
         else:
             logger.error("Invalid action passed!")
 
         self.check_for_winner()
-        logger.debug(f"Scores: {self.player.name} = {self.player.score} | {self.dealer.name} = {self.dealer.score} ")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Scores: {self.player.name} = {self.player.score} | {self.dealer.name} = {self.dealer.score} ")
         reward = self.get_reward()
-        logger.debug(f"-------------------------------------------------------------------------")
+        logger.debug("-------------------------------------------------------------------------")
+        if self.trace is not None:
+            card = self.player.score - self.player.last_score if action == Action.HIT else 0
+            self.trace.record(self.episode, self.turn_count, prev_state, action.value, card, reward)
         return self.get_state(), reward, self.isterminal() 
 
     def play_dealer(self) -> None:
@@ -72,6 +114,18 @@ class Easy21(Env):
         if self.dealer.score >= 17 and not self.dealer.isbust():
             self.dealer.stick()
     
+    def play_dealer_fast(self) -> None:
+        """Runs the dealer for the game by sampling their final score from the precomputed distribution for their current score.
+           Statistically equivalent to play_dealer.
+        """
+        cdf = self.dealer_outcome_cdf[self.dealer.score]
+        final_score = min(int(np.searchsorted(cdf, self.deck.rng.random(), side="right")), BUST)
+        self.dealer.score = final_score
+        self.dealer.turn_count += 1
+        self.dealer.last_action = Action.HIT
+        if not self.dealer.isbust():
+            self.dealer.stick()
+
     def check_for_winner(self):
         """Selects a winner for the game
         """
@@ -85,15 +139,15 @@ class Easy21(Env):
             return 
 
         if self.player.last_action == Action.STICK and self.dealer.last_action == Action.STICK:
-            msg = f"Player has %s score than dealer!"
+            msg = "Player has %s score than dealer!"
             if self.player.score < self.dealer.score:
-                logger.debug(msg % ("lower"))
+                logger.debug(msg, "lower")
                 self.dealer.winner = True
             elif self.player.score > self.dealer.score:
-                logger.debug(msg % ("higher"))
+                logger.debug(msg, "higher")
                 self.player.winner = True
             elif self.player.score == self.dealer.score:
-                logger.debug(f"A draw has occured!")
+                logger.debug("A draw has occured!")
             self.terminal = True
 
     def get_reward(self):
@@ -117,9 +171,20 @@ class Easy21(Env):
         """
         if self.isterminal():
             return 0,0
-        return self.dealer.cards[0].number, self.player.score
+        return self.dealer.first_card.number, self.player.score
 
     def isterminal(self) -> bool:
         return self.terminal
 
+    def get_state_space(self) -> StateSpace:
+        """The state space for easy21: the dealers first card (1-10) and the players score (1-21),
+           along with the null state (0, 0) of a terminated game.
+        """
+        return StateSpace((1, 1), (10, 21), extra_states=[(0, 0)])
+
+    def get_feature_intervals(self) -> list:
+        """Overlapping intervals of the dealers first card and of the players score, 3 x 6 state features in all
+        """
+        return [[(1, 4), (4, 7), (7, 10)], [(1, 6), (4, 9), (7, 12), (10, 15), (13, 18), (16, 21)]]
+
         
@@ -14,8 +14,10 @@ class Player:
     def reset(self, card: Card):
         """Reset with a black card, and a score
         """
-        logger.debug(f"Resetting Player '{self.name}' with card {card}!")
-        self.cards = [card]
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Resetting Player '{self.name}' with card {card}!")
+        self.first_card = card # cards are interned, so the hand is kept as its first card and a count
+        self.n_cards = 1
         self.score = card.number
         self.last_score = 0
         self.last_action = Action.NONE
@@ -29,18 +31,20 @@ class Player:
             card (Card): the card to add
         """
         self.turn_count += 1
-        self.cards.append(card)
+        self.n_cards += 1
         self.last_score = self.score
         self.score += self.get_card_score(card)
         self.last_action = Action.HIT
 
-        logger.debug(f"Turn [{self.turn_count}]: {self.name} hits! Card drawn: {card}!\tScore {self.last_score}=>{self.score}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Turn [{self.turn_count}]: {self.name} hits! Card drawn: {card}!\tScore {self.last_score}=>{self.score}")
     
     def stick(self) -> None:
         """Stay with current hand, and update the last action of the player.
         """
         self.turn_count += 1
-        logger.debug(f"Player {self.name} has chosen to stick with score {self.score}!")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Player {self.name} has chosen to stick with score {self.score}!")
         self.last_action = Action.STICK
     
     def get_card_score(self, card: Card) -> int:
@@ -52,10 +56,7 @@ class Player:
         Returns:
             int: the score of the card (+ if black, - if negative)
         """
-        if card.color == Color.RED:
-            return -card.number
-        else:
-            return card.number
+        return card.score
     
     def isbust(self, print_out=False) -> bool:
         """Get whether the player has bust. Rules for easy21 define bust as having scores < 1 or > 21.
@@ -64,7 +65,7 @@ class Player:
             bool: true if the player has gone bust
         """
         if self.score < 1 or self.score > 21:
-            if print_out:
+            if print_out and logger.isEnabledFor(logging.DEBUG):
                 logger.debug(f"Player {self.name} has gone bust with score {self.score}!")
             return True
         else:
@@ -0,0 +1,137 @@
+from casino.environments.env import Env
+from casino.environments.easy21.player import Action
+
+from casino.models.cards.color import Color
+from casino.models.cards.infinitedeck import InfiniteDeck
+
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+DEALER_STICK_SCORE = 17
+MIN_SCORE = 1
+MAX_SCORE = 21
+
+class VecEasy21(Env):
+    """Batched environment class for Easy21.
+    Holds n_games independent games as numpy arrays and advances all of them with a single call.
+    The rules are the same as those of Easy21.step, Easy21.play_dealer and Easy21.check_for_winner.
+    """
+    def __init__(self, n_games: int, seed: int = None):
+        """Constructor
+
+        Args:
+            n_games (int): the number of games (lanes) simulated together
+            seed (int, optional): the seed for the deck
+        """
+        super().__init__("Easy21", 2)
+        logger.info(f"Initializing VecEasy21 with [{n_games}] games!")
+        self.n_games = n_games
+        self.deck = InfiniteDeck(1, 10, 0.33, seed)
+        self.dealer_card = np.zeros(n_games, dtype=np.int64) # the dealers first card, shown to the player
+        self.player_sum = np.zeros(n_games, dtype=np.int64)
+        self.terminal = np.zeros(n_games, dtype=bool)
+        self.rewards = np.zeros(n_games, dtype=np.int64)
+
+    def reset(self) -> np.ndarray:
+        return self.reset_batch()
+
+    def step(self, action) -> tuple:
+        return self.step_batch(action)
+
+    def reset_batch(self, mask: np.ndarray = None) -> np.ndarray:
+        """Reset the games, dealing a black card to both the player and the dealer.
+
+        Args:
+            mask (np.ndarray, optional): boolean mask of the games to reset. Resets all games when None.
+
+        Returns:
+            np.ndarray: the (n_games, 2) array of states
+        """
+        if mask is None:
+            mask = np.ones(self.n_games, dtype=bool)
+        n_reset = np.count_nonzero(mask)
+        if n_reset > 0:
+            player_cards, _ = self.deck.draw_batch(n_reset, Color.BLACK)
+            dealer_cards, _ = self.deck.draw_batch(n_reset, Color.BLACK)
+            self.player_sum[mask] = player_cards
+            self.dealer_card[mask] = dealer_cards
+            self.terminal[mask] = False
+            self.rewards[mask] = 0
+        return self.get_states()
+
+    def step_batch(self, actions, auto_reset: bool = True) -> tuple:
+        """Advance every game a 'step' or turn
+
+        Args:
+            actions (np.ndarray): the action to take in each game. See Action enum.
+            auto_reset (bool): reset the games that finished on this step, so that get_states()
+                returns the start states of their next games. Games already terminal are left untouched otherwise.
+
+        Returns:
+            tuple: the states, rewards, terminal observations. The state of a finished game is the null state (0, 0).
+        """
+        actions = np.broadcast_to(np.asarray(actions), (self.n_games,))
+        active = ~self.terminal
+        hit = active & (actions == Action.HIT.value)
+        stick = active & (actions == Action.STICK.value)
+        if not np.all(hit | stick | ~active):
+            raise ValueError(f"Invalid actions passed! Expecting one of {[Action.STICK.value, Action.HIT.value]}.")
+
+        self.rewards[:] = 0
+        n_hit = np.count_nonzero(hit)
+        if n_hit > 0:
+            self.player_sum[hit] += self.draw_scores(n_hit)
+            player_bust = hit & self.isbust(self.player_sum)
+            self.rewards[player_bust] = -1
+            self.terminal[player_bust] = True
+
+        if np.any(stick):
+            dealer_sum = self.play_dealer(self.dealer_card[stick])
+            player_sum = self.player_sum[stick]
+            self.rewards[stick] = np.where(self.isbust(dealer_sum), 1, np.sign(player_sum - dealer_sum))
+            self.terminal[stick] = True
+
+        states = self.get_states()
+        rewards = self.rewards.copy()
+        terminals = self.terminal.copy()
+        if auto_reset:
+            self.reset_batch(terminals)
+        return states, rewards, terminals
+
+    def play_dealer(self, dealer_sum: np.ndarray) -> np.ndarray:
+        """Runs the dealer for a batch of games, drawing cards until each dealer sticks at a score of >=17 or busts.
+
+        Args:
+            dealer_sum (np.ndarray): the starting scores of the dealers
+
+        Returns:
+            np.ndarray: the final scores of the dealers
+        """
+        dealer_sum = dealer_sum.copy()
+        playing = (dealer_sum < DEALER_STICK_SCORE) & ~self.isbust(dealer_sum)
+        while np.any(playing):
+            dealer_sum[playing] += self.draw_scores(np.count_nonzero(playing))
+            playing &= (dealer_sum < DEALER_STICK_SCORE) & ~self.isbust(dealer_sum)
+        return dealer_sum
+
+    def draw_scores(self, n_cards: int) -> np.ndarray:
+        """Draw cards from the deck and return their scores (+ if black, - if red)
+        """
+        numbers, colors = self.deck.draw_batch(n_cards)
+        return np.where(colors == Color.RED.value, -numbers, numbers)
+
+    def isbust(self, scores: np.ndarray) -> np.ndarray:
+        return (scores < MIN_SCORE) | (scores > MAX_SCORE)
+
+    def get_states(self) -> np.ndarray:
+        """Get the states for every game, as an (n_games, 2) array of the dealers first card and the players score.
+           The null state (0, 0) is returned for games that are terminal.
+        """
+        states = np.stack([self.dealer_card, self.player_sum], axis=1)
+        states[self.terminal] = 0
+        return states
+
+    def isterminal(self) -> np.ndarray:
+        return self.terminal.copy()
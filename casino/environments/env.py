@@ -40,6 +40,30 @@ class Env(ABC):
             bool: whether the environment is in a terminal state or not
         """
 
+    def get_state_space(self):
+        """Override this method to declare the bounded state space of the environment, if it has one
+        Returns:
+            StateSpace: the state space, or None if the environment does not declare one
+        """
+        return None
+
+    def get_feature_intervals(self):
+        """Override this method to declare overlapping intervals of each component of the state, for coarse coding its features
+        Returns:
+            list: for each component of the state, a list of (low, high) intervals, or None if the environment does not declare them
+        """
+        return None
+
+    def get_checkpoint_state(self) -> dict:
+        """Override this method to return the picklable state needed to resume the environment between episodes, i.e. its random number generators
+        """
+        return {}
+
+    def set_checkpoint_state(self, state: dict):
+        """Override this method to restore the state returned by get_checkpoint_state
+        """
+        pass
+
 class Result(Enum):
     """The result for a game
     """
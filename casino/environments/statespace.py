@@ -0,0 +1,74 @@
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+class StateSpace:
+    """A bounded, discrete state space where every state is a tuple of non negative integers.
+    Each state is mapped to an integer index, so that tables over the states can be stored in contiguous arrays.
+    """
+    def __init__(self, lows: tuple, highs: tuple, extra_states: list = ()):
+        """Constructor
+
+        Args:
+            lows (tuple): the lowest value (inclusive) for each component of the state
+            highs (tuple): the highest value (inclusive) for each component of the state
+            extra_states (list, optional): states outside of the bounds that belong to the space (i.e. a terminal state)
+        """
+        self.lows = tuple(lows)
+        self.highs = tuple(highs)
+        grid = np.stack(np.meshgrid(*[np.arange(low, high + 1) for low, high in zip(self.lows, self.highs)], indexing="ij"), axis=-1)
+        self.states = [tuple(state) for state in grid.reshape(-1, len(self.lows)).tolist()]
+        self.states.extend(tuple(state) for state in extra_states)
+        self.index_of = {state: idx for idx, state in enumerate(self.states)}
+
+        # dense lookup over the bounding box of all the states, for indexing batches of states
+        self.lookup = np.full(tuple(np.max(self.states, axis=0) + 1), -1, dtype=np.int64)
+        self.lookup[tuple(np.array(self.states).T)] = np.arange(len(self.states))
+
+    def __len__(self) -> int:
+        return len(self.states)
+
+    def __contains__(self, state) -> bool:
+        return state in self.index_of
+
+    def index(self, state: tuple) -> int:
+        """Get the index of a state
+
+        Args:
+            state (tuple): the state
+
+        Raises:
+            KeyError: raised if the state is not part of the space
+
+        Returns:
+            int: the index of the state
+        """
+        try:
+            return self.index_of[state]
+        except KeyError:
+            raise KeyError(f"State {state} is outside of the state space!")
+
+    def indices(self, states: np.ndarray) -> np.ndarray:
+        """Get the indices of a batch of states
+
+        Args:
+            states (np.ndarray): (n, d) array of states
+
+        Raises:
+            KeyError: raised if any state is not part of the space
+
+        Returns:
+            np.ndarray: the (n,) array of indices
+        """
+        states = np.asarray(states)
+        in_bounds = np.all((states >= 0) & (states < self.lookup.shape), axis=1)
+        if not np.all(in_bounds):
+            raise KeyError(f"States {states[~in_bounds].tolist()} are outside of the state space!")
+        idx = self.lookup[tuple(states.T)]
+        if np.any(idx < 0):
+            raise KeyError(f"States {states[idx < 0].tolist()} are outside of the state space!")
+        return idx
+
+    def state(self, idx: int) -> tuple:
+        return self.states[idx]
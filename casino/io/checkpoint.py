@@ -0,0 +1,76 @@
+import logging
+import os
+import pickle
+
+from casino.util.env import varia
+
+logger = logging.getLogger(__name__)
+
+class Checkpointer:
+    """Periodically checkpoints a training session into its data dir, and resumes from it.
+    The agent and game states are pickled to a single file which is replaced atomically, so a crash mid write keeps the previous checkpoint.
+    The agent's metrics are already streamed to disk by their MetricSinks, so only their lengths at the time of the checkpoint
+    are stored in the pickle. Anything appended after the last checkpoint is dropped on resume.
+    """
+    def __init__(self, session_dir: str, every: int = 0):
+        """Constructor
+
+        Args:
+            session_dir (str): the data dir of the session
+            every (int): checkpoint every this many episodes. Set to 0 to never checkpoint.
+        """
+        self.session_dir = session_dir
+        self.every = every
+        self.path = os.path.join(session_dir, varia.CHECKPOINT_FNAME)
+        self.metric_offsets = {}
+
+    def is_due(self, episode: int) -> bool:
+        return self.every > 0 and (episode + 1) % self.every == 0
+
+    def save(self, n_episodes: int, agent, env):
+        """Checkpoint the session
+
+        Args:
+            n_episodes (int): the number of episodes completed, i.e. the episode to resume from
+            agent (AbstractAgent): the agent
+            env (Env): the game environment
+        """
+        for name in agent.metric_names:
+            sink = getattr(agent, name)
+            sink.flush()
+            self.metric_offsets[name] = len(sink)
+
+        checkpoint = {
+            "n_episodes": n_episodes,
+            "agent": agent.get_checkpoint_state(),
+            "env": env.get_checkpoint_state(),
+            "metric_offsets": dict(self.metric_offsets),
+        }
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(checkpoint, f, protocol=pickle.HIGHEST_PROTOCOL)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        logger.debug(f"Saved checkpoint at episode [{n_episodes}] @ path {self.path}.")
+
+    def load(self, agent, env) -> int:
+        """Restore the session from the last checkpoint
+
+        Args:
+            agent (AbstractAgent): the agent, constructed with the same arguments as the checkpointed one, streaming its metrics to the session dir
+            env (Env): the game environment
+
+        Returns:
+            int: the number of episodes completed, i.e. the episode to resume from
+        """
+        with open(self.path, "rb") as f:
+            checkpoint = pickle.load(f)
+        agent.set_checkpoint_state(checkpoint["agent"])
+        env.set_checkpoint_state(checkpoint["env"])
+
+        self.metric_offsets = checkpoint["metric_offsets"]
+        for name in agent.metric_names:
+            getattr(agent, name).truncate(self.metric_offsets.get(name, 0))
+        logger.info(f"Resuming from the checkpoint at episode [{checkpoint['n_episodes']}] @ path {self.path}.")
+        return checkpoint["n_episodes"]
@@ -1,5 +1,4 @@
 import json
-import pandas as pd
 import numpy as np
 import logging
 
@@ -29,7 +28,7 @@ def read_json(path: str):
     Returns:
         bool: true if the save was a success
     """
-    with open(path, 'w') as f:
+    with open(path, 'r') as f:
         data = json.load(f)
     logger.info(f"Read json file @ path {path}.")
     return data
@@ -66,7 +65,33 @@ def read_q_as_dict(path: str) -> dict:
     with open(path, 'r') as f:
         data = json.load(f)
     logger.info(f"Read json file to dict @ path {path}.")
-    return {eval(k): np.array(v) for k,v in data.items()}
+    return {parse_state_key(k): np.array(v) for k,v in data.items()}
+
+def read_policy_as_dict(path: str) -> dict:
+    """Read json in as a dict, expecting tuple keys with int values.
+
+    Args:
+        path (str): filepath
+
+    Returns:
+        dict: the policy read in.
+    """
+    with open(path, 'r') as f:
+        data = json.load(f)
+    logger.info(f"Read json file to dict @ path {path}.")
+    return {parse_state_key(k): int(v) for k,v in data.items()}
+
+def parse_state_key(key: str) -> tuple:
+    """Parse a state key written by write_dict_as_json, e.g. '(3, 14)', back to a tuple of ints
+
+    Args:
+        key (str): the str of the state tuple
+
+    Returns:
+        tuple: the state
+    """
+    return tuple(int(x) for x in key.strip("()").split(",") if x.strip())
 
 def write_numpy_as_csv(path: str, data: np.array, header: list):
+    import pandas as pd # imported lazily, pandas is slow to import
     pd.DataFrame(data).to_csv(path, header=header)
\ No newline at end of file
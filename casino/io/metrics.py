@@ -0,0 +1,124 @@
+import logging
+import os
+import tempfile
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+class MetricSink:
+    """Streams a per episode metric to a binary file of float64 values in fixed size blocks,
+    keeping only the current block and running aggregates of the metric in memory.
+    """
+    def __init__(self, path: str = None, block_size: int = 65536):
+        """Constructor
+
+        Args:
+            path (str, optional): the path of the binary file, which is appended to if it exists.
+                Defaults to an anonymous temporary file, which is removed when closed.
+            block_size (int): the number of values buffered before writing them to the file
+        """
+        self.path = path
+        self.file = tempfile.TemporaryFile() if path is None else open(path, "a+b")
+        self.block = np.zeros(block_size, dtype=np.float64)
+        self.block_size = block_size
+        self.length = 0 # the number of values in the block
+        self.n_written = self.file.seek(0, os.SEEK_END) // self.block.itemsize
+        self.reset_aggregates()
+        if self.n_written > 0:
+            self.truncate(self.n_written)
+
+    def reset_aggregates(self):
+        self.count = 0
+        self.sum = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+        self.last = np.nan
+
+    def append(self, value: float):
+        self.block[self.length] = value
+        self.length += 1
+        self.count += 1
+        self.sum += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.last = value
+        if self.length == self.block_size:
+            self.flush()
+
+    def __len__(self) -> int:
+        return self.count
+
+    @property
+    def mean(self) -> float:
+        return self.sum / self.count if self.count > 0 else np.nan
+
+    def flush(self):
+        """Write the buffered values to the file
+        """
+        if self.length > 0:
+            self.file.write(self.block[:self.length].tobytes())
+            self.n_written += self.length
+            self.length = 0
+        self.file.flush()
+
+    def iter_blocks(self):
+        """Read the values back from the file, one block at a time
+
+        Yields:
+            np.ndarray: the next block of values
+        """
+        self.flush()
+        for start in range(0, self.n_written, self.block_size):
+            self.file.seek(start * self.block.itemsize)
+            yield np.fromfile(self.file, dtype=np.float64, count=min(self.block_size, self.n_written - start))
+        self.file.seek(0, os.SEEK_END)
+
+    def values(self, mmap: bool = False) -> np.ndarray:
+        """Read all the values back from the file
+
+        Args:
+            mmap (bool): memory map the file instead of reading it into memory
+        """
+        if mmap and self.n_written + self.length > 0:
+            self.flush()
+            return np.memmap(self.file, dtype=np.float64, mode="r", shape=(self.n_written,))
+        blocks = list(self.iter_blocks())
+        return np.concatenate(blocks) if len(blocks) > 0 else np.zeros(0)
+
+    def truncate(self, count: int):
+        """Drop the values after the first count values, and recompute the aggregates from the file
+
+        Args:
+            count (int): the number of values to keep
+        """
+        self.flush()
+        self.file.truncate(count * self.block.itemsize)
+        self.n_written = count
+        self.reset_aggregates()
+        for block in self.iter_blocks():
+            self.count += len(block)
+            self.sum += block.sum()
+            self.min = min(self.min, block.min())
+            self.max = max(self.max, block.max())
+            self.last = block[-1]
+
+    def export_csv(self, path: str, header: str):
+        """Write the values to a csv file with an index column, one block at a time
+
+        Args:
+            path (str): the path of the csv file
+            header (str): the name of the value column
+        """
+        with open(path, "w") as f:
+            f.write(f",{header}\n")
+            start = 0
+            for block in self.iter_blocks():
+                np.savetxt(f, np.column_stack((np.arange(start, start + len(block)), block)), fmt=["%d", "%.17g"], delimiter=",")
+                start += len(block)
+        logger.info(f"Saved csv file @ path {path}.")
+
+    def close(self):
+        self.flush()
+        self.file.close()
@@ -0,0 +1,112 @@
+from collections.abc import Mapping
+import logging
+import os
+import numpy as np
+
+from casino.io import disk
+from casino.util.env import varia
+
+logger = logging.getLogger(__name__)
+
+class QArrays(Mapping):
+    """Read only, dict like view of a q function stored as arrays: one row of state values and one row of q values per state.
+    The arrays may be memory mapped, so that many processes can share one q function without copying it.
+    """
+    def __init__(self, states: np.ndarray, values: np.ndarray, policy: np.ndarray = None):
+        """Constructor
+
+        Args:
+            states (np.ndarray): (n_states, state_dim) int array of the states
+            values (np.ndarray): (n_states, n_actions) float array of the q values of the states
+            policy (np.ndarray, optional): (n_states,) int array of the greedy action of the states
+        """
+        self.states = states
+        self.values = values
+        self.policy = policy
+        self.index_of = {tuple(state): idx for idx, state in enumerate(states.tolist())}
+
+    def __getitem__(self, state) -> np.ndarray:
+        return self.values[self.index_of[state]]
+
+    def __contains__(self, state) -> bool:
+        return state in self.index_of
+
+    def __iter__(self):
+        return iter(self.index_of)
+
+    def __len__(self) -> int:
+        return len(self.index_of)
+
+    def get_policy(self) -> dict:
+        """Get the greedy policy as a dict keyed by state
+        """
+        if self.policy is None:
+            return {state: int(np.argmax(self.values[idx])) for state, idx in self.index_of.items()}
+        return dict(zip(self.index_of, self.policy.tolist()))
+
+def has_q_arrays(session_dir: str) -> bool:
+    return os.path.exists(os.path.join(session_dir, varia.Q_VALUES_FNAME))
+
+def write_q_as_arrays(output_dir: str, q_func: dict, policy_func: dict = None):
+    """Save a q function and its greedy policy as .npy arrays, in the order of the states of the q function
+
+    Args:
+        output_dir (str): the directory to write to
+        q_func (dict): the q function, keyed by tuple states
+        policy_func (dict, optional): the greedy policy, keyed by tuple states. States missing from it get the argmax of their q values.
+    """
+    states = list(q_func.keys())
+    values = np.array([q_func[state] for state in states], dtype=np.float64)
+    policy_func = {} if policy_func is None else policy_func
+    policy = np.array([policy_func[state] if state in policy_func else np.argmax(values[idx]) for idx, state in enumerate(states)], dtype=np.int64)
+    np.save(os.path.join(output_dir, varia.Q_STATES_FNAME), np.array(states, dtype=np.int64))
+    np.save(os.path.join(output_dir, varia.Q_VALUES_FNAME), values)
+    np.save(os.path.join(output_dir, varia.POLICY_ARRAY_FNAME), policy)
+    logger.info(f"Saved [{len(states)}] q values as arrays @ dir {output_dir}.")
+
+def read_q_as_arrays(session_dir: str, mmap: bool = True) -> QArrays:
+    """Read a q function saved by write_q_as_arrays
+
+    Args:
+        session_dir (str): the directory of the arrays
+        mmap (bool): memory map the arrays instead of reading them into memory
+
+    Returns:
+        QArrays: the q function
+    """
+    mmap_mode = "r" if mmap else None
+    states = np.load(os.path.join(session_dir, varia.Q_STATES_FNAME), mmap_mode=mmap_mode)
+    values = np.load(os.path.join(session_dir, varia.Q_VALUES_FNAME), mmap_mode=mmap_mode)
+    policy_path = os.path.join(session_dir, varia.POLICY_ARRAY_FNAME)
+    policy = np.load(policy_path, mmap_mode=mmap_mode) if os.path.exists(policy_path) else None
+    logger.info(f"Read [{len(states)}] q values from arrays @ dir {session_dir}.")
+    return QArrays(states, values, policy)
+
+def read_q(path: str):
+    """Read a q function from a session dir, one of its .npy arrays or a qfunc.json file.
+    The arrays are preferred over the json when a session dir has both.
+
+    Args:
+        path (str): the path
+
+    Returns:
+        Mapping: the q function, keyed by tuple states
+    """
+    if path.endswith(".npy"):
+        return read_q_as_arrays(os.path.dirname(path))
+    if os.path.isdir(path):
+        if has_q_arrays(path):
+            return read_q_as_arrays(path)
+        path = os.path.join(path, varia.Q_FNAME)
+    return disk.read_q_as_dict(path)
+
+def convert_session(session_dir: str):
+    """Write the .npy arrays for a session saved only as json
+
+    Args:
+        session_dir (str): the session directory, holding a qfunc.json and optionally a policy.json
+    """
+    q_func = disk.read_q_as_dict(os.path.join(session_dir, varia.Q_FNAME))
+    policy_path = os.path.join(session_dir, varia.POLICY_FNAME)
+    policy_func = disk.read_policy_as_dict(policy_path) if os.path.exists(policy_path) else None
+    write_q_as_arrays(session_dir, q_func, policy_func)
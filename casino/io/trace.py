@@ -0,0 +1,75 @@
+import logging
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# fixed width, little endian record of a single step of an episode
+TRACE_DTYPE = np.dtype([
+    ("episode", "<u4"),
+    ("step", "<u2"),
+    ("dealer", "i1"),  # the state the action was taken in: the dealers first card ...
+    ("player", "i1"),  # ... and the players score
+    ("action", "i1"),
+    ("card", "i1"),    # the score of the card drawn by the player, 0 if no card was drawn
+    ("reward", "i1"),
+])
+
+class TraceRecorder:
+    """Records the steps of episodes into a preallocated buffer, which is flushed in bulk to a binary file of TRACE_DTYPE records
+    """
+    def __init__(self, path: str, capacity: int = 65536):
+        """Constructor
+
+        Args:
+            path (str): the path of the binary trace file, which is overwritten
+            capacity (int): the number of records buffered before flushing to the file
+        """
+        self.path = path
+        self.records = np.zeros(capacity, dtype=TRACE_DTYPE)
+        self.capacity = capacity
+        self.length = 0
+        self.n_flushed = 0
+        self.file = open(path, "wb")
+        logger.info(f"Recording episode trace to {path}")
+
+    def record(self, episode: int, step: int, state: tuple, action: int, card: int, reward: int):
+        """Record a step
+
+        Args:
+            episode (int): the episode id
+            step (int): the step within the episode
+            state (tuple): the (dealer, player) state the action was taken in
+            action (int): the action
+            card (int): the score of the card drawn, 0 if none
+            reward (int): the reward observed
+        """
+        self.records[self.length] = (episode, step, state[0], state[1], action, card, reward)
+        self.length += 1
+        if self.length == self.capacity:
+            self.flush()
+
+    def flush(self):
+        """Write the buffered records to the file
+        """
+        self.file.write(self.records[:self.length].tobytes())
+        self.n_flushed += self.length
+        self.length = 0
+
+    def close(self):
+        self.flush()
+        self.file.close()
+        logger.info(f"Saved [{self.n_flushed}] trace records @ path {self.path}.")
+
+def read_trace(path: str, mmap: bool = False) -> np.ndarray:
+    """Read a binary trace file
+
+    Args:
+        path (str): the path of the trace file
+        mmap (bool): memory map the file instead of reading it into memory
+
+    Returns:
+        np.ndarray: structured array of TRACE_DTYPE records, with one field per column
+    """
+    if mmap:
+        return np.memmap(path, dtype=TRACE_DTYPE, mode="r")
+    return np.fromfile(path, dtype=TRACE_DTYPE)
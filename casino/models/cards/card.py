@@ -1,34 +1,74 @@
 from casino.models.cards.color import Color
 
 class Card:
-    """Simple card class, with integer representing the card rank and a color enum
+    """Simple card class, with integer representing the card rank and a color enum.
+    Cards are immutable and interned: constructing a card returns the single shared instance for its color and number,
+    so drawing cards does not allocate.
     """
-    def __init__(self, color: Color, number: int) -> None:
-        self.color = color
-        self.number = number
+    __slots__ = ("color", "number", "score")
+    _cards = {} # flyweight cache of the cards, keyed by (color, number)
+
+    def __new__(cls, color: Color, number: int):
+        card = cls._cards.get((color, number))
+        if card is None:
+            card = super().__new__(cls)
+            object.__setattr__(card, "color", color)
+            object.__setattr__(card, "number", number)
+            object.__setattr__(card, "score", -number if color == Color.RED else number) # the score of the card in easy21
+            cls._cards[(color, number)] = card
+        return card
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Cards are immutable, cannot set [{name}]!")
+
+    def __reduce__(self):
+        return (Card, (self.color, self.number))
+
+    @property
+    def code(self) -> int:
+        """The card encoded as a single non negative integer, see from_code
+        """
+        return 2 * self.number + self.color.value
+
+    @staticmethod
+    def from_code(code: int):
+        """Get the card for an integer encoding
+
+        Args:
+            code (int): the encoded card
+
+        Returns:
+            Card: the card
+        """
+        return Card(Color(code % 2), code // 2)
 
     def __lt__(self, other):
-        if self.number < other.number:
-            return True
-    
-    def __lt__(self, other):
-        if self.number <= other.number:
-            return True
+        return self.number < other.number
+
+    def __le__(self, other):
+        return self.number <= other.number
 
     def __gt__(self, other):
-        if self.number > other.number:
-            return True
+        return self.number > other.number
+
     def __ge__(self, other):
-        if self.number >= other.number:
-            return True
+        return self.number >= other.number
 
     def __eq__(self, other):
-        if self.number == other.number and self.color == other.color:
-            return True
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.number == other.number and self.color == other.color
 
     def __ne__(self, other):
-        if self.number != other.number or self.color != other.color:
-            return True
-    
+        if not isinstance(other, Card):
+            return NotImplemented
+        return self.number != other.number or self.color != other.color
+
+    def __hash__(self):
+        return hash((self.color, self.number))
+
     def __str__(self):
-        return f"(color : {self.color}, number: {self.number})"
\ No newline at end of file
+        return f"(color : {self.color}, number: {self.number})"
+
+    def __repr__(self):
+        return f"Card({self.color}, {self.number})"
@@ -1,5 +1,4 @@
 import numpy as np
-import random
 from typing import Optional
 
 from casino.models.cards.card import Card
@@ -10,31 +9,73 @@ class InfiniteDeck:
     Instantiations of this class provide an infinite deck of cards,
     where the lowest and highest card rank are configurable.
     In addition, the color bias may be set, defining the probability
-    of the drawed color from the deck upon a sample
+    of the drawed color from the deck upon a sample.
+    Cards are pre-drawn in blocks from a seedable random number generator and served one at a time.
     """
-    
-    def __init__(self, low_bound, high_bound, color_bias):
+
+    def __init__(self, low_bound, high_bound, color_bias, seed=None, block_size=4096):
         """Default constructor
 
         Args:
             low_bound (int): the lowest card in the deck
             high_bound (int): the highest card in the deck
             color_bias (float): probabilistic ratio of drawing red to black
+            seed (int, optional): the seed for the random number generator of the deck
+            block_size (int): the number of cards drawn at a time from the random number generator
         """
         self.low_bound = low_bound
         self.high_bound = high_bound
         self.color_bias = color_bias
-    
+        self.red_prob = color_bias / (1 + color_bias)
+        self.rng = np.random.default_rng(seed)
+        self.block_size = block_size
+        self.refill()
+
+    def refill(self):
+        """Draw the next block of card numbers and colors
+        """
+        self.numbers = self.rng.integers(self.low_bound, self.high_bound + 1, size=self.block_size).tolist()
+        self.reds = (self.rng.random(self.block_size) < self.red_prob).tolist()
+        self.cursor = 0
+
     def draw(self, color=None):
         """Draws a card from the deck
         Args:
             color (Color, optional) : force a color in the draw
         """
-        card_number = np.random.randint(1,10, dtype=int)
+        if self.cursor == self.block_size:
+            self.refill()
+        card_number = self.numbers[self.cursor]
         if color is None:
-            card_color = random.choices([Color.RED, Color.BLACK], [1/3,1])[0]
+            card_color = Color.RED if self.reds[self.cursor] else Color.BLACK
         else:
             card_color = color
+        self.cursor += 1
         return Card(card_color, card_number)
 
-        
\ No newline at end of file
+    def get_card_distribution(self) -> tuple:
+        """Get the distribution of the cards drawn from the deck, matching draw
+
+        Returns:
+            tuple: the card numbers, the probability of each number, and the probability of a red card
+        """
+        numbers = np.arange(self.low_bound, self.high_bound + 1)
+        number_probs = np.full(len(numbers), 1 / len(numbers))
+        return numbers, number_probs, self.red_prob
+
+    def draw_batch(self, size, color=None) -> tuple:
+        """Draws many cards from the deck at once, following the same distribution as draw
+
+        Args:
+            size (int or tuple): the number (or shape) of cards to draw
+            color (Color, optional) : force a color in the draw
+
+        Returns:
+            tuple: arrays of the card numbers and the card color values (see Color)
+        """
+        numbers = self.rng.integers(self.low_bound, self.high_bound + 1, size=size)
+        if color is None:
+            colors = np.where(self.rng.random(size) < self.red_prob, Color.RED.value, Color.BLACK.value)
+        else:
+            colors = np.full(size, color.value)
+        return numbers, colors
@@ -1,7 +1,10 @@
 import matplotlib
+matplotlib.use("Agg") # figures are only ever saved to file
 import matplotlib.pyplot as plt
 import numpy as np
 
+MAX_LINE_POINTS = 2000 # longer curves are downsampled before plotting
+
 def plot_two_dim_value_func(val_func: dict, title: str, x_label: str, y_label: str, z_label: str, z_lim: int, fname: str, flip_xy=False,):
     """Plot a 2D value function
 
@@ -13,28 +16,31 @@ def plot_two_dim_value_func(val_func: dict, title: str, x_label: str, y_label: s
         z_label (str): the z label
         fname (str): the file name for saving
     """
-    idx1 = 0
-    idx2 = 1
     if flip_xy:
-        idx1 = 1
-        idx2 = 0
-        swp_lbl = x_label
-        x_label = y_label
-        y_label = swp_lbl
-
-    min_x = min(k[idx1] for k in val_func.keys())
-    max_x = max(k[idx1] for k in val_func.keys())
-    min_y = min(k[idx2] for k in val_func.keys())
-    max_y = max(k[idx2] for k in val_func.keys())
-
-    x_range = np.arange(min_x, max_x + 1)
-    y_range = np.arange(min_y, max_y + 1)
-    x_vals, y_vals = np.meshgrid(x_range, y_range)
-
-    # Find value for all (x, y) coordinates
-    z_vals = np.apply_along_axis(lambda _: val_func[(_[idx1], _[idx2])] if (_[idx1], _[idx2]) in val_func else 0, 2, np.dstack([x_vals, y_vals]))
+        x_label, y_label = y_label, x_label
+    x_vals, y_vals, z_vals = get_value_grid(val_func, flip_xy)
     plot_surface(x_vals, y_vals, z_vals, title, x_label, y_label, z_label, z_lim, fname)
 
+def get_value_grid(val_func: dict, flip_xy=False) -> tuple:
+    """Scatter a 2D value function onto a grid spanning its keys, with 0 for the missing keys
+
+    Args:
+        val_func (dict): the value function (2D tuple keys, 1D integer value)
+        flip_xy (bool): use the second element of the keys for x instead of the first
+
+    Returns:
+        tuple: the x, y and z values of the grid, as 2D arrays indexed by [y, x]
+    """
+    keys = np.array(list(val_func.keys()))
+    values = np.array(list(val_func.values()))
+    x_keys, y_keys = (keys[:, 1], keys[:, 0]) if flip_xy else (keys[:, 0], keys[:, 1])
+    min_x, min_y = x_keys.min(), y_keys.min()
+
+    x_vals, y_vals = np.meshgrid(np.arange(min_x, x_keys.max() + 1), np.arange(min_y, y_keys.max() + 1))
+    z_vals = np.zeros(x_vals.shape, dtype=values.dtype)
+    z_vals[y_keys - min_y, x_keys - min_x] = values
+    return x_vals, y_vals, z_vals
+
 def plot_surface(x_vals, y_vals, z_vals, title, x_label: str, y_label: str, z_label: str, z_lim: int, fname: str):
     fig = plt.figure(figsize=(20, 10))
     ax = fig.add_subplot(111, projection='3d')
@@ -44,13 +50,53 @@ def plot_surface(x_vals, y_vals, z_vals, title, x_label: str, y_label: str, z_la
     ax.set_zlabel(z_label)
     ax.set_zlim(0,z_lim)
     ax.set_title(title)
-    plt.savefig(fname)
+    fig.savefig(fname)
+    plt.close(fig)
 
-def line_plot(x_vals, y_vals, title, x_label, y_label, fname: str):
+def line_plot(x_vals, y_vals, title, x_label, y_label, fname: str, max_points: int = MAX_LINE_POINTS):
+    """Plot a curve, downsampled to at most max_points points, see downsample_lttb
+    """
+    x_vals, y_vals = downsample_lttb(x_vals, y_vals, max_points)
     fig = plt.figure(figsize=(20,10))
     ax = fig.add_subplot(111)
     ax.plot(x_vals, y_vals)
     ax.set_xlabel(x_label)
     ax.set_ylabel(y_label)
     ax.set_title(title)
-    plt.savefig(fname)
\ No newline at end of file
+    fig.savefig(fname)
+    plt.close(fig)
+
+def downsample_lttb(x_vals, y_vals, n_out: int) -> tuple:
+    """Downsample a curve with largest triangle three buckets, which keeps its visual shape, peaks included.
+    The first and last points are kept, and one point is picked from each of n_out - 2 equal buckets of the points in between:
+    the point forming the largest triangle with the previously picked point and the mean of the next bucket.
+
+    Args:
+        x_vals (array like): the x values, in increasing order
+        y_vals (array like): the y values
+        n_out (int): the number of points to keep
+
+    Returns:
+        tuple: the x and y values of the kept points
+    """
+    x_vals = np.asarray(x_vals)
+    y_vals = np.asarray(y_vals)
+    n = len(x_vals)
+    if n_out >= n or n_out < 3:
+        return x_vals, y_vals
+
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    kept = np.zeros(n_out, dtype=np.int64)
+    kept[-1] = n - 1
+    a = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        if i == n_out - 3:
+            next_x, next_y = x_vals[n - 1], y_vals[n - 1]
+        else:
+            next_x, next_y = x_vals[end:edges[i + 2]].mean(), y_vals[end:edges[i + 2]].mean()
+        x_a, y_a = x_vals[a], y_vals[a]
+        areas = np.abs((x_a - next_x) * (y_vals[start:end] - y_a) - (x_a - x_vals[start:end]) * (next_y - y_a))
+        a = start + int(np.argmax(areas))
+        kept[i + 1] = a
+    return x_vals[kept], y_vals[kept]
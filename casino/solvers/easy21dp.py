@@ -0,0 +1,93 @@
+import logging
+import os
+import numpy as np
+
+from casino.environments.easy21.easy21 import Easy21
+from casino.environments.easy21.player import Action
+from casino.environments.easy21.veceasy21 import MIN_SCORE, MAX_SCORE
+from casino.environments.easy21.dealer import BUST, get_card_scores, get_dealer_outcomes
+from casino.models.cards.infinitedeck import InfiniteDeck
+from casino.io import disk, qarray
+from casino.util.env import varia
+
+"""Exact dynamic programming solver for Easy21.
+The transition model is built from the card distribution of the InfiniteDeck and the rules of Easy21,
+and value iteration is run over the whole state space at once to find Q*.
+"""
+logger = logging.getLogger(__name__)
+
+def value_iteration(deck: InfiniteDeck, gamma: float = 1.0, tol: float = 1e-12, max_iter: int = 10000) -> np.ndarray:
+    """Run value iteration for Easy21
+
+    Args:
+        deck (InfiniteDeck): the deck the game is played with
+        gamma (float): the discount coefficient
+        tol (float): stop once the largest change of a q value is below this tolerance
+        max_iter (int): the maximum number of iterations
+
+    Returns:
+        np.ndarray: (11, 22, n_actions) array of q values indexed by the dealers first card and the players score
+    """
+    scores, probs = get_card_scores(deck)
+    outcomes = get_dealer_outcomes(deck)
+    dealer_cards = np.arange(0, 11)
+    player_scores = np.arange(0, MAX_SCORE + 1)
+
+    # expected reward when sticking: compare against the dealers final score, or win if the dealer goes bust
+    final_scores = np.arange(0, MAX_SCORE + 1)
+    comparison = np.sign(player_scores[:, None] - final_scores[None, :]) # (player score, dealer final score)
+    q_stick = outcomes[dealer_cards, :MAX_SCORE + 1] @ comparison.T + outcomes[dealer_cards, BUST][:, None]
+
+    # hitting leads to player score + card, or to busting
+    next_scores = player_scores[:, None] + scores[None, :]
+    bust = (next_scores < MIN_SCORE) | (next_scores > MAX_SCORE)
+    next_scores = np.where(bust, 0, next_scores)
+    bust_reward = -np.sum(probs * bust, axis=1) # (player score,)
+
+    q = np.zeros((len(dealer_cards), len(player_scores), 2))
+    q[:, :, Action.STICK.value] = q_stick
+    for i in range(max_iter):
+        values = q.max(axis=2)
+        values[:, 0] = 0 # a score of 0 is bust, not a state
+        q_hit = bust_reward[None, :] + gamma * np.sum(values[:, next_scores] * probs * ~bust, axis=2)
+        delta = np.max(np.abs(q_hit - q[:, :, Action.HIT.value]))
+        q[:, :, Action.HIT.value] = q_hit
+        if delta < tol:
+            logger.info(f"Value iteration converged after [{i + 1}] iterations.")
+            break
+    else:
+        logger.warning(f"Value iteration did not converge within [{max_iter}] iterations! Last change [{delta}].")
+    return q
+
+def solve(gamma: float = 1.0, tol: float = 1e-12) -> tuple:
+    """Solve Easy21 exactly
+
+    Args:
+        gamma (float): the discount coefficient
+        tol (float): the convergence tolerance of value iteration
+
+    Returns:
+        tuple: the q function and greedy policy as dicts keyed by the states of Easy21, including the null state (0, 0)
+    """
+    env = Easy21()
+    q = value_iteration(env.deck, gamma, tol)
+    q_func = {}
+    for state in env.get_state_space().states:
+        q_func[state] = np.zeros(env.n_actions) if state == (0, 0) else q[state]
+    policy_func = dict((state, np.argmax(q_value)) for state, q_value in q_func.items())
+    return q_func, policy_func
+
+def solve_to_disk(output_dir: str, gamma: float = 1.0, tol: float = 1e-12):
+    """Solve Easy21 and save the q function and policy in the same format as trained agents
+
+    Args:
+        output_dir (str): the directory to write to
+        gamma (float): the discount coefficient
+        tol (float): the convergence tolerance of value iteration
+    """
+    if not os.path.exists(output_dir):
+        os.mkdir(output_dir)
+    q_func, policy_func = solve(gamma, tol)
+    disk.write_dict_as_json(os.path.join(output_dir, varia.Q_FNAME), q_func, str, list)
+    disk.write_dict_as_json(os.path.join(output_dir, varia.POLICY_FNAME), policy_func, str, int)
+    qarray.write_q_as_arrays(output_dir, q_func, policy_func)
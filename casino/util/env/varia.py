@@ -1,12 +1,26 @@
 LOG_DIR = "logs"
 DATA_DIR = "data"
+CACHE_DIR = "cache"
 
 CUMULATIVE_EP_REWARD_FNAME = "cumulative_reward.csv"
 POLICY_FNAME = "policy.json"
 Q_FNAME = "qfunc.json"
+Q_STATES_FNAME = "qfunc_states.npy"
+Q_VALUES_FNAME = "qfunc_values.npy"
+POLICY_ARRAY_FNAME = "policy.npy"
+LINEAR_WEIGHTS_FNAME = "weights.npy"
 
 VAL_FUNC_PLOT_NAME = "valfunc.png"
 MSE_PLOT_NAME = "mse.png"
+TRACE_FNAME = "trace.bin"
+CHECKPOINT_FNAME = "checkpoint.pkl"
+METRIC_EXT = ".bin"
+PROFILE_FNAME = "profile.json"
+CPROFILE_FNAME = "cprofile.pstats"
+CPROFILE_REPORT_FNAME = "cprofile.txt"
 META_FNAME = "metadata.json"
+EVAL_FNAME = "evaluation.json"
+SWEEP_SPEC_FNAME = "spec.json"
+SWEEP_SUMMARY_FNAME = "summary.csv"
 META_GAME_KEY = "game_type"
 META_AGENT_KEY = "agent_type"
@@ -0,0 +1,142 @@
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+import cProfile
+import functools
+import io
+import logging
+import os
+import pstats
+import time
+import tracemalloc
+
+from casino.io import disk
+from casino.util.env import varia
+
+logger = logging.getLogger(__name__)
+
+class NullTimer:
+    """Phase timer that does nothing, used when profiling is off so that the timed code pays nothing for it
+    """
+    def instrument(self, obj, method_name: str, phase: str = None):
+        pass
+
+    def phase(self, name: str):
+        return nullcontext()
+
+    def report(self) -> dict:
+        return {}
+
+class PhaseTimer(NullTimer):
+    """Accumulates the wall clock time and the number of calls of the phases of a training session.
+    Methods are timed by replacing them on the instance with a timed wrapper, so the classes themselves are left untouched.
+    Phases nest, e.g. the environment steps are included in the time of the training episodes.
+    """
+    def __init__(self):
+        self.seconds = defaultdict(float)
+        self.calls = defaultdict(int)
+
+    def instrument(self, obj, method_name: str, phase: str = None):
+        """Time every call of a method of an object from now on
+
+        Args:
+            obj (object): the object
+            method_name (str): the name of the method
+            phase (str, optional): the name of the phase to account the time to. Defaults to the method name.
+        """
+        phase = method_name if phase is None else phase
+        method = getattr(obj, method_name)
+        seconds = self.seconds
+        calls = self.calls
+
+        @functools.wraps(method)
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                seconds[phase] += time.perf_counter() - start
+                calls[phase] += 1
+        setattr(obj, method_name, timed)
+
+    @contextmanager
+    def phase(self, name: str):
+        """Time a block of code
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+            self.calls[name] += 1
+
+    def report(self) -> dict:
+        """Get the time of every phase, slowest first
+
+        Returns:
+            dict: the total seconds, number of calls and mean microseconds per call of each phase
+        """
+        return {phase: {"seconds": self.seconds[phase], "calls": self.calls[phase], "mean_us": 1e6 * self.seconds[phase] / self.calls[phase]}
+                for phase in sorted(self.seconds, key=self.seconds.get, reverse=True)}
+
+class SessionProfiler:
+    """Profiles a training session with phase timers, and optionally cProfile and tracemalloc,
+    writing a report to the session's output dir.
+    """
+    def __init__(self, phases: bool = False, cprofile: bool = False, trace_malloc: bool = False):
+        """Constructor
+
+        Args:
+            phases (bool): time the phases of the session, see PhaseTimer
+            cprofile (bool): profile every function call with cProfile, which slows training down considerably
+            trace_malloc (bool): trace the memory allocations with tracemalloc, which slows training down considerably
+        """
+        self.timer = PhaseTimer() if phases else NullTimer()
+        self.cprofile = cProfile.Profile() if cprofile else None
+        self.trace_malloc = trace_malloc
+        self.episodes_per_sec = None
+
+    def start(self):
+        if self.trace_malloc:
+            tracemalloc.start()
+        if self.cprofile is not None:
+            self.cprofile.enable()
+        self.start_time = time.perf_counter()
+
+    def stop(self, n_episodes: int):
+        """Stop profiling
+
+        Args:
+            n_episodes (int): the number of episodes trained while profiling
+        """
+        self.train_seconds = time.perf_counter() - self.start_time
+        self.episodes_per_sec = n_episodes / self.train_seconds if self.train_seconds > 0 else None
+        if self.cprofile is not None:
+            self.cprofile.disable()
+        if self.trace_malloc:
+            self.malloc_snapshot = tracemalloc.take_snapshot()
+            self.malloc_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    def save_report(self, output_dir: str, n_top: int = 30):
+        """Write the report: the phase times and the memory use to a json file, and the cProfile stats to a text file and a pstats file
+
+        Args:
+            output_dir (str): the output directory
+            n_top (int): the number of functions and allocation sites to report
+        """
+        report = {"train_seconds": self.train_seconds, "episodes_per_sec": self.episodes_per_sec, "phases": self.timer.report()}
+        if self.trace_malloc:
+            report["tracemalloc"] = {
+                "peak_bytes": self.malloc_peak,
+                "top": [{"site": str(stat.traceback), "bytes": stat.size, "count": stat.count}
+                        for stat in self.malloc_snapshot.statistics("lineno")[:n_top]],
+            }
+        disk.write_json(os.path.join(output_dir, varia.PROFILE_FNAME), report)
+
+        if self.cprofile is not None:
+            self.cprofile.dump_stats(os.path.join(output_dir, varia.CPROFILE_FNAME))
+            stream = io.StringIO()
+            pstats.Stats(self.cprofile, stream=stream).sort_stats("cumulative").print_stats(n_top)
+            with open(os.path.join(output_dir, varia.CPROFILE_REPORT_FNAME), "w") as f:
+                f.write(stream.getvalue())
+        logger.info(f"Saved the profiling report @ dir {output_dir}.")
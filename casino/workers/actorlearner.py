@@ -0,0 +1,243 @@
+from casino.agents.agent import AbstractAgent
+from casino.agents.buffer import EpisodeBuffer
+from casino.agents.sampler import EpsilonGreedySampler
+from casino.environments.easy21.easy21 import Easy21
+from casino.environments.env import Games
+
+import logging
+import multiprocessing as mp
+import queue
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+QUEUE_TIMEOUT = 0.1 # seconds to wait on a queue before checking for shutdown
+
+class EpsilonGreedyActor:
+    """Acts epsilon greedily using a snapshot of a learner's greedy policy and state visit counters
+    """
+    def __init__(self, n_actions: int, eps_constant: int, seed: int = None):
+        self.eps_constant = eps_constant
+        self.sampler = EpsilonGreedySampler(n_actions, seed)
+        self.policy_func = {}
+        self.n_state_visits = {}
+
+    def sync(self, policy_func: dict, n_state_visits: dict):
+        self.policy_func = policy_func
+        self.n_state_visits = n_state_visits
+
+    def act(self, state) -> int:
+        n_visits = self.n_state_visits.get(state, 0) + 1
+        self.n_state_visits[state] = n_visits
+        epsilon = self.eps_constant / (self.eps_constant + n_visits)
+        return self.sampler.sample(self.policy_func.get(state, 0), epsilon)
+
+def run_actor(actor_id: int, game_id: int, env_kwargs: dict, n_actions: int, eps_constant: int, seed,
+              param_queue: mp.Queue, trajectory_queue: mp.Queue, stop_event, chunk_size: int = 1):
+    """Actor process loop. Plays episodes with the latest policy snapshot received from the learner,
+    and sends the trajectories back to the learner in chunks of episodes until told to stop.
+
+    Args:
+        actor_id (int): the id of the actor
+        game_id (int): the id of the game to play
+        env_kwargs (dict): keyword arguments for the game environment
+        n_actions (int): the size of the action space
+        eps_constant (int): a constant for the epsilon exploration strategy
+        seed (np.random.SeedSequence, optional): the seed sequence of the actor, split between the random number generators of its game and its exploration
+        param_queue (mp.Queue): queue of (policy_func, n_state_visits) snapshots from the learner
+        trajectory_queue (mp.Queue): bounded queue of trajectory chunks to the learner, see ActorLearner.unpack
+        stop_event (mp.Event): set by the learner when training is complete
+        chunk_size (int): the number of episodes sent per chunk
+    """
+    if Games(game_id) != Games.EASY21:
+        raise NotImplementedError(f"Game id [{game_id}] has not been implemented!")
+    env_seed, explore_seed = [None]*2 if seed is None else seed.spawn(2) # independent streams for the cards and the exploration
+    env = Easy21(**env_kwargs, seed=env_seed)
+    actor = EpsilonGreedyActor(n_actions, eps_constant, explore_seed)
+    buffer = EpisodeBuffer() # the steps of every episode of the chunk, back to back
+    final_states = []
+    offsets = [0]
+
+    while not stop_event.is_set():
+        try:
+            while True: # only the latest snapshot matters
+                actor.sync(*param_queue.get_nowait())
+        except queue.Empty:
+            pass
+
+        state = env.reset()
+        terminal = False
+        while not terminal:
+            action = actor.act(state)
+            next_state, reward, terminal = env.step(action)
+            buffer.add(state, action, reward)
+            state = next_state
+        final_states.append(state)
+        offsets.append(len(buffer))
+        if len(final_states) < chunk_size:
+            continue
+
+        chunk = (buffer.states[:len(buffer)].copy(), buffer.actions[:len(buffer)].copy(), buffer.rewards[:len(buffer)].copy(),
+                 np.array(final_states, dtype=np.int64), np.array(offsets, dtype=np.int64))
+        buffer.clear()
+        final_states.clear()
+        offsets[1:] = []
+        while not stop_event.is_set():
+            try:
+                trajectory_queue.put(chunk, timeout=QUEUE_TIMEOUT)
+                break
+            except queue.Full:
+                pass
+    logger.info(f"Actor [{actor_id}] stopped.")
+
+class ActorLearner:
+    """Trains an agent with several actor processes playing episodes in parallel,
+    while the agent learns from their trajectories as the single learner.
+    """
+    def __init__(self, agent: AbstractAgent, game_id: int, n_actions: int, n_actors: int, sync_every: int,
+                 queue_size: int = 100, seed: int = None, env_kwargs: dict = None, chunk_size: int = 32):
+        """Constructor
+
+        Args:
+            agent (AbstractAgent): the learning agent
+            game_id (int): the id of the game
+            n_actions (int): the size of the action space
+            n_actors (int): the number of actor processes
+            sync_every (int): send the actors a new policy snapshot every this many learned episodes
+            queue_size (int): the maximum number of trajectory chunks waiting for the learner
+            seed (int, optional): base seed for the actors, each actor is seeded with its own child of the seed's SeedSequence
+            env_kwargs (dict, optional): keyword arguments for the actors' game environments
+            chunk_size (int): the number of episodes an actor sends the learner at once, amortizing the cost of the queue over the episodes
+
+        Raises:
+            ValueError: raised if the agent cannot learn from trajectories, before any actor is started
+        """
+        if type(agent).learn_trajectory is AbstractAgent.learn_trajectory:
+            raise ValueError(f"Agent [{agent.name}] cannot learn from the trajectories of actors! Train it with a single process, i.e. --n_actors 1.")
+        self.agent = agent
+        self.game_id = game_id
+        self.n_actions = n_actions
+        self.n_actors = n_actors
+        self.sync_every = sync_every
+        self.queue_size = queue_size
+        self.seed = seed
+        self.env_kwargs = {} if env_kwargs is None else env_kwargs
+        self.chunk_size = chunk_size
+
+    def train(self, n_episodes: int):
+        """Run the actors and learn from n_episodes of their trajectories
+
+        Args:
+            n_episodes (int): the number of episodes to learn from
+        """
+        ctx = mp.get_context()
+        stop_event = ctx.Event()
+        trajectory_queue = ctx.Queue(maxsize=self.queue_size)
+        param_queues = [ctx.Queue(maxsize=1) for _ in range(self.n_actors)]
+        actor_seeds = [None]*self.n_actors if self.seed is None else np.random.SeedSequence(self.seed).spawn(self.n_actors)
+        actors = []
+        for actor_id, seed in enumerate(actor_seeds):
+            actor = ctx.Process(target=run_actor, args=(actor_id, self.game_id, self.env_kwargs, self.n_actions, self.agent.eps_constant, seed,
+                                                        param_queues[actor_id], trajectory_queue, stop_event, self.chunk_size), daemon=True)
+            actors.append(actor)
+
+        self.sync(param_queues)
+        for actor in actors:
+            actor.start()
+        logger.info(f"Started [{self.n_actors}] actors.")
+
+        try:
+            progress_episode, progress_time = 0, time.perf_counter()
+            i = 0
+            while i < n_episodes:
+                for states, actions, rewards, final_state, keys in self.unpack(self.get_trajectory(trajectory_queue, actors)):
+                    if (i % 1000 == True):
+                        now = time.perf_counter()
+                        logger.info(f"Reached episode [{i}] of [{n_episodes}] at [{(i - progress_episode) / (now - progress_time):.0f}] episodes/sec.")
+                        progress_episode, progress_time = i, now
+                    self.agent.learn_trajectory(states, actions, rewards, final_state, i, keys)
+                    i += 1
+                    if i % self.sync_every == 0:
+                        self.sync(param_queues)
+                    if i == n_episodes:
+                        break
+        finally:
+            stop_event.set()
+            self.shutdown(actors, [trajectory_queue] + param_queues)
+
+    def unpack(self, chunk: tuple):
+        """Split a chunk of trajectories into its episodes, converting the arrays of the chunk to lists once for all its episodes.
+        With a dense q function backend, the states are indexed in one vectorized lookup, and the states of the state space are reused
+        rather than rebuilt as tuples.
+
+        Args:
+            chunk (tuple): the states, actions and rewards of the steps of every episode back to back, the final state of each episode,
+                and the offsets of the episodes into the steps, see run_actor
+
+        Returns:
+            generator: the states, actions, rewards, final state and state keys of each episode, as taken by AbstractAgent.learn_trajectory
+        """
+        states, actions, rewards, final_states, offsets = chunk
+        state_space = self.agent.state_space
+        if state_space is None:
+            step_states = list(zip(*states.T.tolist()))
+            final_states = list(zip(*final_states.T.tolist()))
+            step_keys, final_keys = step_states, final_states
+        else:
+            step_keys = state_space.indices(states).tolist()
+            final_keys = state_space.indices(final_states).tolist()
+            step_states = [state_space.states[key] for key in step_keys]
+            final_states = [state_space.states[key] for key in final_keys]
+        actions = actions.tolist()
+        rewards = rewards.tolist()
+        offsets = offsets.tolist()
+        for j in range(len(final_states)):
+            start, end = offsets[j], offsets[j + 1]
+            yield (step_states[start:end], actions[start:end], rewards[start:end], final_states[j],
+                   step_keys[start:end] + [final_keys[j]])
+
+    def get_trajectory(self, trajectory_queue: mp.Queue, actors: list) -> tuple:
+        """Wait for the next chunk of trajectories, checking that the actors are still running whenever none arrives in time
+
+        Raises:
+            RuntimeError: raised if an actor has stopped before the training is complete
+
+        Returns:
+            tuple: the chunk of trajectories, see unpack
+        """
+        while True:
+            try:
+                return trajectory_queue.get(timeout=QUEUE_TIMEOUT)
+            except queue.Empty:
+                dead_actors = {actor_id: actor.exitcode for actor_id, actor in enumerate(actors) if not actor.is_alive()}
+                if len(dead_actors) > 0:
+                    raise RuntimeError(f"Actors stopped before the training was complete, with exit codes {dead_actors}!")
+
+    def sync(self, param_queues: list):
+        """Send the actors a snapshot of the agent's greedy policy and visit counters, replacing any snapshot not yet received
+        """
+        snapshot = (dict(self.agent.policy_func), self.agent.get_visit_counts())
+        for param_queue in param_queues:
+            try:
+                param_queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                param_queue.put_nowait(snapshot)
+            except queue.Full:
+                pass
+
+    def shutdown(self, actors: list, queues: list):
+        """Wait for the actors to stop, draining the queues so that no actor stays blocked on them
+        """
+        while any(actor.is_alive() for actor in actors):
+            for q in queues:
+                try:
+                    while True:
+                        q.get_nowait()
+                except queue.Empty:
+                    pass
+            for actor in actors:
+                actor.join(timeout=QUEUE_TIMEOUT)
+        logger.info("All actors stopped.")
@@ -0,0 +1,116 @@
+from casino.environments.easy21.veceasy21 import VecEasy21
+from casino.environments.statespace import StateSpace
+
+from concurrent.futures import ProcessPoolExecutor
+import logging
+import multiprocessing as mp
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+OUTCOMES = ["win", "draw", "loss"]
+Z_95 = 1.959963984540054 # the standard normal quantile of a 95% confidence interval
+
+def play_greedy(policy: np.ndarray, state_space: StateSpace, n_games: int, batch_size: int, seed=None) -> np.ndarray:
+    """Play games of Easy21 in batches, acting greedily with a policy
+
+    Args:
+        policy (np.ndarray): the action of every state of the state space
+        state_space (StateSpace): the state space of the game
+        n_games (int): the number of games to play
+        batch_size (int): the number of games simulated together
+        seed (int or np.random.SeedSequence, optional): the seed for the game
+
+    Returns:
+        np.ndarray: (len(state_space), 3) counts of the wins, draws and losses of the games by their start state
+    """
+    counts = np.zeros((len(state_space), len(OUTCOMES)), dtype=np.int64)
+    env = VecEasy21(min(batch_size, n_games), seed)
+    n_played = 0
+    while n_played < n_games:
+        n_batch = min(env.n_games, n_games - n_played)
+        states = env.reset_batch()
+        start_idx = state_space.indices(states)
+        final_rewards = np.zeros(env.n_games, dtype=np.int64)
+        while not np.all(env.terminal):
+            states, rewards, _ = env.step_batch(policy[state_space.indices(states)], auto_reset=False)
+            final_rewards += rewards
+        outcomes = 1 - final_rewards # win = 0, draw = 1, loss = 2
+        np.add.at(counts, (start_idx[:n_batch], outcomes[:n_batch]), 1)
+        n_played += n_batch
+    return counts
+
+def evaluate_policy(policy: np.ndarray, state_space: StateSpace, n_games: int, n_workers: int = 1, batch_size: int = 65536, seed: int = None) -> np.ndarray:
+    """Play games of Easy21 acting greedily with a policy, split across worker processes
+
+    Args:
+        policy (np.ndarray): the action of every state of the state space
+        state_space (StateSpace): the state space of the game
+        n_games (int): the number of games to play
+        n_workers (int): the number of worker processes. Set to 1 to play in this process.
+        batch_size (int): the number of games simulated together by a worker
+        seed (int, optional): the seed of the evaluation, from which each worker's seed is spawned
+
+    Returns:
+        np.ndarray: (len(state_space), 3) counts of the wins, draws and losses of the games by their start state
+    """
+    n_tasks = max(1, min(n_workers * 4, -(-n_games // batch_size))) # a few tasks per worker to balance the load
+    task_games = [n_games // n_tasks + (task < n_games % n_tasks) for task in range(n_tasks)]
+    seeds = np.random.SeedSequence(seed).spawn(n_tasks)
+    if n_workers <= 1:
+        return sum(play_greedy(policy, state_space, games, batch_size, task_seed) for games, task_seed in zip(task_games, seeds))
+
+    with ProcessPoolExecutor(max_workers=n_workers, mp_context=mp.get_context()) as pool:
+        futures = [pool.submit(play_greedy, policy, state_space, games, batch_size, task_seed) for games, task_seed in zip(task_games, seeds)]
+        return sum(future.result() for future in futures)
+
+def wilson_interval(successes, n, z: float = Z_95) -> tuple:
+    """The Wilson score confidence interval of a binomial proportion
+
+    Args:
+        successes (array like): the number of successes
+        n (array like): the number of trials, > 0
+
+    Returns:
+        tuple: the lower and upper bounds of the interval
+    """
+    successes = np.asarray(successes, dtype=np.float64)
+    n = np.asarray(n, dtype=np.float64)
+    p = successes / n
+    center = (p + z**2 / (2 * n)) / (1 + z**2 / n)
+    half_width = z * np.sqrt(p * (1 - p) / n + z**2 / (4 * n**2)) / (1 + z**2 / n)
+    return center - half_width, center + half_width
+
+def summarize_outcomes(counts: np.ndarray) -> dict:
+    """Summarize the wins, draws and losses of a set of games: their rates with 95% confidence intervals, and the mean reward
+
+    Args:
+        counts (np.ndarray): (3,) counts of the wins, draws and losses
+
+    Returns:
+        dict: the summary
+    """
+    n_games = int(counts.sum())
+    summary = {"n_games": n_games}
+    for outcome, count in zip(OUTCOMES, counts):
+        low, high = wilson_interval(count, n_games)
+        summary[outcome] = {"rate": count / n_games, "ci_low": float(low), "ci_high": float(high)}
+    mean_reward = (counts[0] - counts[2]) / n_games
+    reward_var = (counts[0] + counts[2]) / n_games - mean_reward**2
+    half_width = Z_95 * np.sqrt(reward_var / n_games)
+    summary["mean_reward"] = {"value": mean_reward, "ci_low": mean_reward - half_width, "ci_high": mean_reward + half_width}
+    return summary
+
+def summarize(counts: np.ndarray, state_space: StateSpace) -> dict:
+    """Summarize an evaluation, overall and by start state
+
+    Args:
+        counts (np.ndarray): (len(state_space), 3) counts of the wins, draws and losses by start state, see evaluate_policy
+        state_space (StateSpace): the state space of the game
+
+    Returns:
+        dict: the summary
+    """
+    summary = summarize_outcomes(counts.sum(axis=0))
+    summary["per_start_state"] = {str(state_space.state(idx)): summarize_outcomes(counts[idx]) for idx in np.flatnonzero(counts.sum(axis=1))}
+    return summary
@@ -1,8 +1,16 @@
 from casino.workers.runner import AbstractRunner
+from casino.workers.actorlearner import ActorLearner
+from casino.io.trace import TraceRecorder
+from casino.io.checkpoint import Checkpointer
+from casino.util.profiler import SessionProfiler
+from casino.agents import greedy
+from casino.workers import evaluator
+from casino.io import disk
 from casino.util.env import varia
 
 import os, sys
 import logging
+import time
 import argparse
 import enum
 import numpy as np
@@ -20,17 +28,24 @@ class GamePlayer(AbstractRunner):
             launch_time (str): the timestamp for when the program was launched
             args: (argparse.ArgumentParser): the parsed arguments from the CLI
         """
-        super().__init__(args.agent, base_dir, launch_time)
+        super().__init__(getattr(args, "agent", None), base_dir, launch_time)
         self.game_id = args.game_id
-        self.agent_name = args.agent
+        self.agent_name = getattr(args, "agent", None)
         self.initialized = False
         self.playing = False
         self.args = args
+        self.profiler = None
+        if getattr(args, "resume", None):
+            self.output_dir = args.resume # keep writing to the session being resumed
 
     def initialize(self) -> bool:
         logger.info("Setting up game environment for training")
+        # Separate seeds for the game, the agent and the actors from the single seed of the session
+        seed = getattr(self.args, "seed", None)
+        env_seed, agent_seed, self.actor_seed = [None]*3 if seed is None else np.random.SeedSequence(seed).generate_state(3).tolist()
+
         # Setup the game environment
-        is_game_setup = self.set_game(self.game_id)
+        is_game_setup = self.set_game(self.game_id, getattr(self.args, "fast_dealer", False), env_seed)
         if is_game_setup:
             logger.info(f"Game [{self.game_env.name}] has been setup!")
         else:
@@ -38,9 +53,13 @@ class GamePlayer(AbstractRunner):
             return False
             
         # Choose the agent
-        is_agent_setup = self.set_agent(self.game_env.n_actions, self.args)
+        state_space = None
+        if getattr(self.args, "q_backend", "dict") == "dense":
+            state_space = self.game_env.get_state_space()
+        is_agent_setup = self.set_agent(self.game_env.n_actions, self.args, state_space)
 
         if is_agent_setup:
+            self.agent.set_seed(agent_seed)
             logger.info(f"Agent [{self.agent.name}] has been setup!")
         else:
             logger.error(f"Agent [{self.agent.name}] could not be setup!")
@@ -64,19 +83,85 @@ class GamePlayer(AbstractRunner):
         """
         n_episodes = self.args.n_episodes
         logger.info(f"Launching training session with {n_episodes} episodes!")
-        for i in range(n_episodes):
-            if (i % 1000 == True):
-                logger.info(f"Reached episode [{i}] of [{n_episodes}].")
+        self.agent.open_metrics(self.output_dir)
+        self.profiler = SessionProfiler(self.args.profile, self.args.cprofile, self.args.tracemalloc)
+        self.instrument_phases()
+        start_episode = 0
+        if self.args.n_actors > 1:
+            logger.info(f"Training with [{self.args.n_actors}] actor processes.")
+            if self.args.checkpoint_every > 0 or self.args.resume:
+                logger.warning("Checkpointing is only supported for single process training. Training from scratch without checkpoints.")
+            env_kwargs = {"fast_dealer": self.game_env.fast_dealer}
+            actor_learner = ActorLearner(self.agent, self.game_id, self.game_env.n_actions, self.args.n_actors, self.args.actor_sync_every,
+                                         seed=self.actor_seed, env_kwargs=env_kwargs, chunk_size=self.args.actor_chunk_size)
+            self.profiler.start()
+            actor_learner.train(n_episodes)
+        else:
+            checkpointer = Checkpointer(self.output_dir, self.args.checkpoint_every)
+            if self.args.resume:
+                start_episode = checkpointer.load(self.agent, self.game_env)
+            if self.args.trace:
+                self.game_env.set_trace(TraceRecorder(os.path.join(self.output_dir, varia.TRACE_FNAME)))
+            self.profiler.start()
+            progress_episode, progress_time = start_episode, time.perf_counter()
+            for i in range(start_episode, n_episodes):
+                if (i % 1000 == True):
+                    now = time.perf_counter()
+                    logger.info(f"Reached episode [{i}] of [{n_episodes}] at [{(i - progress_episode) / (now - progress_time):.0f}] episodes/sec.")
+                    progress_episode, progress_time = i, now
 
-            self.agent.train_episode(self.game_env, i)
+                self.agent.train_episode(self.game_env, i)
+                if checkpointer.is_due(i):
+                    with self.profiler.timer.phase("checkpoint"):
+                        checkpointer.save(i + 1, self.agent, self.game_env)
+            if self.args.trace:
+                self.game_env.trace.close()
+                self.game_env.set_trace(None)
+        self.profiler.stop(n_episodes - start_episode)
         
-        logger.info("Training session complete.")
-        self.agent.save_training_data(self.output_dir, self.agent.cumulative_episodic_rewards)
+        logger.info(f"Training session complete at [{self.profiler.episodes_per_sec:.0f}] episodes/sec.")
+        with self.profiler.timer.phase("save"):
+            self.agent.save_training_data(self.output_dir, self.agent.cumulative_episodic_rewards, not self.args.skip_metrics_csv)
+        self.agent.close_metrics()
+
+    def instrument_phases(self):
+        """Time the phases of training with the profiler's phase timer, a no-op unless profiling is on
+        """
+        timer = self.profiler.timer
+        timer.instrument(self.game_env, "reset", "env.reset")
+        timer.instrument(self.game_env, "step", "env.step")
+        for method_name in ["train_episode", "learn_trajectory", "policy", "policy_at", "td_update", "update_policy"]:
+            if hasattr(self.agent, method_name):
+                timer.instrument(self.agent, method_name, f"agent.{method_name}")
+        if hasattr(self.agent, "mse_tracker"):
+            timer.instrument(self.agent.mse_tracker, "compute", "agent.mse")
+        timer.instrument(self, "plot_results", "plot")
 
     def evaluate(self, session_dir) -> bool:
-        pass # TODO: IMPLEMENT IF NEEDED
+        """Play games with the greedy policy of a saved session, without exploration, and write the win, draw and loss rates
+        overall and by start state to the session dir
+
+        Args:
+            session_dir (str): the data dir of the session
+
+        Returns:
+            bool: true if the evaluation was a success
+        """
+        if not self.set_game(self.game_id):
+            return False
+        state_space = self.game_env.get_state_space()
+        policy = greedy.load_greedy_policy(session_dir, state_space)
+        logger.info(f"Evaluating the greedy policy @ dir {session_dir} over [{self.args.n_games}] games with [{self.args.n_workers}] workers.")
+        counts = evaluator.evaluate_policy(policy, state_space, self.args.n_games, self.args.n_workers, self.args.batch_size, self.args.seed)
+        summary = evaluator.summarize(counts, state_space)
+        disk.write_json(os.path.join(session_dir, varia.EVAL_FNAME), summary)
+        for outcome in evaluator.OUTCOMES:
+            logger.info(f"{outcome} rate = [{summary[outcome]['rate']:.4f}] (95% CI [{summary[outcome]['ci_low']:.4f}, {summary[outcome]['ci_high']:.4f}])")
+        return True
 
 
     def quit(self) -> None:
         logger.info("Quitting. Saving training results")
+        if self.profiler is not None and (self.args.profile or self.args.cprofile or self.args.tracemalloc):
+            self.profiler.save_report(self.output_dir)
         logger.info("Quit completed")
\ No newline at end of file
@@ -1,7 +1,11 @@
 from casino.agents.monte import MonteCarlo
+from casino.agents.dyna import DynaQAgent
+from casino.agents.linear import LinearAgent
 from casino.agents.qlearn import QLearningAgent, SarsaAgent
+from casino.agents.tdlambda import QLambdaAgent, SarsaLambdaAgent
 from casino.environments.easy21.easy21 import Easy21
 from casino.environments.env import Games
+from casino.environments.statespace import StateSpace
 from casino.agents.agent import Agent
 from casino.agents.human import HumanAgent
 from casino.util.env import varia
@@ -14,8 +18,6 @@ import logging
 import os
 import numpy as np
 
-from casino.plotting import plotlib
-
 logger = logging.getLogger(__name__)
 
 class AbstractRunner(ABC):
@@ -109,16 +111,18 @@ class AbstractRunner(ABC):
         self.quit()
         logger.info("Shutdown completed")
 
-    def set_game(self, game_id) -> bool:
+    def set_game(self, game_id, fast_dealer: bool = False, seed: int = None) -> bool:
         """Set the game environment
 
         Args:
             game_id (int): the id for the game
+            fast_dealer (bool): sample the dealer's final score from a precomputed distribution, see Easy21
+            seed (int, optional): the seed for the game's random number generator
         """
         try:
             self.game_type = Games(game_id)
             if self.game_type == Games.EASY21:
-                self.game_env = Easy21()
+                self.game_env = Easy21(fast_dealer, os.path.join(self.base_dir, varia.DATA_DIR, varia.CACHE_DIR), seed)
             else:
                 raise NotImplementedError("Game id [{game_id}] has not been implemented!")
                 
@@ -127,13 +131,14 @@ class AbstractRunner(ABC):
             logger.error(f"Game w/ id [{game_id}] is undefined!", exc_info=True)
             return False
             
-    def set_agent(self, n_actions: int, args: argparse.ArgumentParser) -> bool:
+    def set_agent(self, n_actions: int, args: argparse.ArgumentParser, state_space: StateSpace = None) -> bool:
         """Sets the agent to use for playing the game
 
         Args:
             agent (str): the str description of the agent
             game_id (int): the id of the game
             n_actions (int): number of discrete actions for the agent to explore
+            state_space (StateSpace, optional): the state space of the game, for agents using dense q tables
 
         Raises:
             ValueError: raised if the agent is undefined
@@ -144,11 +149,21 @@ class AbstractRunner(ABC):
                 if self.agent_type == Agent.HUMAN:
                     self.agent = HumanAgent(n_actions, args)
                 elif self.agent_type == Agent.MONTE:
-                    self.agent = MonteCarlo(n_actions, args)
+                    self.agent = MonteCarlo(n_actions, args, state_space)
                 elif self.agent_type == Agent.SARSA:
-                    self.agent = SarsaAgent(n_actions, args)
+                    self.agent = SarsaAgent(n_actions, args, state_space)
                 elif self.agent_type == Agent.QLEARN:
-                    self.agent = QLearningAgent(n_actions, args)
+                    self.agent = QLearningAgent(n_actions, args, state_space)
+                elif self.agent_type == Agent.SARSA_LAMBDA:
+                    self.agent = SarsaLambdaAgent(n_actions, args, state_space)
+                elif self.agent_type == Agent.Q_LAMBDA:
+                    self.agent = QLambdaAgent(n_actions, args, state_space)
+                elif self.agent_type == Agent.LINEAR:
+                    # the features are precomputed over the state space of the game, whatever the q backend
+                    self.agent = LinearAgent(n_actions, args, self.game_env.get_state_space(), self.game_env.get_feature_intervals())
+                elif self.agent_type == Agent.DYNA_Q:
+                    # planning is vectorized over a dense q table, whatever the q backend
+                    self.agent = DynaQAgent(n_actions, args, self.game_env.get_state_space())
                 else:
                     return False
             return True
@@ -162,6 +177,7 @@ class AbstractRunner(ABC):
         Args:
             output_dir (str): the output directory for plots
         """
+        from casino.plotting import plotlib # imported lazily, matplotlib is slow to import
         fname = os.path.join(output_dir, varia.VAL_FUNC_PLOT_NAME)
         if self.game_type == Games.EASY21:
             plotlib.plot_two_dim_value_func(self.agent.policy_func, Games.EASY21.name, 
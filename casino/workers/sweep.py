@@ -0,0 +1,208 @@
+from casino.agents.qlearn import load_opt_q
+from casino.api.cli import argparser
+from casino.workers.gamerunner import GamePlayer
+from casino.util.env import varia
+
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import csv
+import datetime
+import itertools
+import json
+import logging
+import multiprocessing as mp
+import os
+import shutil
+import time
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SUMMARY_COLUMNS = ["index", "agent", "config", "session_dir", "final_mse", "mean_reward", "wall_seconds", "episodes_per_sec"]
+
+def load_spec(path: str) -> dict:
+    """Load a sweep spec, a json file of the form:
+
+        {
+            "name": "eps_sweep",                   # optional, defaults to the file name
+            "search": "grid",                      # or "random"
+            "n_samples": 20,                       # the number of random configs
+            "seed": 0,                             # the seed for sampling the random configs
+            "base": {"n_episodes": 10000, "q_backend": "dense", "opt_q_path": "data/<session>"},
+            "params": {
+                "agent": ["monte", "sarsa", "qlearn"],
+                "eps_const": [10, 100, 1000],       # a list of values to choose from
+                "gamma": {"low": 0.9, "high": 1.0}  # or a range to sample uniformly from, random search only
+            }
+        }
+
+    The keys of base and params are the names of the options of tr and of its agents.
+    An option of base is left out of the configs whose agent does not have it, when another agent of the sweep does,
+    i.e. opt_q_path in the example above only applies to sarsa and qlearn.
+
+    Args:
+        path (str): the path of the spec
+
+    Returns:
+        dict: the spec
+    """
+    with open(path, "r") as f:
+        spec = json.load(f)
+    spec.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    spec.setdefault("search", "grid")
+    spec.setdefault("base", {})
+    return spec
+
+def get_configs(spec: dict) -> list:
+    """Get the configs of a sweep, the same on every call for the same spec
+
+    Args:
+        spec (dict): the sweep spec, see load_spec
+
+    Returns:
+        list: the configs, as dicts of option values
+    """
+    params = spec["params"]
+    if spec["search"] == "grid":
+        names = list(params.keys())
+        configs = [dict(spec["base"], **dict(zip(names, values))) for values in itertools.product(*[params[name] for name in names])]
+        return drop_other_agent_options(configs, [name for name in spec["base"] if name not in params])
+    if spec["search"] == "random":
+        rng = np.random.default_rng(spec.get("seed", 0))
+        configs = []
+        for _ in range(spec["n_samples"]):
+            config = dict(spec["base"])
+            for name, values in params.items():
+                if isinstance(values, dict):
+                    value = rng.uniform(values["low"], values["high"])
+                    config[name] = int(round(value)) if values.get("integer", False) else float(value)
+                else:
+                    config[name] = values[rng.integers(len(values))]
+            configs.append(config)
+        return drop_other_agent_options(configs, [name for name in spec["base"] if name not in params])
+    raise ValueError(f"Unknown search [{spec['search']}]! Expecting one of [grid, random].")
+
+def drop_other_agent_options(configs: list, base_names: list) -> list:
+    """Leave the options of the base out of the configs whose agent does not have them, when another agent of the configs does.
+    Options no agent has are kept, for get_train_args to reject.
+
+    Args:
+        configs (list): the configs
+        base_names (list): the names of the options set by the base only
+
+    Returns:
+        list: the configs
+    """
+    agents = {config["agent"] for config in configs if "agent" in config}
+    agent_options = {agent: set(vars(argparser.get_cmdl_args(["tr", agent], ""))) for agent in agents}
+    sweep_options = set().union(*agent_options.values())
+    for config in configs:
+        options = agent_options.get(config.get("agent"), sweep_options)
+        for name in base_names:
+            if name not in options and name in sweep_options:
+                del config[name]
+    return configs
+
+def get_config_key(config: dict) -> str:
+    return json.dumps(config, sort_keys=True)
+
+def get_train_args(config: dict):
+    """Get the arguments of tr for a config, with the defaults of the cli for the options the config leaves out
+
+    Raises:
+        ValueError: raised if the config has an option that tr or its agent does not have
+    """
+    args = argparser.get_cmdl_args(["tr", config["agent"]], "")
+    for name, value in config.items():
+        if not hasattr(args, name):
+            raise ValueError(f"Unknown option [{name}] for agent [{config['agent']}]!")
+        setattr(args, name, value)
+    return args
+
+def run_config(index: int, config: dict, base_dir: str) -> dict:
+    """Train a config into a session of the data dir, as tr would
+
+    Args:
+        index (int): the index of the config in the sweep
+        config (dict): the config
+        base_dir (str): the base directory of casino
+
+    Returns:
+        dict: the summary row of the run
+    """
+    args = get_train_args(config)
+    session_start = f"{datetime.datetime.now().strftime('%Y%m%d%H%M%S%f')}_{config['agent']}_{index}"
+    start = time.perf_counter()
+    game = GamePlayer(base_dir, session_start, args)
+    game.setup()
+    game.train_session()
+    wall_seconds = time.perf_counter() - start
+
+    mse = getattr(game.agent, "mse", None)
+    return {
+        "index": index,
+        "agent": config["agent"],
+        "config": get_config_key(config),
+        "session_dir": game.output_dir,
+        "final_mse": mse.last if mse is not None and len(mse) > 0 else "",
+        "mean_reward": game.agent.cumulative_episodic_rewards.mean,
+        "wall_seconds": wall_seconds,
+        "episodes_per_sec": game.profiler.episodes_per_sec,
+    }
+
+def read_summary(path: str) -> list:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", newline="") as f:
+        return list(csv.DictReader(f))
+
+def run_sweep(base_dir: str, spec_path: str, n_workers: int = 1) -> str:
+    """Run the configs of a sweep across worker processes, each into its own session of the data dir,
+    appending a row per finished config to the summary table of the sweep. Configs already in the summary are skipped,
+    so an interrupted sweep continues where it stopped when it is run again.
+
+    Args:
+        base_dir (str): the base directory of casino
+        spec_path (str): the path of the sweep spec, see load_spec
+        n_workers (int): the number of worker processes. Set to 1 to run the configs in this process.
+
+    Returns:
+        str: the path of the summary table
+    """
+    spec = load_spec(spec_path)
+    sweep_dir = os.path.join(base_dir, varia.DATA_DIR, f"sweep_{spec['name']}")
+    if not os.path.exists(sweep_dir):
+        os.mkdir(sweep_dir)
+    shutil.copyfile(spec_path, os.path.join(sweep_dir, varia.SWEEP_SPEC_FNAME))
+    summary_path = os.path.join(sweep_dir, varia.SWEEP_SUMMARY_FNAME)
+
+    configs = get_configs(spec)
+    for config in configs:
+        get_train_args(config) # fail fast on unknown options
+    finished = set(row["config"] for row in read_summary(summary_path))
+    pending = [(index, config) for index, config in enumerate(configs) if get_config_key(config) not in finished]
+    logger.info(f"Sweep [{spec['name']}] has [{len(configs)}] configs, [{len(configs) - len(pending)}] already finished.")
+
+    # load the reference q functions once, before the workers are forked, so that they share them
+    for opt_q_path in set(config["opt_q_path"] for _, config in pending if config.get("opt_q_path")):
+        load_opt_q(opt_q_path)
+
+    is_new = not os.path.exists(summary_path)
+    with open(summary_path, "a", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=SUMMARY_COLUMNS)
+        if is_new:
+            writer.writeheader()
+        def write_row(row: dict):
+            writer.writerow(row)
+            f.flush()
+            logger.info(f"Finished config [{row['index']}] of sweep [{spec['name']}]: {row}")
+
+        if n_workers <= 1:
+            for index, config in pending:
+                write_row(run_config(index, config, base_dir))
+        else:
+            with ProcessPoolExecutor(max_workers=n_workers, mp_context=mp.get_context()) as pool:
+                futures = [pool.submit(run_config, index, config, base_dir) for index, config in pending]
+                for future in as_completed(futures):
+                    write_row(future.result())
+    logger.info(f"Saved the summary of sweep [{spec['name']}] @ path {summary_path}.")
+    return summary_path
@@ -0,0 +1,57 @@
+import argparse
+import unittest
+import numpy as np
+from casino.agents.monte import MonteCarlo
+from casino.agents.sampler import EpsilonGreedySampler
+from casino.environments.easy21.easy21 import Easy21
+
+class TestAbstractAgent(unittest.TestCase):
+    def setUp(self):
+        self.env = Easy21()
+        self.args = argparse.Namespace(policy=0, eps_const=100, gamma=1.0, visit_mode="every")
+        self.agent = MonteCarlo(2, self.args)
+        self.n_episodes = 500
+
+    def test_incremental_policy(self):
+        """Expecting the incrementally maintained policy to match a full rebuild of the greedy policy
+        """
+        for i in range(self.n_episodes):
+            self.agent.train_episode(self.env, i)
+        for state, action in self.agent.policy_func.items():
+            self.assertEqual(action, np.argmax(self.agent.q_func[state]))
+
+    def test_policy_flips(self):
+        self.agent.set_q_value((1, 10), 1, 1.0)
+        self.agent.set_q_value((1, 10), 0, 0.5)
+        self.assertEqual(self.agent.n_policy_flips, 0)
+        self.agent.set_q_value((1, 10), 0, 2.0)
+        self.assertEqual(self.agent.n_policy_flips, 1)
+        self.assertEqual(self.agent.policy_func[(1, 10)], 0)
+
+    def test_optimal_action(self):
+        """Expecting the greedy action rather than the greedy value, without counting a visit
+        """
+        self.agent.set_q_value((1, 10), 1, -0.5)
+        self.agent.set_q_value((1, 10), 0, -0.7)
+        self.assertEqual(self.agent.get_optimal_action((1, 10)), 1)
+        self.assertEqual(self.agent.get_state_visit_count((1, 10)), 0)
+
+    def test_epsilon_greedy_sampler(self):
+        """Expecting the greedy action to be sampled with probability 1 - epsilon + epsilon/n_actions
+        """
+        sampler = EpsilonGreedySampler(2, seed=0, buffer_size=100)
+        epsilon = 0.3
+        actions = [sampler.sample(1, epsilon) for _ in range(20000)]
+        self.assertAlmostEqual(np.mean(actions), 1 - epsilon + epsilon/2, delta=0.02)
+
+    def test_epsilon_has_no_side_effect(self):
+        state = (4, 12)
+        epsilon = self.agent.get_epsilon(state)
+        self.assertEqual(epsilon, self.agent.get_epsilon(state))
+        self.assertEqual(self.agent.get_state_visit_count(state), 0)
+        self.agent.visit_state(state)
+        self.assertEqual(self.agent.get_state_visit_count(state), 1)
+        self.assertLess(self.agent.get_epsilon(state), epsilon)
+
+if __name__ == "__main__":
+    unittest.main()
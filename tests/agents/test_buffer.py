@@ -0,0 +1,46 @@
+import unittest
+import numpy as np
+from casino.agents.buffer import EpisodeBuffer, TransitionBuffer
+
+class TestEpisodeBuffer(unittest.TestCase):
+    def setUp(self):
+        self.buffer = EpisodeBuffer(capacity=2)
+        self.rewards = [0, 0, 1, -1, 0, 1, 0]
+        for i, reward in enumerate(self.rewards):
+            self.buffer.add((1, i), i % 2, reward)
+
+    def test_grow(self):
+        self.assertEqual(len(self.buffer), len(self.rewards))
+        self.assertEqual(self.buffer.capacity, 8)
+        self.assertEqual(self.buffer.get_states(), [(1, i) for i in range(len(self.rewards))])
+        self.assertEqual(self.buffer.get_actions(), [i % 2 for i in range(len(self.rewards))])
+
+    def test_compute_returns(self):
+        """Expecting the reverse pass returns to match the discounted sum of the rewards from every step
+        """
+        for gamma in [1.0, 0.9, 0.5]:
+            expected = [sum(gamma**n * r for n, r in enumerate(self.rewards[i:])) for i in range(len(self.rewards))]
+            self.assertTrue(np.allclose(self.buffer.compute_returns(gamma), expected))
+
+    def test_clear(self):
+        self.buffer.clear()
+        self.buffer.add((2, 5), 1, 1)
+        self.assertEqual(self.buffer.get_states(), [(2, 5)])
+        self.assertTrue(np.array_equal(self.buffer.compute_returns(1.0), [1]))
+
+class TestTransitionBuffer(unittest.TestCase):
+    def test_ring(self):
+        """Expecting the oldest transitions to be overwritten once the buffer is full
+        """
+        buffer = TransitionBuffer(capacity=4, seed=0)
+        for i in range(6):
+            buffer.add(i, i % 2, float(i), i + 1)
+        self.assertEqual(len(buffer), 4)
+        states, actions, rewards, next_states = buffer.sample(100)
+        self.assertEqual(sorted(set(states.tolist())), [2, 3, 4, 5])
+        self.assertTrue(np.array_equal(actions, states % 2))
+        self.assertTrue(np.array_equal(rewards, states))
+        self.assertTrue(np.array_equal(next_states, states + 1))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+import argparse
+import tempfile
+import unittest
+import numpy as np
+from casino.agents.dyna import DynaQAgent
+from casino.agents.qlearn import QLearningAgent, compute_mse
+from casino.environments.easy21.easy21 import Easy21
+from casino.solvers import easy21dp
+
+class TestDynaQ(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        easy21dp.solve_to_disk(cls.tmp_dir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def setUp(self):
+        self.state_space = Easy21().get_state_space()
+
+    def train(self, agent_class, n_planning, n_episodes=2000):
+        args = argparse.Namespace(policy=0, eps_const=100, gamma=1.0, opt_q_path=self.tmp_dir.name, mse_every=1,
+                                  mse_sample_size=0, n_planning=n_planning, model_capacity=1000)
+        agent = agent_class(2, args, self.state_space)
+        agent.set_seed(5)
+        env = Easy21(seed=5)
+        for i in range(n_episodes):
+            agent.train_episode(env, i)
+        return agent
+
+    def test_no_planning_is_q_learning(self):
+        dyna = self.train(DynaQAgent, 0)
+        q_learn = self.train(QLearningAgent, 0)
+        self.assertTrue(np.array_equal(dyna.q_func.values, q_learn.q_func.values))
+        self.assertEqual(len(dyna.model), 1000)
+
+    def test_planning(self):
+        """Expecting the planning updates to keep the greedy policy and the running mse up to date
+        """
+        agent = self.train(DynaQAgent, 10)
+        self.assertGreater(agent.n_planned.sum(), 0)
+        self.assertAlmostEqual(agent.mse.last, compute_mse(agent.opt_q, agent.q_func), places=9)
+        for state, action in agent.policy_func.items():
+            self.assertEqual(action, np.argmax(agent.q_func[state]))
+
+if __name__ == "__main__":
+    unittest.main()
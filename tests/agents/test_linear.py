@@ -0,0 +1,68 @@
+import argparse
+import os
+import tempfile
+import unittest
+import numpy as np
+from casino.agents.features import coarse_code
+from casino.agents.linear import LinearAgent
+from casino.agents.qlearn import compute_mse
+from casino.agents.qtable import LinearQTable
+from casino.environments.easy21.easy21 import Easy21
+from casino.solvers import easy21dp
+from casino.util.env import varia
+
+class TestCoarseCode(unittest.TestCase):
+    def setUp(self):
+        self.env = Easy21()
+        self.state_space = self.env.get_state_space()
+        self.features = coarse_code(self.state_space, 2, self.env.get_feature_intervals())
+
+    def test_features(self):
+        self.assertEqual(self.features.shape, (len(self.state_space), 2, 36))
+        self.assertEqual(self.features[self.state_space.index((4, 10))].sum(axis=1).tolist(), [4, 4]) # 2 dealer x 2 player intervals
+        self.assertEqual(self.features[self.state_space.index((1, 1)), 1].nonzero()[0].tolist(), [18])
+        self.assertEqual(self.features[self.state_space.index((0, 0))].sum(), 0)
+
+    def test_fit(self):
+        """Expecting a q function that is linear in the features to be fit exactly
+        """
+        q_table = LinearQTable(self.state_space, self.features)
+        q_table.weights = np.random.default_rng(0).uniform(-1, 1, 36)
+        fitted = LinearQTable(self.state_space, self.features)
+        fitted.update({state: q_table[state] for state in self.state_space.states})
+        self.assertTrue(np.allclose(fitted.values, q_table.values))
+
+class TestLinearAgent(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        easy21dp.solve_to_disk(self.tmp_dir.name)
+        self.env = Easy21(seed=4)
+        args = argparse.Namespace(policy=0, eps_const=100, gamma=1.0, alpha=0.01, lam=0.5, opt_q_path=self.tmp_dir.name, mse_every=100)
+        self.agent = LinearAgent(2, args, self.env.get_state_space(), self.env.get_feature_intervals())
+        self.agent.set_seed(4)
+
+    def tearDown(self):
+        self.agent.close_metrics()
+        self.tmp_dir.cleanup()
+
+    def get_error(self) -> float:
+        values = self.agent.q_func.values
+        return sum(np.sum((values[self.agent.state_space.index(state)] - self.agent.opt_q[state])**2) for state in self.agent.opt_q)
+
+    def test_train(self):
+        for i in range(3001): # the mse is evaluated at the last episode
+            self.agent.train_episode(self.env, i)
+            if i == 100:
+                early_error = self.get_error()
+        self.assertAlmostEqual(self.agent.mse.last, compute_mse(self.agent.opt_q, self.agent.q_func), places=9)
+        self.assertLess(self.get_error(), early_error)
+
+        output_dir = os.path.join(self.tmp_dir.name, "session")
+        os.mkdir(output_dir)
+        self.agent.save_training_data(output_dir, self.agent.cumulative_episodic_rewards)
+        self.assertTrue(np.array_equal(np.load(os.path.join(output_dir, varia.LINEAR_WEIGHTS_FNAME)), self.agent.q_func.weights))
+        for state, action in self.agent.policy_func.items():
+            self.assertEqual(action, np.argmax(self.agent.q_func[state]))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+import argparse
+import os
+import tempfile
+import unittest
+import numpy as np
+from casino.agents.qlearn import MseTracker, QLearningAgent, SarsaAgent, compute_mse
+from casino.environments.easy21.easy21 import Easy21
+from casino.io import disk
+
+class TestMseTracker(unittest.TestCase):
+    def setUp(self):
+        self.env = Easy21()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.opt_q_path = os.path.join(self.tmp_dir.name, "qfunc.json")
+        rng = np.random.default_rng(0)
+        opt_q = {(dealer, player): rng.uniform(-1, 1, 2) for dealer in range(1, 11) for player in range(1, 22)}
+        disk.write_dict_as_json(self.opt_q_path, opt_q, str, list) # (0, 0) is left out on purpose
+        self.n_episodes = 300
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def get_args(self, mse_every=1, mse_sample_size=0):
+        return argparse.Namespace(policy=0, eps_const=100, gamma=1.0, opt_q_path=self.opt_q_path,
+                                  mse_every=mse_every, mse_sample_size=mse_sample_size)
+
+    def test_running_mse_matches_full(self):
+        """Expecting the running MSE to match a full sweep of the q function after every episode, with either backend
+        """
+        for agent_class in [SarsaAgent, QLearningAgent]:
+            for state_space in [None, self.env.get_state_space()]:
+                agent = agent_class(2, self.get_args(), state_space)
+                for i in range(self.n_episodes):
+                    agent.train_episode(self.env, i)
+                    self.assertAlmostEqual(agent.mse.last, compute_mse(agent.opt_q, agent.q_func), places=9)
+                self.assertEqual(agent.mse_episodes.values().tolist(), list(range(self.n_episodes)))
+
+    def test_running_total_does_not_drift(self):
+        """Expecting the compensated running total to match a full sweep after many updates of errors of very different sizes,
+        without resyncing
+        """
+        rng = np.random.default_rng(1)
+        opt_q = {(i, 0): np.zeros(2) for i in range(100)}
+        q = {state: np.zeros(2) for state in opt_q}
+        tracker = MseTracker(opt_q, resync_every=10**9)
+        for _ in range(20000):
+            states = [(int(i), 0) for i in rng.integers(100, size=4)]
+            for state in states:
+                q[state] = rng.uniform(-1, 1, 2) * 10.0**rng.integers(-6, 8)
+            tracker.touch(states)
+            mse = tracker.compute(q)
+        self.assertEqual(tracker.n_evaluations, 20000)
+        self.assertAlmostEqual(mse / compute_mse(opt_q, q), 1.0, places=14)
+
+    def test_sampled_mse(self):
+        """Expecting a sample as large as the touched states to give the full mse
+        """
+        agent = QLearningAgent(2, self.get_args(mse_sample_size=1000))
+        for i in range(self.n_episodes):
+            agent.train_episode(self.env, i)
+        self.assertEqual(set(agent.mse_tracker.candidates), {state for state in agent.q_func if state in agent.opt_q})
+        self.assertAlmostEqual(agent.mse.last, compute_mse(agent.opt_q, agent.q_func), places=9)
+
+    def test_mse_every(self):
+        agent = QLearningAgent(2, self.get_args(mse_every=50))
+        for i in range(self.n_episodes):
+            agent.train_episode(self.env, i)
+        self.assertEqual(agent.mse_episodes.values().tolist(), list(range(0, self.n_episodes, 50)))
+
+class TestVisitCounts(unittest.TestCase):
+    def test_every_acted_state_is_visited(self):
+        """Expecting the serial training loops to count a visit to every state an action is taken in, as learn_trajectory does
+        """
+        args = argparse.Namespace(policy=0, eps_const=100, gamma=1.0, opt_q_path=None, mse_every=1, mse_sample_size=0)
+        for agent_class in [SarsaAgent, QLearningAgent]:
+            env = Easy21(seed=5)
+            agent = agent_class(2, args)
+            for i in range(100):
+                agent.train_episode(env, i)
+            self.assertEqual(sum(agent.get_visit_counts().values()), sum(agent.n_state_action_visits.values()))
+
+if __name__ == "__main__":
+    unittest.main()
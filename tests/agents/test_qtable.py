@@ -0,0 +1,67 @@
+import argparse
+import unittest
+import numpy as np
+from casino.agents.monte import MonteCarlo
+from casino.agents.qlearn import QLearningAgent, SarsaAgent
+from casino.agents.qtable import DenseQTable
+from casino.agents.tdlambda import QLambdaAgent, SarsaLambdaAgent
+from casino.environments.easy21.easy21 import Easy21
+
+class TestDenseQTable(unittest.TestCase):
+    def setUp(self):
+        self.env = Easy21()
+        self.state_space = self.env.get_state_space()
+        self.args = argparse.Namespace(policy=0, eps_const=100, gamma=1.0, visit_mode="every")
+        self.n_episodes = 200
+
+    def test_state_space(self):
+        self.assertEqual(len(self.state_space), 10*21 + 1)
+        self.assertEqual(self.state_space.state(self.state_space.index((0, 0))), (0, 0))
+        self.assertTrue(np.array_equal(self.state_space.indices(np.array([(1, 1), (10, 21)])), [0, 10*21 - 1]))
+        with self.assertRaises(KeyError):
+            self.state_space.index((0, 5))
+
+    def test_rows_are_writable(self):
+        q_func = DenseQTable(self.state_space, 2)
+        q_func[(3, 12)][1] += 0.5
+        self.assertEqual(q_func[(3, 12)][1], 0.5)
+        self.assertEqual(q_func.keys(), []) # reads do not make keys
+        q_func[(4, 12)] = [1.0, 0.0]
+        self.assertEqual(q_func.keys(), [(4, 12)])
+
+    def test_visited_states_are_keys(self):
+        visits = np.zeros(len(self.state_space), dtype=np.int64)
+        q_func = DenseQTable(self.state_space, 2, visits)
+        visits[self.state_space.index((5, 20))] += 1
+        self.assertIn((5, 20), q_func)
+        self.assertEqual(q_func.keys(), [(5, 20)])
+
+    def test_matches_dict_backend(self):
+        """Expecting the dense and dict backends to train identical q functions from the same seed
+        """
+        self.assert_backends_match(MonteCarlo, self.args)
+
+    def test_td_agents_match_dict_backend(self):
+        args = argparse.Namespace(policy=0, eps_const=100, gamma=1.0, opt_q_path=None, mse_every=1, mse_sample_size=0,
+            lam=0.5, trace_type="accumulating")
+        for agent_class in [SarsaAgent, QLearningAgent, SarsaLambdaAgent, QLambdaAgent]:
+            with self.subTest(agent=agent_class.__name__):
+                self.assert_backends_match(agent_class, args)
+
+    def assert_backends_match(self, agent_class, args):
+        q_funcs = []
+        for state_space in [None, self.state_space]:
+            env = Easy21(seed=7)
+            agent = agent_class(2, args, state_space)
+            agent.set_seed(7)
+            for i in range(self.n_episodes):
+                agent.train_episode(env, i)
+            q_funcs.append(agent.q_func)
+
+        # the dict backend also makes a key of the terminal state, which the TD agents read but never visit
+        self.assertEqual(set(q_funcs[0].keys()) - {(0, 0)}, set(q_funcs[1].keys()))
+        for state, q_value in q_funcs[0].items():
+            self.assertTrue(np.array_equal(q_value, q_funcs[1][state]))
+
+if __name__ == "__main__":
+    unittest.main()
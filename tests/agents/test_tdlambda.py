@@ -0,0 +1,111 @@
+import argparse
+import tempfile
+import unittest
+import numpy as np
+from casino.agents.qlearn import QLearningAgent
+from casino.agents.tdlambda import QLambdaAgent, SarsaLambdaAgent
+from casino.agents.traces import EligibilityTraces
+from casino.environments.easy21.easy21 import Easy21
+from casino.solvers import easy21dp
+
+class TestEligibilityTraces(unittest.TestCase):
+    def test_visit_and_decay(self):
+        traces = EligibilityTraces(replacing=False, capacity=2)
+        traces.visit((1, 1), 0, 0.5)
+        traces.decay(0.5)
+        traces.visit((1, 1), 0, 0.25)
+        traces.visit((1, 2), 1, 1.0)
+        traces.visit((1, 3), 1, 1.0) # grows past the capacity
+        self.assertEqual(len(traces), 3)
+        self.assertEqual(traces.steps(), [((1, 1), 0, 0.25 * 1.5), ((1, 2), 1, 1.0), ((1, 3), 1, 1.0)])
+        traces.clear()
+        self.assertEqual(traces.steps(), [])
+
+    def test_replacing(self):
+        traces = EligibilityTraces(replacing=True)
+        traces.visit((1, 1), 0, 1.0)
+        traces.visit((1, 1), 0, 1.0)
+        self.assertEqual(traces.steps(), [((1, 1), 0, 1.0)])
+
+class TestTdLambda(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp_dir = tempfile.TemporaryDirectory()
+        easy21dp.solve_to_disk(cls.tmp_dir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp_dir.cleanup()
+
+    def get_args(self, lam):
+        return argparse.Namespace(policy=0, eps_const=100, gamma=1.0, opt_q_path=self.tmp_dir.name, mse_every=100,
+                                  mse_sample_size=0, lam=lam, trace_type="replacing")
+
+    def train(self, agent_class, lam, n_episodes=2000, state_space=None):
+        agent = agent_class(2, self.get_args(lam), state_space)
+        agent.set_seed(1)
+        env = Easy21(seed=1)
+        for i in range(n_episodes):
+            agent.train_episode(env, i)
+        return agent
+
+    def get_error(self, agent) -> float:
+        return sum(np.sum((agent.q_func[state] - agent.opt_q[state])**2) for state in agent.opt_q)
+
+    def test_zero_lambda_is_q_learning(self):
+        """Expecting Q(0) to make exactly the one step q learning updates
+        """
+        q_lambda = self.train(QLambdaAgent, 0.0)
+        q_learn = self.train(QLearningAgent, 0.0)
+        self.assertEqual(q_lambda.mse.values().tolist(), q_learn.mse.values().tolist())
+        for state, q_value in q_lambda.q_func.items():
+            self.assertTrue(np.array_equal(q_value, q_learn.q_func[state]))
+
+    def test_learns(self):
+        env = Easy21(seed=3)
+        for agent_class in [SarsaLambdaAgent, QLambdaAgent]:
+            for state_space in [None, env.get_state_space()]:
+                agent = agent_class(2, self.get_args(0.9), state_space)
+                agent.set_seed(3)
+                for i in range(6000):
+                    agent.train_episode(env, i)
+                    if i == 3000:
+                        halfway_error = self.get_error(agent)
+                self.assertLess(self.get_error(agent), halfway_error)
+                self.assertEqual(len(agent.traces), 0) # the traces do not outlive their episode
+                for state, action in agent.policy_func.items():
+                    self.assertEqual(action, np.argmax(agent.q_func[state]))
+
+    def test_learn_trajectory(self):
+        """Expecting learning from a trajectory to match training on the same episodes
+        """
+        trained = SarsaLambdaAgent(2, self.get_args(0.9))
+        learner = SarsaLambdaAgent(2, self.get_args(0.9))
+        env = RecordingEasy21(seed=2)
+        for i in range(20):
+            trained.train_episode(env, i)
+            states, actions, rewards, final_state = env.get_trajectory()
+            learner.learn_trajectory(states, actions, rewards, final_state, i)
+        for state, q_value in trained.q_func.items():
+            self.assertTrue(np.array_equal(q_value, learner.q_func[state]))
+
+class RecordingEasy21(Easy21):
+    """Easy21 recording the trajectory of its current episode
+    """
+    def reset(self):
+        self.state = super().reset()
+        self.steps = []
+        return self.state
+
+    def step(self, action):
+        next_state, reward, terminal = super().step(action)
+        self.steps.append((self.state, action, reward))
+        self.state = next_state
+        return next_state, reward, terminal
+
+    def get_trajectory(self) -> tuple:
+        states, actions, rewards = (list(values) for values in zip(*self.steps))
+        return states, actions, rewards, self.state
+
+if __name__ == "__main__":
+    unittest.main()
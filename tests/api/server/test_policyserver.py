@@ -0,0 +1,91 @@
+import asyncio
+import json
+import unittest
+import numpy as np
+from casino.api.server.policyserver import PolicyServer, ServerStoppedError
+from casino.environments.easy21.easy21 import Easy21
+
+class TestPolicyServer(unittest.TestCase):
+    def setUp(self):
+        self.state_space = Easy21().get_state_space()
+        self.policy = np.random.default_rng(0).integers(2, size=len(self.state_space))
+        self.n_clients = 4
+        self.n_queries = 200
+
+    def get_action(self, state) -> int:
+        return int(self.policy[self.state_space.index(tuple(state))])
+
+    async def request(self, reader, writer, request: dict) -> dict:
+        writer.write((json.dumps(request) + "\n").encode())
+        await writer.drain()
+        return json.loads(await reader.readline())
+
+    async def run_client(self, port: int, client_id: int) -> bool:
+        """Pipeline all the queries before reading the responses, which may come back in any order
+        """
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        rng = np.random.default_rng(client_id)
+        states = {i: [int(rng.integers(1, 11)), int(rng.integers(1, 22))] for i in range(self.n_queries)}
+        for i, state in states.items():
+            writer.write((json.dumps({"id": i, "state": state}) + "\n").encode())
+        await writer.drain()
+        for _ in range(self.n_queries):
+            response = json.loads(await reader.readline())
+            self.assertEqual(response["action"], self.get_action(states[response["id"]]))
+        writer.close()
+        await writer.wait_closed()
+        return True
+
+    def test_serve(self):
+        async def main():
+            server = PolicyServer(self.policy, self.state_space, max_batch=64, max_delay=0.001)
+            await server.start("127.0.0.1", 0)
+            try:
+                results = await asyncio.gather(*[self.run_client(server.port, client_id) for client_id in range(self.n_clients)])
+                self.assertTrue(all(results))
+
+                reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+                states = [[1, 1], [10, 21], [0, 0], [5, 12]]
+                response = await self.request(reader, writer, {"id": "batch", "states": states})
+                self.assertEqual(response, {"id": "batch", "actions": [self.get_action(state) for state in states]})
+                response = await self.request(reader, writer, {"id": 7, "state": [11, 3]})
+                self.assertEqual(response["id"], 7)
+                self.assertIn("outside of the state space", response["error"])
+                response = await self.request(reader, writer, {"id": 8, "state": "bad"})
+                self.assertIn("error", response)
+                response = await self.request(reader, writer, {"id": 9, "state": [3]})
+                self.assertEqual(response["id"], 9)
+                self.assertIn("error", response)
+                response = await self.request(reader, writer, {"id": 10, "state": [1, 2, 3]})
+                self.assertIn("error", response)
+
+                stats = (await self.request(reader, writer, {"cmd": "stats"}))["stats"]
+                self.assertEqual(stats["n_requests"], self.n_clients * self.n_queries + 5)
+                self.assertGreater(stats["mean_batch_size"], 1) # the pipelined queries were batched
+                self.assertLessEqual(stats["latency_us"]["p50"], stats["latency_us"]["p99"])
+                writer.close()
+                await writer.wait_closed()
+            finally:
+                await server.stop()
+        asyncio.run(main())
+
+    def test_stop_fails_pending_queries(self):
+        """Expecting stop to await the batcher and fail the queries still waiting, instead of leaving them pending
+        """
+        async def main():
+            server = PolicyServer(self.policy, self.state_space, max_delay=10.0) # the batcher waits on the first query
+            await server.start("127.0.0.1", 0)
+            queries = [asyncio.create_task(server.query(np.array([[1, 1]]))) for _ in range(3)]
+            await asyncio.sleep(0.01) # batched, the batcher sleeps on them
+            queries += [asyncio.create_task(server.query(np.array([[2, 2]]))) for _ in range(2)]
+            await asyncio.sleep(0) # queued behind the sleeping batcher
+            self.assertEqual(server.queue.qsize(), 2)
+            await server.stop()
+            self.assertTrue(server.batcher.done())
+            for query in queries:
+                with self.assertRaises(ServerStoppedError):
+                    await query
+        asyncio.run(main())
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,21 @@
+import unittest
+from benchmarks import bench
+
+class TestBench(unittest.TestCase):
+    def make_run(self, seconds: dict) -> dict:
+        return {"results": {key: {"seconds": value, "n_ops": 1, "ops_per_sec": 1 / value} for key, value in seconds.items()}}
+
+    def test_compare(self):
+        """Expecting only the cases slower than the baseline by more than the tolerance to be flagged
+        """
+        baseline = self.make_run({"a": 1.0, "b": 1.0, "c": 1.0})
+        run = self.make_run({"a": 0.5, "b": 1.2, "c": 1.3, "d": 9.0})
+        self.assertEqual(bench.compare(run, baseline, 0.25), ["c"])
+
+    def test_run_benchmarks(self):
+        run = bench.run_benchmarks("compute_mse", repeat=1)
+        self.assertEqual(len(run["results"]), 3)
+        self.assertTrue(all(result["seconds"] > 0 for result in run["results"].values()))
+
+if __name__ == "__main__":
+    unittest.main()
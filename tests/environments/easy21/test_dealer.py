@@ -0,0 +1,44 @@
+import unittest
+import numpy as np
+from casino.environments.easy21.easy21 import Easy21
+from casino.environments.easy21.dealer import BUST
+from casino.models.cards.card import Card
+from casino.models.cards.color import Color
+
+class TestFastDealer(unittest.TestCase):
+    def setUp(self):
+        self.env = Easy21(seed=17)
+        self.fast_env = Easy21(fast_dealer=True, seed=18)
+        self.n_games = 3000
+        self.tolerance = 0.05 # on the total variation distance between the outcome distributions
+
+    def get_outcomes(self, env: Easy21, play_dealer, first_card: int) -> np.ndarray:
+        counts = np.zeros(BUST + 1)
+        for _ in range(self.n_games):
+            env.reset()
+            env.dealer.reset(Card(Color.BLACK, first_card))
+            play_dealer(env)
+            counts[BUST if env.dealer.isbust() else env.dealer.score] += 1
+        return counts / self.n_games
+
+    def test_statistically_equivalent(self):
+        """Expecting the sampled dealer outcomes to follow the same distribution as playing the dealer card by card
+        """
+        for first_card in range(1, 11):
+            outcomes = self.get_outcomes(self.env, Easy21.play_dealer, first_card)
+            fast_outcomes = self.get_outcomes(self.fast_env, Easy21.play_dealer_fast, first_card)
+            distance = 0.5 * np.abs(outcomes - fast_outcomes).sum()
+            msg = f"Expecting the outcome distributions for first card [{first_card}] to be within [{self.tolerance}]!"
+            self.assertLess(distance, self.tolerance, msg=msg)
+
+    def test_rewards_match(self):
+        rewards = []
+        fast_rewards = []
+        for env, results in [(self.env, rewards), (self.fast_env, fast_rewards)]:
+            for _ in range(self.n_games):
+                env.reset()
+                results.append(env.step(0)[1])
+        self.assertAlmostEqual(np.mean(rewards), np.mean(fast_rewards), delta=self.tolerance)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+import numpy as np
+from casino.environments.easy21.easy21 import Easy21
+from casino.environments.easy21.veceasy21 import VecEasy21
+from casino.environments.easy21.player import Action
+
+class TestVecEasy21(unittest.TestCase):
+    def setUp(self):
+        self.n_games = 5000
+        self.env = VecEasy21(self.n_games, seed=21)
+        self.threshold = 15 # hit below this score, stick otherwise
+        self.tolerance = 0.05
+
+    def test_reset_batch(self):
+        states = self.env.reset_batch()
+        self.assertEqual(states.shape, (self.n_games, 2))
+        self.assertTrue(np.all(states >= 1) and np.all(states <= 10))
+        self.assertFalse(np.any(self.env.isterminal()))
+
+    def test_step_batch_auto_reset(self):
+        self.env.reset_batch()
+        states, rewards, terminals = self.env.step_batch(np.full(self.n_games, Action.STICK.value))
+        self.assertTrue(np.all(terminals))
+        self.assertTrue(np.all(states == 0))
+        self.assertTrue(set(np.unique(rewards)) <= {-1, 0, 1})
+        self.assertFalse(np.any(self.env.isterminal()))
+
+    def test_matches_easy21(self):
+        """Expecting the average reward of a fixed policy to match the single game environment
+        """
+        states = self.env.reset_batch()
+        vec_rewards = np.zeros(self.n_games)
+        while not np.all(self.env.isterminal()):
+            actions = np.where(states[:, 1] < self.threshold, Action.HIT.value, Action.STICK.value)
+            states, rewards, _ = self.env.step_batch(actions, auto_reset=False)
+            vec_rewards += rewards
+
+        env = Easy21(seed=21)
+        rewards = []
+        for _ in range(self.n_games):
+            state = env.reset()
+            terminal = False
+            while not terminal:
+                action = Action.HIT.value if state[1] < self.threshold else Action.STICK.value
+                state, reward, terminal = env.step(action)
+            rewards.append(reward)
+
+        msg = f"Expecting the mean rewards to be within [{self.tolerance}] of each other!"
+        self.assertAlmostEqual(np.mean(vec_rewards), np.mean(rewards), delta=self.tolerance, msg=msg)
+
+if __name__ == "__main__":
+    unittest.main()
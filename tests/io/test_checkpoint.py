@@ -0,0 +1,66 @@
+import argparse
+import os
+import tempfile
+import unittest
+import numpy as np
+from casino.agents.qlearn import QLearningAgent
+from casino.environments.easy21.easy21 import Easy21
+from casino.io import disk
+from casino.io.checkpoint import Checkpointer
+
+class TestCheckpointer(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.opt_q_path = os.path.join(self.tmp_dir.name, "qfunc.json")
+        rng = np.random.default_rng(0)
+        opt_q = {(dealer, player): rng.uniform(-1, 1, 2) for dealer in range(1, 11) for player in range(1, 22)}
+        disk.write_dict_as_json(self.opt_q_path, opt_q, str, list)
+        self.args = argparse.Namespace(policy=0, eps_const=100, gamma=1.0, opt_q_path=self.opt_q_path, mse_every=10, mse_sample_size=0)
+        self.n_episodes = 300
+        self.checkpoint_episode = 120
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_session(self, state_space):
+        env = Easy21(seed=5)
+        agent = QLearningAgent(env.n_actions, self.args, env.get_state_space() if state_space else None)
+        agent.set_seed(6)
+        return agent, env
+
+    def test_resume(self):
+        """Expecting a session resumed from a checkpoint to end up exactly where an uninterrupted session does,
+        even when the metrics were appended to after the checkpoint
+        """
+        for state_space in [False, True]:
+            agent, env = self.make_session(state_space)
+            for i in range(self.n_episodes):
+                agent.train_episode(env, i)
+
+            session_dir = tempfile.mkdtemp(dir=self.tmp_dir.name)
+            checkpointer = Checkpointer(session_dir, self.checkpoint_episode)
+            interrupted_agent, interrupted_env = self.make_session(state_space)
+            interrupted_agent.open_metrics(session_dir)
+            for i in range(self.checkpoint_episode + 30):
+                interrupted_agent.train_episode(interrupted_env, i)
+                if checkpointer.is_due(i):
+                    checkpointer.save(i + 1, interrupted_agent, interrupted_env)
+            interrupted_agent.close_metrics() # the metrics of the episodes after the checkpoint made it to disk before the crash
+
+            resumed_agent, resumed_env = self.make_session(state_space)
+            resumed_agent.open_metrics(session_dir)
+            start_episode = Checkpointer(session_dir, self.checkpoint_episode).load(resumed_agent, resumed_env)
+            self.assertEqual(start_episode, self.checkpoint_episode)
+            for i in range(start_episode, self.n_episodes):
+                resumed_agent.train_episode(resumed_env, i)
+
+            self.assertTrue(np.array_equal(resumed_agent.cumulative_episodic_rewards.values(), agent.cumulative_episodic_rewards.values()))
+            self.assertTrue(np.array_equal(resumed_agent.mse_episodes.values(), agent.mse_episodes.values()))
+            np.testing.assert_allclose(resumed_agent.mse.values(), agent.mse.values())
+            resumed_agent.close_metrics()
+            self.assertEqual(set(resumed_agent.q_func.keys()), set(agent.q_func.keys()))
+            for state, q_value in agent.q_func.items():
+                self.assertTrue(np.array_equal(resumed_agent.q_func[state], q_value))
+
+if __name__ == "__main__":
+    unittest.main()
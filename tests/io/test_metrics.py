@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import pandas as pd
+from casino.io.metrics import MetricSink
+
+class TestMetricSink(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "metric.bin")
+        self.values = np.random.default_rng(0).normal(size=1000)
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def assert_aggregates(self, sink, values):
+        self.assertEqual(len(sink), len(values))
+        self.assertAlmostEqual(sink.sum, values.sum(), places=9)
+        self.assertAlmostEqual(sink.mean, values.mean(), places=9)
+        self.assertEqual(sink.min, values.min())
+        self.assertEqual(sink.max, values.max())
+        self.assertEqual(sink.last, values[-1])
+
+    def test_append(self):
+        """Expecting the values to be read back across block boundaries, with matching running aggregates
+        """
+        for path in [None, self.path]:
+            sink = MetricSink(path, block_size=64)
+            for value in self.values:
+                sink.append(value)
+            self.assertTrue(np.array_equal(sink.values(), self.values))
+            self.assert_aggregates(sink, self.values)
+            sink.close()
+
+    def test_reopen_and_truncate(self):
+        sink = MetricSink(self.path, block_size=64)
+        for value in self.values:
+            sink.append(value)
+        sink.close()
+
+        sink = MetricSink(self.path, block_size=64)
+        self.assert_aggregates(sink, self.values)
+        sink.truncate(500)
+        sink.append(7.0)
+        expected = np.append(self.values[:500], 7.0)
+        self.assertTrue(np.array_equal(sink.values(), expected))
+        self.assert_aggregates(sink, expected)
+        sink.close()
+
+    def test_export_csv(self):
+        sink = MetricSink(block_size=64)
+        for value in self.values:
+            sink.append(value)
+        csv_path = os.path.join(self.tmp_dir.name, "metric.csv")
+        sink.export_csv(csv_path, "Value")
+        sink.close()
+        df = pd.read_csv(csv_path, index_col=0, float_precision="round_trip")
+        self.assertEqual(list(df.columns), ["Value"])
+        self.assertTrue(np.array_equal(df.index, np.arange(len(self.values))))
+        self.assertTrue(np.array_equal(df["Value"].to_numpy(), self.values))
+
+if __name__ == "__main__":
+    unittest.main()
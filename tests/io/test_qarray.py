@@ -0,0 +1,51 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from casino.io import disk, qarray
+from casino.util.env import varia
+
+class TestQArray(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.q_func = {(dealer, player): rng.uniform(-1, 1, 2) for dealer in range(1, 11) for player in range(1, 22)}
+        self.q_func[(0, 0)] = np.zeros(2)
+        self.policy_func = {state: int(np.argmax(q_value)) for state, q_value in self.q_func.items()}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def assert_same_q(self, q_func):
+        self.assertEqual(set(q_func.keys()), set(self.q_func.keys()))
+        for state, q_value in self.q_func.items():
+            self.assertTrue(np.array_equal(q_func[state], q_value))
+
+    def test_round_trip(self):
+        qarray.write_q_as_arrays(self.tmp_dir.name, self.q_func, self.policy_func)
+        for mmap in [True, False]:
+            q_func = qarray.read_q_as_arrays(self.tmp_dir.name, mmap)
+            self.assert_same_q(q_func)
+            self.assertEqual(q_func.get_policy(), self.policy_func)
+        self.assertNotIn((11, 1), q_func)
+
+    def test_convert_session(self):
+        """Expecting a json session to convert to arrays holding the same q function, and read_q to prefer the arrays
+        """
+        disk.write_dict_as_json(os.path.join(self.tmp_dir.name, varia.Q_FNAME), self.q_func, str, list)
+        disk.write_dict_as_json(os.path.join(self.tmp_dir.name, varia.POLICY_FNAME), self.policy_func, str, int)
+        self.assert_same_q(qarray.read_q(os.path.join(self.tmp_dir.name, varia.Q_FNAME)))
+        self.assertFalse(qarray.has_q_arrays(self.tmp_dir.name))
+
+        qarray.convert_session(self.tmp_dir.name)
+        q_func = qarray.read_q(self.tmp_dir.name)
+        self.assertIsInstance(q_func, qarray.QArrays)
+        self.assert_same_q(q_func)
+        self.assertEqual(q_func.get_policy(), self.policy_func)
+
+    def test_parse_state_key(self):
+        self.assertEqual(disk.parse_state_key("(3, 14)"), (3, 14))
+        self.assertEqual(disk.parse_state_key("(-1,)"), (-1,))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from casino.environments.easy21.easy21 import Easy21
+from casino.environments.easy21.player import Action
+from casino.io.trace import TraceRecorder, read_trace
+
+class TestTrace(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "trace.bin")
+        self.env = Easy21(seed=12)
+        self.n_episodes = 100
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_record_episodes(self):
+        """Expecting the trace to hold one record per step, matching what the environment returned
+        """
+        recorder = TraceRecorder(self.path, capacity=16)
+        self.env.set_trace(recorder)
+        steps = []
+        for episode in range(self.n_episodes):
+            state = self.env.reset()
+            terminal = False
+            while not terminal:
+                action = Action.HIT.value if state[1] < 15 else Action.STICK.value
+                next_state, reward, terminal = self.env.step(action)
+                steps.append((episode, state, action, reward))
+                state = next_state
+        recorder.close()
+
+        trace = read_trace(self.path)
+        self.assertEqual(len(trace), len(steps))
+        self.assertTrue(np.array_equal(trace["episode"], [step[0] for step in steps]))
+        self.assertTrue(np.array_equal(trace["player"], [step[1][1] for step in steps]))
+        self.assertTrue(np.array_equal(trace["action"], [step[2] for step in steps]))
+        self.assertTrue(np.array_equal(trace["reward"], [step[3] for step in steps]))
+        self.assertTrue(np.all(trace["card"][trace["action"] == Action.STICK.value] == 0))
+        self.assertTrue(np.all(np.abs(trace["card"][trace["action"] == Action.HIT.value]) >= 1))
+        self.assertEqual(len(read_trace(self.path, mmap=True)), len(steps))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,36 @@
+import pickle
+import unittest
+from casino.models.cards.card import Card
+from casino.models.cards.color import Color
+
+class TestCard(unittest.TestCase):
+    def test_interned(self):
+        self.assertIs(Card(Color.RED, 4), Card(Color.RED, 4))
+        self.assertIsNot(Card(Color.RED, 4), Card(Color.BLACK, 4))
+        self.assertIs(pickle.loads(pickle.dumps(Card(Color.BLACK, 7))), Card(Color.BLACK, 7))
+
+    def test_immutable(self):
+        card = Card(Color.BLACK, 3)
+        with self.assertRaises(AttributeError):
+            card.number = 5
+        with self.assertRaises(AttributeError):
+            card.other = 5
+
+    def test_comparisons(self):
+        low, high = Card(Color.BLACK, 2), Card(Color.RED, 9)
+        self.assertIs(low < high, True)
+        self.assertIs(high < low, False)
+        self.assertIs(low >= high, False)
+        self.assertIs(low == high, False)
+        self.assertIs(low != Card(Color.BLACK, 2), False)
+        self.assertEqual(len({low, high, Card(Color.BLACK, 2)}), 2)
+
+    def test_code(self):
+        for color in Color:
+            for number in range(1, 11):
+                card = Card(color, number)
+                self.assertIs(Card.from_code(card.code), card)
+                self.assertEqual(card.score, -number if color == Color.RED else number)
+
+if __name__ == "__main__":
+    unittest.main()
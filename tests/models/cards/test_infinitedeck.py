@@ -32,6 +32,19 @@ class TestInfiniteDeck(unittest.TestCase):
         msg = f"Expecting number of red cards to be within [{self.tolerance}] of [{self.pb}] for the drawn cards!"
         self.assertAlmostEqual(color_count[Color.RED.name]/color_count[Color.BLACK.name], 0.33, delta=self.tolerance, msg=msg)
 
+    def test_seeded_draw(self):
+        """Expecting decks with the same seed to draw the same cards
+        """
+        decks = [InfiniteDeck(1, 10, self.pb, seed=4, block_size=64) for _ in range(2)]
+        cards = [[deck.draw() for _ in range(200)] for deck in decks]
+        self.assertTrue(all(a == b for a, b in zip(*cards)))
+
+    def test_draw_honors_bounds(self):
+        deck = InfiniteDeck(3, 5, self.pb, seed=5)
+        numbers = {deck.draw().number for _ in range(1000)}
+        self.assertEqual(numbers, {3, 4, 5})
+        self.assertTrue(all(deck.draw(Color.BLACK).color == Color.BLACK for _ in range(100)))
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -0,0 +1,48 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import matplotlib.pyplot as plt
+from casino.plotting import plotlib
+
+class TestPlotlib(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.val_func = {(dealer, player): int(rng.integers(2)) for dealer in range(1, 11) for player in range(1, 22) if rng.random() < 0.8}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_value_grid(self):
+        """Expecting the grid to match a lookup of every grid point in the value function
+        """
+        for flip_xy in [False, True]:
+            x_vals, y_vals, z_vals = plotlib.get_value_grid(self.val_func, flip_xy)
+            for x, y, z in zip(x_vals.flat, y_vals.flat, z_vals.flat):
+                key = (y, x) if flip_xy else (x, y)
+                self.assertEqual(z, self.val_func.get(key, 0))
+
+    def test_downsample_lttb(self):
+        x_vals = np.arange(100000)
+        y_vals = np.sin(x_vals / 1000)
+        y_vals[54321] = 10 # a spike
+        x_out, y_out = plotlib.downsample_lttb(x_vals, y_vals, 500)
+        self.assertEqual(len(x_out), 500)
+        self.assertEqual((x_out[0], x_out[-1]), (0, 99999))
+        self.assertTrue(np.all(np.diff(x_out) > 0))
+        self.assertIn(54321, x_out)
+        self.assertTrue(np.array_equal(y_out, y_vals[x_out]))
+
+        x_out, y_out = plotlib.downsample_lttb(x_vals[:10], y_vals[:10], 500)
+        self.assertEqual(len(x_out), 10)
+
+    def test_figures_closed(self):
+        plotlib.line_plot(np.arange(10000), np.random.default_rng(1).normal(size=10000), "title", "x", "y", os.path.join(self.tmp_dir.name, "line.png"))
+        plotlib.plot_two_dim_value_func(self.val_func, "title", "x", "y", "z", 10, os.path.join(self.tmp_dir.name, "surface.png"))
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir.name, "line.png")))
+        self.assertTrue(os.path.exists(os.path.join(self.tmp_dir.name, "surface.png")))
+        self.assertEqual(plt.get_fignums(), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,37 @@
+import unittest
+import numpy as np
+from casino.environments.easy21.veceasy21 import VecEasy21
+from casino.models.cards.infinitedeck import InfiniteDeck
+from casino.solvers import easy21dp
+
+class TestEasy21Dp(unittest.TestCase):
+    def setUp(self):
+        self.q_func, self.policy_func = easy21dp.solve()
+        self.n_games = 200000
+        self.tolerance = 0.01
+
+    def test_dealer_outcomes(self):
+        outcomes = easy21dp.get_dealer_outcomes(InfiniteDeck(1, 10, 0.33))
+        self.assertTrue(np.allclose(outcomes[1:].sum(axis=1), 1))
+        self.assertTrue(np.all(outcomes[:, 1:17] == 0))
+
+    def test_matches_simulation(self):
+        """Expecting the value of the optimal policy to match the average reward of playing it in the environment
+        """
+        policy = np.zeros((11, 22), dtype=int)
+        values = np.zeros((11, 22))
+        for (dealer, player), action in self.policy_func.items():
+            policy[dealer, player] = action
+            values[dealer, player] = self.q_func[(dealer, player)][action]
+
+        env = VecEasy21(self.n_games, seed=8)
+        states = env.reset_batch()
+        expected = values[states[:, 0], states[:, 1]].mean()
+        total_rewards = np.zeros(self.n_games)
+        while not np.all(env.isterminal()):
+            states, rewards, _ = env.step_batch(policy[states[:, 0], states[:, 1]], auto_reset=False)
+            total_rewards += rewards
+        self.assertAlmostEqual(total_rewards.mean(), expected, delta=self.tolerance)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import json
+import os
+import subprocess
+import sys
+import unittest
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_BUDGET = 0.5 # seconds, about twice the measured ~0.23s cold startup, while importing matplotlib and pandas alone adds ~1s
+
+STARTUP_CODE = """
+import json, sys, time
+start = time.perf_counter()
+from casino import clistarter
+from casino.api.cli import argparser
+args = argparser.get_cmdl_args(["play", "--game", "0"], "")
+lazy_modules = ("matplotlib", "pandas", "asyncio", "casino.workers.sweep", "casino.solvers.easy21dp", "casino.api.server.policyserver")
+print(json.dumps({"seconds": time.perf_counter() - start, "modules": [m for m in lazy_modules if m in sys.modules]}))
+"""
+
+class TestStartup(unittest.TestCase):
+    def test_cold_startup(self):
+        """Expecting a cold startup of the CLI not to import matplotlib, pandas or the modules of the other modes, and to stay within the time budget
+        """
+        env = dict(os.environ, PYTHONPATH=REPO_DIR)
+        result = subprocess.run([sys.executable, "-c", STARTUP_CODE], cwd=REPO_DIR, env=env, capture_output=True, text=True, check=True)
+        startup = json.loads(result.stdout.strip().splitlines()[-1])
+        self.assertEqual(startup["modules"], [])
+        self.assertLess(startup["seconds"], STARTUP_BUDGET)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import json
+import os
+import tempfile
+import unittest
+from casino.environments.easy21.easy21 import Easy21
+from casino.util.env import varia
+from casino.util.profiler import NullTimer, PhaseTimer, SessionProfiler
+
+class TestProfiler(unittest.TestCase):
+    def setUp(self):
+        self.env = Easy21(seed=0)
+        self.n_games = 50
+
+    def play(self):
+        for _ in range(self.n_games):
+            self.env.reset()
+            self.env.step(1) # stick
+
+    def test_phase_timer(self):
+        """Expecting every call of an instrumented method to be timed, without changing its result
+        """
+        timer = PhaseTimer()
+        timer.instrument(self.env, "reset", "env.reset")
+        timer.instrument(self.env, "step")
+        self.assertEqual(self.env.reset(), (self.env.dealer.first_card.number, self.env.player.score))
+        self.play()
+        with timer.phase("block"):
+            pass
+        report = timer.report()
+        self.assertEqual(report["env.reset"]["calls"], self.n_games + 1)
+        self.assertEqual(report["step"]["calls"], self.n_games)
+        self.assertEqual(report["block"]["calls"], 1)
+        self.assertTrue(all(phase["seconds"] >= 0 for phase in report.values()))
+
+    def test_null_timer(self):
+        step = self.env.step
+        NullTimer().instrument(self.env, "step")
+        self.assertEqual(self.env.step, step)
+        self.assertEqual(NullTimer().report(), {})
+
+    def test_save_report(self):
+        with tempfile.TemporaryDirectory() as output_dir:
+            profiler = SessionProfiler(phases=True, cprofile=True, trace_malloc=True)
+            profiler.timer.instrument(self.env, "step")
+            profiler.start()
+            self.play()
+            profiler.stop(self.n_games)
+            profiler.save_report(output_dir)
+            with open(os.path.join(output_dir, varia.PROFILE_FNAME)) as f:
+                report = json.load(f)
+            self.assertEqual(report["phases"]["step"]["calls"], self.n_games)
+            self.assertGreater(report["episodes_per_sec"], 0)
+            self.assertGreater(report["tracemalloc"]["peak_bytes"], 0)
+            self.assertTrue(os.path.exists(os.path.join(output_dir, varia.CPROFILE_FNAME)))
+            self.assertTrue(os.path.exists(os.path.join(output_dir, varia.CPROFILE_REPORT_FNAME)))
+
+if __name__ == "__main__":
+    unittest.main()
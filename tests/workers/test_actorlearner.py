@@ -0,0 +1,70 @@
+import argparse
+import unittest
+import numpy as np
+from casino.agents.linear import LinearAgent
+from casino.agents.monte import MonteCarlo
+from casino.agents.tdlambda import SarsaLambdaAgent
+from casino.environments.easy21.easy21 import Easy21
+from casino.environments.env import Games
+from casino.workers.actorlearner import ActorLearner
+
+class TestActorLearner(unittest.TestCase):
+    def setUp(self):
+        self.args = argparse.Namespace(policy=0, eps_const=100, gamma=1.0, visit_mode="every")
+        self.agent = MonteCarlo(2, self.args)
+        self.n_episodes = 300
+
+    def test_train(self):
+        """Expecting the learner to learn from exactly n_episodes trajectories sent by the actors
+        """
+        actor_learner = ActorLearner(self.agent, Games.EASY21.value, 2, n_actors=2, sync_every=50, queue_size=10, seed=3)
+        actor_learner.train(self.n_episodes)
+        self.assertEqual(len(self.agent.cumulative_episodic_rewards), self.n_episodes)
+        self.assertEqual(sum(self.agent.get_visit_counts().values()), sum(self.agent.n_state_action_visits.values()))
+        self.assertGreater(len(self.agent.policy_func), 0)
+
+    def test_train_dense(self):
+        """Expecting a dense backend agent to learn from exactly n_episodes, when they are not a multiple of the chunk size
+        """
+        env = Easy21()
+        args = argparse.Namespace(policy=0, eps_const=100, gamma=1.0, alpha=0.01, lam=0.9, trace_type="replacing", opt_q_path=None, mse_every=100, mse_sample_size=0)
+        agent = SarsaLambdaAgent(2, args, env.get_state_space())
+        actor_learner = ActorLearner(agent, Games.EASY21.value, 2, n_actors=2, sync_every=50, queue_size=10, seed=3, chunk_size=7)
+        actor_learner.train(self.n_episodes)
+        self.assertEqual(len(agent.cumulative_episodic_rewards), self.n_episodes)
+        self.assertGreater(len(agent.policy_func), 0)
+        agent.close_metrics()
+
+    def test_unpack(self):
+        """Expecting a chunk to split into its episodes, with the keys of their states and final states
+        """
+        states = np.array([[1, 5], [1, 9], [4, 20]])
+        chunk = (states, np.array([0, 1, 1]), np.array([0.0, -1.0, 1.0]), np.array([[0, 0], [0, 0]]), np.array([0, 2, 3]))
+        expected = [([(1, 5), (1, 9)], [0, 1], [0.0, -1.0], (0, 0)), ([(4, 20)], [1], [1.0], (0, 0))]
+        episodes = list(ActorLearner(self.agent, Games.EASY21.value, 2, n_actors=2, sync_every=50).unpack(chunk))
+        self.assertEqual([episode[:4] for episode in episodes], expected)
+        self.assertEqual([episode[4] for episode in episodes], [[(1, 5), (1, 9), (0, 0)], [(4, 20), (0, 0)]])
+
+        state_space = Easy21().get_state_space()
+        agent = MonteCarlo(2, self.args, state_space)
+        episodes = list(ActorLearner(agent, Games.EASY21.value, 2, n_actors=2, sync_every=50).unpack(chunk))
+        self.assertEqual([episode[:4] for episode in episodes], expected)
+        self.assertEqual([episode[4] for episode in episodes], [[state_space.index(state) for state in episode[0] + [episode[3]]] for episode in expected])
+
+    def test_dead_actors(self):
+        """Expecting the learner to raise instead of waiting forever when the actors die
+        """
+        actor_learner = ActorLearner(self.agent, -1, 2, n_actors=2, sync_every=50) # the actors fail on the unknown game
+        with self.assertRaises(RuntimeError):
+            actor_learner.train(self.n_episodes)
+
+    def test_rejects_agent_without_trajectories(self):
+        env = Easy21()
+        args = argparse.Namespace(policy=0, eps_const=100, gamma=1.0, alpha=0.01, lam=0.5, opt_q_path=None, mse_every=100)
+        agent = LinearAgent(2, args, env.get_state_space(), env.get_feature_intervals())
+        with self.assertRaises(ValueError):
+            ActorLearner(agent, Games.EASY21.value, 2, n_actors=2, sync_every=50)
+        agent.close_metrics()
+
+if __name__ == "__main__":
+    unittest.main()
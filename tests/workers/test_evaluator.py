@@ -0,0 +1,54 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+from casino.agents import greedy
+from casino.environments.easy21.easy21 import Easy21
+from casino.io import disk
+from casino.solvers import easy21dp
+from casino.util.env import varia
+from casino.workers import evaluator
+
+class TestEvaluator(unittest.TestCase):
+    def setUp(self):
+        self.state_space = Easy21().get_state_space()
+        self.q_func, self.policy_func = easy21dp.solve()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        disk.write_dict_as_json(os.path.join(self.tmp_dir.name, varia.POLICY_FNAME), self.policy_func, str, int)
+        self.policy = greedy.load_greedy_policy(self.tmp_dir.name, self.state_space)
+        self.n_games = 200000
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_load_greedy_policy(self):
+        for state, action in self.policy_func.items():
+            self.assertEqual(self.policy[self.state_space.index(state)], action)
+
+    def test_optimal_policy_value(self):
+        """Expecting the mean reward of the optimal policy to be within twice the width of its 95% confidence interval (about 4 standard errors)
+        of its exact value, averaged over the uniformly dealt start states
+        """
+        counts = evaluator.evaluate_policy(self.policy, self.state_space, self.n_games, n_workers=2, batch_size=30000, seed=4)
+        summary = evaluator.summarize(counts, self.state_space)
+        expected = np.mean([np.max(self.q_func[(dealer, player)]) for dealer in range(1, 11) for player in range(1, 11)])
+        self.assertEqual(summary["n_games"], self.n_games)
+        self.assertEqual(len(summary["per_start_state"]), 100)
+        self.assertAlmostEqual(sum(summary[outcome]["rate"] for outcome in evaluator.OUTCOMES), 1)
+        mean_reward = summary["mean_reward"]
+        self.assertLess(abs(mean_reward["value"] - expected), 2 * (mean_reward["ci_high"] - mean_reward["ci_low"]))
+
+    def test_seeded(self):
+        counts = [evaluator.evaluate_policy(self.policy, self.state_space, 5000, batch_size=1000, seed=1) for _ in range(2)]
+        self.assertTrue(np.array_equal(counts[0], counts[1]))
+        self.assertEqual(counts[0].sum(), 5000)
+
+    def test_wilson_interval(self):
+        low, high = evaluator.wilson_interval(0, 100)
+        self.assertAlmostEqual(low, 0)
+        self.assertGreater(high, 0)
+        low, high = evaluator.wilson_interval(50, 100)
+        self.assertAlmostEqual(low + high, 1)
+
+if __name__ == "__main__":
+    unittest.main()
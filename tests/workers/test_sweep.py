@@ -0,0 +1,79 @@
+import json
+import os
+import tempfile
+import unittest
+import numpy as np
+from casino.io import disk
+from casino.util.env import varia
+from casino.workers import sweep
+
+class TestSweep(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.base_dir = self.tmp_dir.name
+        os.mkdir(os.path.join(self.base_dir, varia.DATA_DIR))
+        self.opt_q_path = os.path.join(self.base_dir, "qfunc.json")
+        rng = np.random.default_rng(0)
+        disk.write_dict_as_json(self.opt_q_path, {(dealer, player): rng.uniform(-1, 1, 2) for dealer in range(1, 11) for player in range(1, 22)}, str, list)
+        self.spec = {"name": "test", "search": "grid", "base": {"n_episodes": 200, "seed": 1, "opt_q_path": self.opt_q_path, "mse_every": 10},
+                     "params": {"agent": ["sarsa", "qlearn"], "eps_const": [10, 100]}}
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def write_spec(self) -> str:
+        path = os.path.join(self.base_dir, "spec.json")
+        with open(path, "w") as f:
+            json.dump(self.spec, f)
+        return path
+
+    def test_run_sweep(self):
+        """Expecting a row per config in the summary, and the finished configs to be skipped when the sweep is run again
+        """
+        summary_path = sweep.run_sweep(self.base_dir, self.write_spec())
+        rows = sweep.read_summary(summary_path)
+        self.assertEqual(sorted(int(row["index"]) for row in rows), [0, 1, 2, 3])
+        for row in rows:
+            self.assertTrue(os.path.exists(os.path.join(row["session_dir"], varia.Q_FNAME)))
+            self.assertLess(float(row["final_mse"]), 0)
+
+        self.spec["params"]["eps_const"].append(1000)
+        sweep.run_sweep(self.base_dir, self.write_spec())
+        rows = sweep.read_summary(summary_path)
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(len(set(row["config"] for row in rows)), 6)
+
+    def test_random_configs(self):
+        spec = {"search": "random", "n_samples": 5, "seed": 3, "base": {"n_episodes": 10},
+                "params": {"agent": ["monte", "qlearn"], "gamma": {"low": 0.5, "high": 1.0}, "eps_const": {"low": 1, "high": 1000, "integer": True}}}
+        configs = sweep.get_configs(spec)
+        self.assertEqual(configs, sweep.get_configs(spec))
+        self.assertEqual(len(configs), 5)
+        for config in configs:
+            self.assertTrue(0.5 <= config["gamma"] <= 1.0)
+            self.assertIsInstance(config["eps_const"], int)
+
+    def test_mixed_agents(self):
+        """Expecting the agent specific options of the base to apply only to the agents that have them, as in the spec of load_spec
+        """
+        self.spec["base"]["q_backend"] = "dense"
+        self.spec["params"] = {"agent": ["monte", "sarsa", "qlearn"], "eps_const": [100]}
+        summary_path = sweep.run_sweep(self.base_dir, self.write_spec())
+        rows = {row["agent"]: row for row in sweep.read_summary(summary_path)}
+        self.assertEqual(sorted(rows.keys()), ["monte", "qlearn", "sarsa"])
+        self.assertNotIn("opt_q_path", json.loads(rows["monte"]["config"]))
+        self.assertEqual(rows["monte"]["final_mse"], "")
+        for agent in ["sarsa", "qlearn"]:
+            self.assertEqual(json.loads(rows[agent]["config"])["opt_q_path"], self.opt_q_path)
+            self.assertLess(float(rows[agent]["final_mse"]), 0)
+
+        self.spec["base"]["opt_q_pth"] = self.opt_q_path # a typo no agent has
+        with self.assertRaises(ValueError):
+            sweep.run_sweep(self.base_dir, self.write_spec())
+
+    def test_unknown_option(self):
+        with self.assertRaises(ValueError):
+            sweep.get_train_args({"agent": "monte", "opt_q_path": self.opt_q_path})
+
+if __name__ == "__main__":
+    unittest.main()